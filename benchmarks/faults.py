@@ -0,0 +1,160 @@
+"""
+Resume recovery under injected transfer faults.
+
+Downloads one synthetic file from benchmarks/local_server.py while it
+injects a single fault partway through (see FAULTS there: drop, short,
+stall, bad-range, changed), once per transfer path:
+
+  resume    download_part_with_resume(), called again right away after a
+            failure, as a restarted app would (at most RESUME_ATTEMPTS calls)
+  retry     download_with_retry(), used by the series and GUI downloads
+  session   download_session_parts() on a one-part DownloadSession, used
+            by the daemon and the command line
+
+For each fault and path it records:
+
+  recover_s         from the fault to the first byte of the next good response
+  redownloaded_mib  bytes the server sent beyond the file size
+  wall_s            total download time
+  correct           the path reported success and the file matches the
+                    server's content (the new content for 'changed')
+
+Results are appended to benchmarks/results/faults.jsonl with the git
+commit, and the summary shows the change against the previous run.
+
+    python benchmarks/faults.py [--size MiB] [--fault NAME ...] [--path NAME ...] [--stall SECONDS]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import time
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCHMARK_DIR))
+sys.path.insert(0, BENCHMARK_DIR)
+
+import main  # noqa: E402
+from local_server import FAULTS, SyntheticFile, start_server  # noqa: E402
+from records import change, format_value, load_previous, results_path, run_context  # noqa: E402
+
+RESULTS_PATH = results_path('faults')
+RESUME_ATTEMPTS = 5
+# Where in the file the fault fires
+FAULT_POSITION = 0.4
+
+
+def run_resume(url, path, size):
+    session = main.create_optimized_session()
+    try:
+        return any(main.download_part_with_resume(url, path, None, session) for _ in range(RESUME_ATTEMPTS))
+    finally:
+        session.close()
+
+
+def run_retry(url, path, size):
+    session = main.create_optimized_session()
+    try:
+        return main.download_with_retry(url, path, session=session)
+    finally:
+        session.close()
+
+
+def run_session(url, path, size):
+    part = main.DownloadPart(part_number=1, filename=os.path.basename(path), download_url=url,
+                             expected_size=size, local_path=path)
+    download_session = main.DownloadSession(session_id='faults', vodu_store_url=url,
+                                            download_location=os.path.dirname(path), app_name='faults',
+                                            parts=[part], total_parts=1, total_expected_bytes=size,
+                                            status=main.SessionStatus.DOWNLOADING)
+    http_session = main.create_optimized_session()
+    try:
+        main.download_session_parts(download_session, http_session)
+    finally:
+        http_session.close()
+    return part.is_complete()
+
+
+# Transfer path name -> function(url, save_path, size) returning success
+PATHS = {
+    'resume': run_resume,
+    'retry': run_retry,
+    'session': run_session,
+}
+
+
+def file_md5(path):
+    digest = hashlib.md5()
+    with open(path, 'rb') as file:
+        for block in iter(lambda: file.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def inject(fault, path_name, size_mib, bandwidth_mb, stall, work_dir):
+    name = f"faults-{size_mib}.bin"
+    size = size_mib * 1024 * 1024
+    save_path = os.path.join(work_dir, name)
+    for leftover in (save_path, save_path + main.RANGE_MAP_SUFFIX):
+        if os.path.exists(leftover):
+            os.remove(leftover)
+    server = start_server([SyntheticFile(name, size)], bandwidth_mb=bandwidth_mb, fault=fault,
+                          fault_at=int(size * FAULT_POSITION), stall=stall)
+    try:
+        start = time.perf_counter()
+        ok = PATHS[path_name](server.base_url + name, save_path, size)
+        wall = time.perf_counter() - start
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    stats = server.stats
+    recover = None
+    if stats['fault_time'] is not None and stats['recovered_time'] is not None:
+        recover = stats['recovered_time'] - stats['fault_time']
+    served = server.files[name]
+    return {
+        'fault': fault,
+        'path': path_name,
+        'size_mib': size_mib,
+        'fired': stats['fault_time'] is not None,
+        'recover_s': round(recover, 3) if recover is not None else None,
+        'redownloaded_mib': round(max(0, stats['bytes_sent'] - size) / 1024 ** 2, 2),
+        'requests': stats['requests'],
+        'wall_s': round(wall, 3),
+        'correct': bool(ok) and os.path.exists(save_path) and file_md5(save_path) == served.etag.strip('"'),
+    }
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Fault-injection resume benchmark")
+    parser.add_argument('--size', type=int, default=64, help='file size in MiB')
+    parser.add_argument('--fault', action='append', choices=FAULTS)
+    parser.add_argument('--path', action='append', choices=list(PATHS))
+    parser.add_argument('--bandwidth', type=float, default=50.0, help='per-connection cap in MB/s (0 = unlimited)')
+    parser.add_argument('--stall', type=float, default=10.0, help='seconds a stall lasts')
+    parser.add_argument('--results', default=RESULTS_PATH)
+    args = parser.parse_args()
+
+    previous = load_previous(args.results, ('fault', 'path', 'size_mib'))
+    os.makedirs(os.path.dirname(args.results), exist_ok=True)
+    context = {**run_context(), 'bandwidth_mb': args.bandwidth, 'stall': args.stall}
+
+    with tempfile.TemporaryDirectory() as work_dir, open(args.results, 'a', encoding='utf-8') as results:
+        for fault in args.fault or list(FAULTS):
+            for path_name in args.path or list(PATHS):
+                result = inject(fault, path_name, args.size, args.bandwidth, args.stall, work_dir)
+                results.write(json.dumps({**context, **result}) + '\n')
+                results.flush()
+                before = previous.get((fault, path_name, args.size))
+                print(f"{fault:10} {path_name:8} {format_value(result, 'recover_s', 7)} s to recover"
+                      f"{change(result, before, 'recover_s'):7} {format_value(result, 'redownloaded_mib', 7)} MiB again"
+                      f"{change(result, before, 'redownloaded_mib'):7} {format_value(result, 'wall_s', 7)} s total  "
+                      f"{'ok' if result['correct'] else 'INCORRECT FILE'}{'' if result['fired'] else '  (not fired)'}")
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,291 @@
+"""
+Offline stand-in for the pages and API calls that link resolution reads.
+
+Serves a corpus of pages in the shapes the extraction code has to handle:
+
+  /series/<slug>                         movie.vodu.me series pages, with
+                                         "-720.mp4" or "_720p.mp4" naming
+                                         and webvtt/data-srt subtitle tracks
+  /details/<id>                          store detail pages, with the links
+                                         inline or only in window.__INITIAL_STATE__
+  /api/v1/file/<id>                      file list JSON (objectFiles)
+  /api/v1/download/no-recaptcha/<id>     {"messge": url}, or {"files": [...]}
+                                         for apps without a file list
+
+The synthetic corpus is generated at realistic page sizes. Recorded pages
+can be added or substituted by placing them in a corpus directory using
+the same layout (relative path without extension = URL path), e.g.
+benchmarks/fixtures/series/my-show.html is served as /series/my-show.
+--dump writes the synthetic corpus in that layout as a starting point.
+
+Point the downloader at it with VODU_STORE_API_BASE=http://127.0.0.1:<port>.
+
+    python benchmarks/fixture_site.py [--port 9872] [--latency 0.04] [--corpus DIR] [--dump DIR]
+"""
+
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from local_server import wait_until_listening
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CORPUS_DIR = os.path.join(BENCHMARK_DIR, 'fixtures')
+
+FILE_HOST = 'https://share.vodu.store:9999/store-files/'
+MOVIE_HOST = 'https://movie.vodu.me'
+
+# slug -> series page options
+SERIES_FIXTURES = {
+    'dash-3x12': {'name': 'Desert_Road', 'seasons': 3, 'episodes': 12, 'naming': 'dash', 'size_kb': 420},
+    'underscore-2x10': {'name': 'Harbor_Lights', 'seasons': 2, 'episodes': 10, 'naming': 'underscore',
+                        'size_kb': 360},
+    'dash-10x24': {'name': 'Long_Running_Show', 'seasons': 10, 'episodes': 24, 'naming': 'dash',
+                   'size_kb': 1600},
+    'no-1080-1x8': {'name': 'Small_Town', 'seasons': 1, 'episodes': 8, 'naming': 'dash', 'size_kb': 180,
+                    'qualities': ('360', '720')},
+}
+
+# app id -> store fixture options. 'api' is 'file' (objectFiles list),
+# 'files' (no file list; the no-recaptcha call returns every link) or None.
+# 'page' is 'inline' (anchors) or 'state' (links only in __INITIAL_STATE__).
+STORE_FIXTURES = {
+    100001: {'parts': 1, 'api': 'file', 'page': 'inline'},
+    100010: {'parts': 10, 'api': 'file', 'page': 'inline'},
+    100040: {'parts': 40, 'api': 'file', 'page': 'inline'},
+    200010: {'parts': 10, 'api': 'files', 'page': 'state'},
+    300040: {'parts': 40, 'api': None, 'page': 'state'},
+}
+
+VIDEO_QUALITIES = ('360', '720', '1080')
+FILE_ID_BASE = 5_000_000
+
+WORDS = ('episode season watch night city story family friends secret road light harbor long small town '
+         'return final first new old dark bright stranger house river mountain journey').split()
+
+
+def _filler(rng, size, template):
+    """Repeat template (formatted with random text) until size bytes are produced."""
+    blocks = []
+    produced = 0
+    index = 0
+    while produced < size:
+        block = template.format(i=index, text=' '.join(rng.choice(WORDS) for _ in range(40)),
+                                user=f"user{rng.randrange(100000)}")
+        blocks.append(block)
+        produced += len(block)
+        index += 1
+    return ''.join(blocks)
+
+
+def _video_url(name, season, episode, quality, naming):
+    suffix = f"-{quality}.mp4" if naming == 'dash' else f"_{quality}p.mp4"
+    return f"{MOVIE_HOST}/videos/{name}/S{season:02d}/{name}_S{season:02d}E{episode:02d}{suffix}"
+
+
+def series_page(name, seasons, episodes, naming='dash', size_kb=400, qualities=VIDEO_QUALITIES, seed=0):
+    """A series page: one player block per episode, then comments and scripts up to size_kb."""
+    rng = random.Random(f"{seed}:{name}")
+    style = _filler(rng, 24 * 1024, '.ep-{i} {{ margin: 0 4px; }} /* {text} */\n')
+    head = (f'<!DOCTYPE html>\n<html lang="ar" dir="rtl">\n<head>\n<meta charset="utf-8">\n'
+            f'<title>{name.replace("_", " ")} - Vodu</title>\n'
+            f'<link rel="stylesheet" href="{MOVIE_HOST}/templates/vodu/css/style.css?v=3.2">\n'
+            f'<style>\n{style}</style>\n'
+            f'</head>\n<body>\n<div id="main">\n')
+    episodes_html = []
+    for season in range(1, seasons + 1):
+        episodes_html.append(f'<div class="season" data-season="{season}">\n<h3>Season {season}</h3>\n')
+        for episode in range(1, episodes + 1):
+            code = f"{name}_S{season:02d}E{episode:02d}"
+            sources = ' '.join(f'<source src="{_video_url(name, season, episode, q, naming)}" '
+                               f'type="video/mp4" size="{q}">' for q in qualities)
+            episodes_html.append(
+                f'<div class="episode" id="ep-{season}-{episode}">\n'
+                f'<img class="thumb" src="{MOVIE_HOST}/thumbs/{code}.jpg" alt="{code}">\n'
+                f'<video class="player" controls preload="none">\n{sources}\n'
+                f'<track kind="subtitles" srclang="ar" label="Arabic" '
+                f'src="{MOVIE_HOST}/subtitles/{code}_1.webvtt" '
+                f'data-srt="{MOVIE_HOST}/subtitles/{code}_1.srt" default>\n'
+                f'</video>\n<p class="ep-title">Episode {episode}</p>\n</div>\n')
+        episodes_html.append('</div>\n')
+    body = head + ''.join(episodes_html)
+    comment = ('<div class="comment" id="c{i}"><a class="user" href="' + MOVIE_HOST + '/user/{user}">{user}</a>'
+               '<img src="' + MOVIE_HOST + '/avatars/{user}.png"> <p>{text}</p></div>\n')
+    body += _filler(rng, max(0, size_kb * 1024 - len(body) - 2048), comment)
+    return body + '</div>\n<script src="' + MOVIE_HOST + '/templates/vodu/js/player.js"></script>\n</body>\n</html>\n'
+
+
+def store_part_names(app_id, parts):
+    if parts == 1:
+        return [f"App_{app_id}.zip"]
+    return [f"App_{app_id}.part{i:02d}.rar" for i in range(1, parts + 1)]
+
+
+def store_details(app_id, parts, seed=0):
+    """The app record as the store's API and initial state carry it."""
+    rng = random.Random(f"{seed}:{app_id}")
+    return {
+        'id': app_id,
+        'name': f"App {app_id}",
+        'description': ' '.join(rng.choice(WORDS) for _ in range(300)),
+        'category': {'id': 3, 'name': 'Games'},
+        'images': [f"https://share.vodu.store/images/{app_id}/{i}.jpg" for i in range(8)],
+        'objectFiles': [
+            {'id': FILE_ID_BASE + app_id * 100 + i, 'name': name, 'size': rng.randrange(1, 4) * 1024 ** 3,
+             'createdAt': '2024-05-01T12:00:00.000Z'}
+            for i, name in enumerate(store_part_names(app_id, parts), 1)
+        ],
+    }
+
+
+def store_page(app_id, parts, page='inline', size_kb=160, seed=0):
+    """A store detail page; links are anchors, or only inside window.__INITIAL_STATE__."""
+    rng = random.Random(f"{seed}:page:{app_id}")
+    details = store_details(app_id, parts, seed)
+    state = {'route': f"/details/{app_id}", 'details': details, 'user': None}
+    if page == 'state':
+        state['downloads'] = [{'name': f['name'], 'url': FILE_HOST + f['name']} for f in details['objectFiles']]
+    links = ''
+    if page == 'inline':
+        links = ''.join(f'<li><a class="download" href="{FILE_HOST}{f["name"]}">{f["name"]}</a></li>\n'
+                        for f in details['objectFiles'])
+    body = ('<!DOCTYPE html>\n<html>\n<head>\n<meta charset="utf-8">\n<title>Vodu Store</title>\n'
+            '<base href="/">\n</head>\n<body>\n<app-root>\n'
+            f'<h1>{details["name"]}</h1>\n<ul class="files">\n{links}</ul>\n')
+    body += _filler(rng, max(0, size_kb * 1024 - len(body) - 4096),
+                    '<div class="related" data-i="{i}"><img src="https://share.vodu.store/images/{user}.jpg">'
+                    '<span>{text}</span></div>\n')
+    return (body + '</app-root>\n<script>window.__INITIAL_STATE__ = ' + json.dumps(state) + ';</script>\n'
+            '<script src="https://share.vodu.store/main.js"></script>\n</body>\n</html>\n')
+
+
+def synthetic_corpus(seed=0):
+    """Return {url_path: (content_type, bytes)} for the synthetic fixtures."""
+    routes = {}
+    for slug, options in SERIES_FIXTURES.items():
+        routes[f"/series/{slug}"] = ('text/html; charset=utf-8', series_page(seed=seed, **options).encode())
+    for app_id, options in STORE_FIXTURES.items():
+        page = store_page(app_id, options['parts'], options['page'], seed=seed)
+        routes[f"/details/{app_id}"] = ('text/html; charset=utf-8', page.encode())
+        details = store_details(app_id, options['parts'], seed)
+        if options['api'] == 'file':
+            routes[f"/api/v1/file/{app_id}"] = ('application/json', json.dumps(details).encode())
+            for file_info in details['objectFiles']:
+                routes[f"/api/v1/download/no-recaptcha/{file_info['id']}"] = (
+                    'application/json', json.dumps({'status': True, 'messge': FILE_HOST + file_info['name']}).encode())
+        elif options['api'] == 'files':
+            files = [{'name': f['name'], 'size': f['size'], 'link': FILE_HOST + f['name']}
+                     for f in details['objectFiles']]
+            routes[f"/api/v1/download/no-recaptcha/{app_id}"] = (
+                'application/json', json.dumps({'status': True, 'files': files}).encode())
+    return routes
+
+
+def load_corpus(directory):
+    """Read recorded fixtures laid out as <url path>.<html|json>."""
+    routes = {}
+    for root, _, names in os.walk(directory):
+        for name in names:
+            stem, extension = os.path.splitext(name)
+            if extension not in ('.html', '.json'):
+                continue
+            path = '/' + os.path.relpath(os.path.join(root, stem), directory).replace(os.sep, '/')
+            content_type = 'application/json' if extension == '.json' else 'text/html; charset=utf-8'
+            with open(os.path.join(root, name), 'rb') as file:
+                routes[path] = (content_type, file.read())
+    return routes
+
+
+def dump_corpus(routes, directory):
+    for path, (content_type, body) in routes.items():
+        extension = '.json' if content_type == 'application/json' else '.html'
+        target = os.path.join(directory, *path.strip('/').split('/')) + extension
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with open(target, 'wb') as file:
+            file.write(body)
+
+
+class FixtureSite(ThreadingHTTPServer):
+    """HTTP server holding the corpus; latency delays every response."""
+
+    daemon_threads = True
+
+    def __init__(self, address, routes, latency=0.0):
+        super().__init__(address, FixtureRequestHandler)
+        self.routes = routes
+        self.latency = latency
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+class FixtureRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    server_version = 'nginx'
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        route = self.server.routes.get(self.path.split('?', 1)[0].rstrip('/'))
+        if route is None:
+            content_type, body, status = 'application/json', b'{"messge": "Not found"}', 404
+        else:
+            (content_type, body), status = route, 200
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def build_routes(corpus_dir=DEFAULT_CORPUS_DIR, seed=0):
+    """Synthetic corpus, with recorded pages from corpus_dir added on top."""
+    routes = synthetic_corpus(seed)
+    if corpus_dir and os.path.isdir(corpus_dir):
+        routes.update(load_corpus(corpus_dir))
+    return routes
+
+
+def spawn_fixture_site(port, latency=0.0, corpus_dir=DEFAULT_CORPUS_DIR, seed=0):
+    """Run the fixture site as a child process and wait until it accepts connections."""
+    command = [sys.executable, os.path.abspath(__file__), '--port', str(port), '--latency', str(latency),
+               '--seed', str(seed), '--corpus', corpus_dir or '']
+    return wait_until_listening(subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL),
+                                port)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=9872)
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds before each response')
+    parser.add_argument('--corpus', default=DEFAULT_CORPUS_DIR, help='directory of recorded fixtures')
+    parser.add_argument('--dump', help='write the synthetic corpus to this directory and exit')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    if args.dump:
+        dump_corpus(synthetic_corpus(args.seed), args.dump)
+        return
+    server = FixtureSite((args.host, args.port), build_routes(args.corpus, args.seed), args.latency)
+    print(f"Serving {len(server.routes)} fixtures on {server.base_url}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
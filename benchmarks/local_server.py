@@ -0,0 +1,362 @@
+"""
+Local stand-in for share.vodu.store:9999/store-files/.
+
+Serves synthetic files under /store-files/<name> with the response shape
+the store uses (Content-Length, an MD5 ETag, Accept-Ranges, single-range 206
+responses and 416 for unsatisfiable ranges). Transfer conditions are
+configurable so engine changes can be measured without the live store:
+
+  --bandwidth      per-connection cap in MB/s (0 = unlimited)
+  --latency        seconds before the response headers are sent
+  --max-connections  concurrent GET limit; extra requests get 429
+  --rate-429       fraction of GET requests answered with 429 anyway
+  --slow-rate      fraction of GET requests sent at --bandwidth / --slow-factor,
+                   like a connection routed over a congested path
+
+One fault can also be injected once, when a response reaches --fault-at
+bytes into the file:
+
+  drop        the connection is reset (RST)
+  short       the connection is closed cleanly before Content-Length is reached
+  stall       no more data for --stall seconds, then a clean close
+  bad-range   a drop, after which the next ranged request is answered with
+              a Content-Range that starts 1 MiB later than requested
+  changed     the file gets new content and a new ETag, then a drop
+
+Files are named on the command line as name=size (size in MiB), e.g.
+
+    python benchmarks/local_server.py --port 9999 --file game.part1.rar=512 --bandwidth 20
+
+Other scripts start it in-process with start_server() or as a separate
+process with spawn_server(), which keeps its CPU time out of the
+client's measurements.
+"""
+
+import argparse
+import hashlib
+import os
+import random
+import re
+import socket
+import struct
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+FILES_PATH = '/store-files/'
+BLOCK_SIZE = 1024 * 1024
+SEND_SIZE = 64 * 1024
+
+FAULTS = ('drop', 'short', 'stall', 'bad-range', 'changed')
+BAD_RANGE_SHIFT = 1024 * 1024
+
+
+class SyntheticFile:
+    """Deterministic content of a given size, built from one repeated random block."""
+
+    def __init__(self, name, size, seed=0):
+        self.name = name
+        self.size = size
+        self._block = random.Random(f"{seed}:{name}").randbytes(BLOCK_SIZE)
+        # Like the store's single-part ETags: the MD5 of the whole content
+        self.etag = f'"{self.md5()}"'
+
+    def read(self, start, end):
+        """Return bytes [start, end)."""
+        chunks = []
+        position = start
+        while position < end:
+            offset = position % BLOCK_SIZE
+            take = min(end - position, BLOCK_SIZE - offset)
+            chunks.append(self._block[offset:offset + take])
+            position += take
+        return b''.join(chunks)
+
+    def write_to(self, path):
+        """Write the whole file to path (for checking downloads)."""
+        with open(path, 'wb') as file:
+            for start in range(0, self.size, BLOCK_SIZE):
+                file.write(self.read(start, min(self.size, start + BLOCK_SIZE)))
+
+    def md5(self):
+        digest = hashlib.md5()
+        for start in range(0, self.size, BLOCK_SIZE):
+            digest.update(self.read(start, min(self.size, start + BLOCK_SIZE)))
+        return digest.hexdigest()
+
+
+class StoreServer(ThreadingHTTPServer):
+    """HTTP server holding the files and the transfer conditions."""
+
+    daemon_threads = True
+
+    def __init__(self, address, files, bandwidth_mb=0.0, latency=0.0, max_connections=0, rate_429=0.0,
+                 seed=0, fault=None, fault_at=0, stall=10.0, slow_rate=0.0, slow_factor=8.0):
+        super().__init__(address, StoreRequestHandler)
+        self.files = {f.name: f for f in files}
+        self.bandwidth = bandwidth_mb * 1024 * 1024
+        self.latency = latency
+        self.max_connections = max_connections
+        self.rate_429 = rate_429
+        self.slow_rate = slow_rate
+        self.slow_factor = slow_factor
+        self.seed = seed
+        self.fault = fault
+        self.fault_at = fault_at
+        self.stall = stall
+        self._fault_pending = bool(fault)
+        self._bad_range_pending = False
+        self._random = random.Random(seed)
+        self._slow_random = random.Random(f"{seed}:slow")
+        self._lock = threading.Lock()
+        self.active = 0
+        # fault_time: when the fault fired; recovered_time: first body byte of
+        # the next response that was not itself faulty (both time.monotonic())
+        self.stats = {'requests': 0, 'ranged': 0, 'rejected_429': 0, 'slowed': 0, 'bytes_sent': 0,
+                      'peak_connections': 0, 'fault_time': None, 'recovered_time': None}
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}{FILES_PATH}"
+
+    def acquire(self):
+        """Take a connection slot; False means the request gets a 429."""
+        with self._lock:
+            self.stats['requests'] += 1
+            if (self.max_connections and self.active >= self.max_connections) or \
+                    (self.rate_429 and self._random.random() < self.rate_429):
+                self.stats['rejected_429'] += 1
+                return False
+            self.active += 1
+            self.stats['peak_connections'] = max(self.stats['peak_connections'], self.active)
+            return True
+
+    def connection_bandwidth(self):
+        """Pacing for one response in bytes/s (0 = unlimited); some are slowed by slow_factor."""
+        with self._lock:
+            if self.slow_rate and self._slow_random.random() < self.slow_rate:
+                self.stats['slowed'] += 1
+                return (self.bandwidth or 100 * 1024 * 1024) / self.slow_factor
+            return self.bandwidth
+
+    def release(self, sent):
+        with self._lock:
+            self.active -= 1
+            self.stats['bytes_sent'] += sent
+
+    def take_fault(self, stored, start, end):
+        """Claim the pending fault if this response passes the fault offset."""
+        with self._lock:
+            if not self._fault_pending or not start <= self.fault_at < end:
+                return False
+            self._fault_pending = False
+            if self.fault == 'bad-range':
+                self._bad_range_pending = True
+            elif self.fault == 'changed':
+                self.files[stored.name] = SyntheticFile(stored.name, stored.size, self.seed + 1)
+            self.stats['fault_time'] = time.monotonic()
+            return True
+
+    def take_bad_range(self):
+        with self._lock:
+            pending, self._bad_range_pending = self._bad_range_pending, False
+            return pending
+
+    def mark_recovered(self):
+        with self._lock:
+            if self.stats['fault_time'] is not None and self.stats['recovered_time'] is None:
+                self.stats['recovered_time'] = time.monotonic()
+
+
+class StoreRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    server_version = 'nginx'
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_HEAD(self):
+        self._serve(send_body=False)
+
+    def do_GET(self):
+        self._serve(send_body=True)
+
+    def _serve(self, send_body):
+        server = self.server
+        stored = server.files.get(self.path[len(FILES_PATH):]) if self.path.startswith(FILES_PATH) else None
+        if stored is None:
+            self._send_empty(404)
+            return
+        if send_body and not server.acquire():
+            self._send_empty(429, {'Retry-After': '1'})
+            return
+        sent = 0
+        try:
+            if server.latency:
+                time.sleep(server.latency)
+            start, end, status = self._parse_range(stored)
+            if status == 416:
+                self._send_empty(416, {'Content-Range': f'bytes */{stored.size}'})
+                return
+            faulty = False
+            if send_body and status == 206 and start > 0 and server.take_bad_range():
+                # Answer with the wrong part of the file
+                start, end, faulty = min(start + BAD_RANGE_SHIFT, stored.size - 1), stored.size, True
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/octet-stream')
+            self.send_header('Content-Length', str(end - start))
+            self.send_header('Accept-Ranges', 'bytes')
+            self.send_header('ETag', stored.etag)
+            if status == 206:
+                self.send_header('Content-Range', f'bytes {start}-{end - 1}/{stored.size}')
+            self.end_headers()
+            if send_body:
+                if not faulty:
+                    server.mark_recovered()
+                sent = self._send_body(stored, start, end)
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True
+        finally:
+            if send_body:
+                server.release(sent)
+
+    def _parse_range(self, stored):
+        header = self.headers.get('Range')
+        if_range = self.headers.get('If-Range')
+        if not header or (if_range and if_range != stored.etag):
+            return 0, stored.size, 200
+        match = re.match(r'bytes=(\d*)-(\d*)$', header.strip())
+        if not match or match.groups() == ('', ''):
+            return 0, stored.size, 200
+        first, last = match.groups()
+        if first == '':
+            start, end = max(0, stored.size - int(last)), stored.size
+        else:
+            start = int(first)
+            end = min(stored.size, int(last) + 1) if last else stored.size
+        if start >= stored.size or start >= end:
+            return 0, 0, 416
+        with self.server._lock:
+            self.server.stats['ranged'] += 1
+        return start, end, 206
+
+    def _send_body(self, stored, start, end):
+        """Write [start, end), pacing each connection to the bandwidth cap."""
+        server = self.server
+        bandwidth = server.connection_bandwidth()
+        fault_at = end
+        if server.take_fault(stored, start, end):
+            fault_at = server.fault_at
+        began = time.monotonic()
+        sent = 0
+        position = start
+        while position < end:
+            if position >= fault_at:
+                self._break_connection()
+                break
+            chunk = stored.read(position, min(end, fault_at, position + SEND_SIZE))
+            self.wfile.write(chunk)
+            position += len(chunk)
+            sent += len(chunk)
+            if bandwidth:
+                ahead = sent / bandwidth - (time.monotonic() - began)
+                if ahead > 0:
+                    time.sleep(ahead)
+        return sent
+
+    def _break_connection(self):
+        fault = self.server.fault
+        if fault == 'stall':
+            time.sleep(self.server.stall)
+        elif fault != 'short':
+            # SO_LINGER 0: closing sends RST instead of FIN
+            self.connection.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack('ii', 1, 0))
+        self.close_connection = True
+
+    def _send_empty(self, status, headers=None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+
+def parse_file_specs(specs, seed=0):
+    """Turn ['name=size_mib', ...] into SyntheticFile objects."""
+    files = []
+    for spec in specs:
+        name, _, size = spec.partition('=')
+        files.append(SyntheticFile(name, int(float(size or 64) * 1024 * 1024), seed))
+    return files
+
+
+def start_server(files, host='127.0.0.1', port=0, **conditions):
+    """Start a StoreServer on a background thread and return it."""
+    server = StoreServer((host, port), files, **conditions)
+    threading.Thread(target=server.serve_forever, name='local-store', daemon=True).start()
+    return server
+
+
+def spawn_server(file_specs, port, bandwidth_mb=0.0, latency=0.0, max_connections=0, rate_429=0.0, seed=0,
+                 fault=None, fault_at=0, stall=10.0, slow_rate=0.0, slow_factor=8.0):
+    """Run the server as a child process and wait until it accepts connections."""
+    command = [sys.executable, os.path.abspath(__file__), '--port', str(port), '--bandwidth', str(bandwidth_mb),
+               '--latency', str(latency), '--max-connections', str(max_connections), '--rate-429', str(rate_429),
+               '--seed', str(seed), '--fault-at', str(fault_at), '--stall', str(stall),
+               '--slow-rate', str(slow_rate), '--slow-factor', str(slow_factor)]
+    if fault:
+        command += ['--fault', fault]
+    for spec in file_specs:
+        command += ['--file', spec]
+    return wait_until_listening(subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL),
+                                port)
+
+
+def wait_until_listening(process, port, timeout=10):
+    """Return process once something accepts connections on port; kill it on timeout."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=0.2):
+                return process
+        except OSError:
+            time.sleep(0.05)
+    process.kill()
+    raise RuntimeError(f"Server did not start on port {port}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=9999)
+    parser.add_argument('--file', action='append', default=[], help='name=size_in_MiB (repeatable)')
+    parser.add_argument('--bandwidth', type=float, default=0.0, help='per-connection cap in MB/s')
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds before headers')
+    parser.add_argument('--max-connections', type=int, default=0, help='concurrent GETs before 429')
+    parser.add_argument('--rate-429', type=float, default=0.0, help='fraction of GETs answered with 429')
+    parser.add_argument('--slow-rate', type=float, default=0.0, help='fraction of GETs sent slowly')
+    parser.add_argument('--slow-factor', type=float, default=8.0, help='how many times slower those are')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--fault', choices=FAULTS, help='fault injected once')
+    parser.add_argument('--fault-at', type=int, default=0, help='file offset in bytes where the fault fires')
+    parser.add_argument('--stall', type=float, default=10.0, help='seconds a stall lasts')
+    args = parser.parse_args()
+
+    files = parse_file_specs(args.file or ['game.part1.rar=256', 'game.part2.rar=256'], args.seed)
+    server = StoreServer((args.host, args.port), files, args.bandwidth, args.latency, args.max_connections,
+                         args.rate_429, args.seed, args.fault, args.fault_at, args.stall, args.slow_rate,
+                         args.slow_factor)
+    print(f"Serving {len(files)} files on {server.base_url}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Redraw cost of the progress bar per update.
+
+Feeds a stream of progress events (default 20,000, the way per-chunk
+callbacks arrive) to the current SmoothProgressBar and to the
+delete-and-recreate drawing it replaced. Idle tasks are processed every
+32 updates, roughly one frame of the UI bus, so Tk's own repaint is
+included. Needs a display.
+
+    python benchmarks/progress_redraw.py [updates]
+"""
+
+import os
+import sys
+import time
+import tkinter as tk
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.gui.styles import _interpolate_progress_color, get_progress_color  # noqa: E402
+from src.gui.widgets import SmoothProgressBar  # noqa: E402
+
+WIDTH = 400
+HEIGHT = 25
+UPDATES_PER_FRAME = 32
+
+
+class RecreatingProgressBar:
+    """The SmoothProgressBar drawing before canvas items were reused."""
+
+    def __init__(self, master):
+        self.canvas = tk.Canvas(master, width=WIDTH, height=HEIGHT, bg='#1a1a1a', highlightthickness=2, bd=0)
+        self.canvas.pack()
+        self._progress = 0.0
+
+    def set_progress(self, value):
+        self._progress = max(0, min(100, value))
+        self.canvas.delete("all")
+        self.canvas.create_rectangle(2, 2, WIDTH - 2, HEIGHT - 2, fill='#1a1a1a', outline='#00ff00', width=2)
+        if self._progress > 0:
+            fill_width = 2 + ((WIDTH - 4) * self._progress / 100)
+            self.canvas.create_rectangle(2, 2, fill_width, HEIGHT - 2,
+                                         fill=_interpolate_progress_color(self._progress), outline="", width=0)
+        self.canvas.create_text(WIDTH / 2, HEIGHT / 2, text=f"{self._progress:.1f}%", fill='#ffffff',
+                                font=('Segoe UI', 10, 'bold'))
+
+
+def progress_events(count):
+    # A few parts of one download: small steps that restart at zero
+    parts = 4
+    per_part = count // parts
+    for i in range(per_part * parts):
+        yield (i % per_part) * 100 / per_part
+
+
+def measure(root, bar, count):
+    root.update()
+    start = time.perf_counter()
+    for i, value in enumerate(progress_events(count)):
+        bar.set_progress(value)
+        if i % UPDATES_PER_FRAME == 0:
+            root.update_idletasks()
+    root.update_idletasks()
+    return (time.perf_counter() - start) / count
+
+
+def measure_colors(count):
+    values = [i * 100 / count for i in range(count)]
+    start = time.perf_counter()
+    for value in values:
+        _interpolate_progress_color(value)
+    computed = (time.perf_counter() - start) / count
+    start = time.perf_counter()
+    for value in values:
+        get_progress_color(value)
+    return computed, (time.perf_counter() - start) / count
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    root = tk.Tk()
+
+    before = measure(root, RecreatingProgressBar(root), count)
+    after = measure(root, SmoothProgressBar(root, width=WIDTH, height=HEIGHT), count)
+    computed, table = measure_colors(count)
+    root.destroy()
+
+    print(f"{count:,} progress updates")
+    print(f"  delete and recreate: {before * 1e6:8.2f} us/update")
+    print(f"  reuse items:         {after * 1e6:8.2f} us/update ({before / after:.1f}x faster)")
+    print(f"  color computed:      {computed * 1e9:8.0f} ns/lookup")
+    print(f"  color table:         {table * 1e9:8.0f} ns/lookup")
+
+
+if __name__ == "__main__":
+    main()
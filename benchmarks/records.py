@@ -0,0 +1,60 @@
+"""
+Result log shared by the benchmarks.
+
+Each benchmark appends one JSON line per case to benchmarks/results/<name>.jsonl,
+tagged with the time, git commit, Python version and platform, and prints
+the change against the previous record of the same case.
+"""
+
+import json
+import os
+import platform
+import subprocess
+from datetime import datetime
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+RESULTS_DIR = os.path.join(BENCHMARK_DIR, 'results')
+
+
+def results_path(name):
+    return os.path.join(RESULTS_DIR, f"{name}.jsonl")
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=BENCHMARK_DIR,
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_context():
+    """Fields recorded with every result of one run."""
+    return {'ts': datetime.now().isoformat(timespec='seconds'), 'commit': git_commit(),
+            'python': platform.python_version(), 'platform': platform.platform()}
+
+
+def load_previous(path, key_fields):
+    """Return the latest record for each case, keyed by the values of key_fields."""
+    previous = {}
+    if os.path.exists(path):
+        with open(path, encoding='utf-8') as file:
+            for line in file:
+                try:
+                    record = json.loads(line)
+                    previous[tuple(record[field] for field in key_fields)] = record
+                except (ValueError, KeyError):
+                    continue
+    return previous
+
+
+def format_value(result, key, width, precision=2):
+    """Right-aligned number, or '-' when the case produced no value."""
+    value = result.get(key)
+    return f"{value:{width}.{precision}f}" if value is not None else '-'.rjust(width)
+
+
+def change(current, before, key):
+    if not before or not before.get(key) or current.get(key) is None:
+        return ''
+    return f" ({(current[key] / before[key] - 1) * 100:+.0f}%)"
@@ -0,0 +1,153 @@
+"""
+Link-resolution latency against the offline fixture site.
+
+Times the resolution paths end to end, from URL to list of links, with
+every request answered by benchmarks/fixture_site.py:
+
+  api-*          try_api_endpoint(): file list plus one no-recaptcha call per part
+  api-files      try_api_endpoint() for an app without a file list
+  page-*         get_html_content() + extract_download_links() on store pages,
+                 with the links inline or only in window.__INITIAL_STATE__
+  movies-*       the Movies page path: get_html_content(), find_video_links(),
+                 group_videos_by_season() and find_subtitle_links()
+  parse-*        the same extraction on an already fetched page (no network)
+
+Each case also checks the number of links found. --latency delays every
+fixture response to approximate a remote server. Results are appended to
+benchmarks/results/resolution.jsonl with the git commit, and the summary
+shows the change against the previous run.
+
+    python benchmarks/resolution.py [--repeat N] [--latency SECONDS] [--case NAME ...]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import statistics
+import sys
+import time
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCHMARK_DIR))
+sys.path.insert(0, BENCHMARK_DIR)
+
+SITE_PORT = 9872
+SITE_URL = f"http://127.0.0.1:{SITE_PORT}"
+
+# main reads the API base when it is imported
+os.environ['VODU_STORE_API_BASE'] = SITE_URL
+
+import main  # noqa: E402
+from fixture_site import DEFAULT_CORPUS_DIR, spawn_fixture_site  # noqa: E402
+from records import change, format_value, load_previous, results_path, run_context  # noqa: E402
+
+RESULTS_PATH = results_path('resolution')
+
+
+def resolve_store_api(app_id):
+    return len(main.try_api_endpoint(f"https://share.vodu.store/#/details/{app_id}") or [])
+
+
+def extract_store_links(html):
+    return len(main.extract_download_links(html))
+
+
+def resolve_store_page(app_id):
+    return extract_store_links(main.get_html_content(f"{SITE_URL}/details/{app_id}"))
+
+
+def extract_series(html, quality):
+    # The extraction steps of download_series_worker(), without the downloads
+    video_matches = main.find_video_links(html, quality)
+    if not video_matches:
+        return len(main.find_available_qualities(html))
+    _, season_videos = main.group_videos_by_season(video_matches, 'all')
+    return sum(len(videos) for videos in season_videos.values()) + len(main.find_subtitle_links(html))
+
+
+def resolve_series(slug, quality):
+    return extract_series(main.get_html_content(f"{SITE_URL}/series/{slug}"), quality)
+
+
+def parse_page(path, parse):
+    # Fetched once, outside the timed calls
+    html = main.get_html_content(SITE_URL + path)
+    return lambda: parse(html)
+
+
+# Case name -> (function returning a zero-argument callable, links expected).
+# Movies cases count videos plus subtitles; the missing-quality case counts
+# the qualities offered instead.
+CASES = {
+    'api-1': (lambda: lambda: resolve_store_api(100001), 1),
+    'api-10': (lambda: lambda: resolve_store_api(100010), 10),
+    'api-40': (lambda: lambda: resolve_store_api(100040), 40),
+    'api-files': (lambda: lambda: resolve_store_api(200010), 10),
+    'page-inline': (lambda: lambda: resolve_store_page(100040), 40),
+    'page-state': (lambda: lambda: resolve_store_page(300040), 40),
+    'movies-dash': (lambda: lambda: resolve_series('dash-3x12', '720p'), 72),
+    'movies-underscore': (lambda: lambda: resolve_series('underscore-2x10', '720p'), 40),
+    'movies-large': (lambda: lambda: resolve_series('dash-10x24', '1080p'), 480),
+    'movies-missing': (lambda: lambda: resolve_series('no-1080-1x8', '1080p'), 2),
+    'parse-inline': (lambda: parse_page('/details/100040', extract_store_links), 40),
+    'parse-state': (lambda: parse_page('/details/300040', extract_store_links), 40),
+    'parse-dash': (lambda: parse_page('/series/dash-3x12', lambda html: extract_series(html, '720p')), 72),
+    'parse-underscore': (lambda: parse_page('/series/underscore-2x10', lambda html: extract_series(html, '720p')),
+                         40),
+    'parse-large': (lambda: parse_page('/series/dash-10x24', lambda html: extract_series(html, '1080p')), 480),
+}
+
+
+def benchmark(case, repeat):
+    prepare, expected = CASES[case]
+    with contextlib.redirect_stdout(io.StringIO()):
+        run = prepare()
+        found = run()
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            run()
+            times.append(time.perf_counter() - start)
+    return {
+        'case': case,
+        'repeat': repeat,
+        'median_ms': round(statistics.median(times) * 1000, 3),
+        'min_ms': round(min(times) * 1000, 3),
+        'found': found,
+        'correct': found == expected,
+    }
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Link-resolution latency benchmark")
+    parser.add_argument('--case', action='append', choices=list(CASES))
+    parser.add_argument('--repeat', type=int, default=20, help='timed runs per case')
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds added to every fixture response')
+    parser.add_argument('--corpus', default=DEFAULT_CORPUS_DIR, help='directory of recorded fixtures')
+    parser.add_argument('--results', default=RESULTS_PATH)
+    args = parser.parse_args()
+
+    previous = load_previous(args.results, ('case', 'latency'))
+    os.makedirs(os.path.dirname(args.results), exist_ok=True)
+    context = {**run_context(), 'latency': args.latency}
+
+    site = spawn_fixture_site(SITE_PORT, args.latency, args.corpus)
+    try:
+        with open(args.results, 'a', encoding='utf-8') as results:
+            for case in args.case or list(CASES):
+                result = benchmark(case, args.repeat)
+                results.write(json.dumps({**context, **result}) + '\n')
+                results.flush()
+                before = previous.get((case, args.latency))
+                print(f"{case:18} {format_value(result, 'median_ms', 9)} ms median"
+                      f"{change(result, before, 'median_ms'):7} {format_value(result, 'min_ms', 9)} ms min  "
+                      f"{result['found']:4} found{'' if result['correct'] else '  UNEXPECTED'}")
+    finally:
+        site.terminate()
+        site.wait()
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,173 @@
+"""
+Transfer throughput of the download engines against the local store stand-in.
+
+For every scenario (transfer conditions on benchmarks/local_server.py) and
+every engine mode, downloads one synthetic file and records:
+
+  mb_per_s        wall-clock throughput
+  cpu_s_per_gb    client process CPU seconds per GiB transferred
+  peak_mib        peak Python memory during a separate tracemalloc run
+  wall_p50_s      median completion time across the repeats
+  wall_max_s      slowest completion time, where a lagging connection shows
+
+The server runs as a child process so its CPU is not counted. Every result
+is appended to benchmarks/results/transfer.jsonl together with the git
+commit, and the summary shows the change against the previous run of the
+same scenario and mode.
+
+    python benchmarks/transfer.py [--size MiB] [--scenario NAME ...] [--mode NAME ...] [--repeat N]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCHMARK_DIR))
+sys.path.insert(0, BENCHMARK_DIR)
+
+import main  # noqa: E402
+from local_server import SyntheticFile, spawn_server  # noqa: E402
+from records import change, format_value, load_previous, results_path, run_context  # noqa: E402
+
+RESULTS_PATH = results_path('transfer')
+SERVER_PORT = 9871
+# Connections per file in the segmented modes
+SEGMENT_CONNECTIONS = 4
+
+# Transfer conditions, passed to spawn_server()
+SCENARIOS = {
+    'loopback': {},
+    'capped': {'bandwidth_mb': 20, 'latency': 0.05},
+    'throttled': {'bandwidth_mb': 20, 'latency': 0.05, 'rate_429': 0.2},
+    # A quarter of the connections run at 1/8 of the cap
+    'laggard': {'bandwidth_mb': 20, 'latency': 0.05, 'slow_rate': 0.25, 'slow_factor': 8},
+}
+
+
+def run_resume(url, path, session):
+    return main.download_part_with_resume(url, path, None, session)
+
+
+def run_retry(url, path, session):
+    return main.download_with_retry(url, path, session=session)
+
+
+def run_segmented(url, path, session, steal=True, hedge_bytes=0):
+    return main.download_part_segmented(url, path, None, session, connections=SEGMENT_CONNECTIONS, steal=steal,
+                                        hedge_bytes=hedge_bytes)
+
+
+# Engine mode name -> function(url, save_path, requests_session) returning success
+MODES = {
+    'resume': run_resume,
+    'retry': run_retry,
+    # Fixed split over SEGMENT_CONNECTIONS connections
+    'segmented': lambda url, path, session: run_segmented(url, path, session, steal=False),
+    'stealing': run_segmented,
+    'hedged': lambda url, path, session: run_segmented(url, path, session, hedge_bytes=4 * 1024 * 1024),
+}
+
+
+def file_md5(path):
+    digest = hashlib.md5()
+    with open(path, 'rb') as file:
+        for block in iter(lambda: file.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def transfer_once(mode, url, work_dir, trace_memory=False):
+    save_path = os.path.join(work_dir, 'download.bin')
+    for leftover in (save_path, save_path + main.RANGE_MAP_SUFFIX):
+        if os.path.exists(leftover):
+            os.remove(leftover)
+    session = main.create_optimized_session()
+    if trace_memory:
+        tracemalloc.start()
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    try:
+        ok = MODES[mode](url, save_path, session)
+    finally:
+        wall = time.perf_counter() - wall_start
+        cpu = time.process_time() - cpu_start
+        peak = tracemalloc.get_traced_memory()[1] if trace_memory else None
+        if trace_memory:
+            tracemalloc.stop()
+        session.close()
+    return ok, wall, cpu, peak, save_path
+
+
+def benchmark(scenario, mode, size_mib, repeat, work_dir, measure_memory):
+    name = f"bench-{size_mib}.bin"
+    expected = SyntheticFile(name, size_mib * 1024 * 1024)
+    expected_md5 = expected.etag.strip('"')
+    server = spawn_server([f"{name}={size_mib}"], SERVER_PORT, **SCENARIOS[scenario])
+    try:
+        url = f"http://127.0.0.1:{SERVER_PORT}/store-files/{name}"
+        runs = []
+        for _ in range(repeat):
+            ok, wall, cpu, _, path = transfer_once(mode, url, work_dir)
+            correct = ok and file_md5(path) == expected_md5
+            runs.append((wall, cpu, correct))
+        peak = transfer_once(mode, url, work_dir, trace_memory=True)[3] if measure_memory else None
+    finally:
+        server.terminate()
+        server.wait()
+
+    # Only runs that produced the right file count towards speed and CPU
+    good = [run for run in runs if run[2]]
+    size_gib = expected.size / 1024 ** 3
+    return {
+        'scenario': scenario,
+        'mode': mode,
+        'size_mib': size_mib,
+        'repeat': repeat,
+        'mb_per_s': round(expected.size / 1024 ** 2 / min(run[0] for run in good), 2) if good else None,
+        'cpu_s_per_gb': round(min(run[1] for run in good) / size_gib, 3) if good else None,
+        'peak_mib': round(peak / 1024 ** 2, 2) if peak is not None else None,
+        'wall_p50_s': round(statistics.median(run[0] for run in good), 3) if good else None,
+        'wall_max_s': round(max(run[0] for run in good), 3) if good else None,
+        'correct': len(good),
+    }
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Transfer throughput benchmark")
+    parser.add_argument('--size', type=int, default=256, help='file size in MiB')
+    parser.add_argument('--scenario', action='append', choices=sorted(SCENARIOS))
+    parser.add_argument('--mode', action='append', choices=sorted(MODES))
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='runs per case; speed and CPU keep the best one')
+    parser.add_argument('--no-memory', action='store_true', help='skip the tracemalloc run')
+    parser.add_argument('--results', default=RESULTS_PATH)
+    args = parser.parse_args()
+
+    previous = load_previous(args.results, ('scenario', 'mode', 'size_mib'))
+    os.makedirs(os.path.dirname(args.results), exist_ok=True)
+    context = run_context()
+
+    with tempfile.TemporaryDirectory() as work_dir, open(args.results, 'a', encoding='utf-8') as results:
+        for scenario in args.scenario or list(SCENARIOS):
+            for mode in args.mode or list(MODES):
+                result = benchmark(scenario, mode, args.size, args.repeat, work_dir, not args.no_memory)
+                results.write(json.dumps({**context, **result}) + '\n')
+                results.flush()
+                before = previous.get((scenario, mode, args.size))
+                print(f"{scenario:10} {mode:8} {result['correct']}/{result['repeat']} ok  "
+                      f"{format_value(result, 'mb_per_s', 8, 1)} MB/s{change(result, before, 'mb_per_s'):7} "
+                      f"{format_value(result, 'cpu_s_per_gb', 7)} CPU s/GB{change(result, before, 'cpu_s_per_gb'):7} "
+                      f"{format_value(result, 'peak_mib', 7)} MiB peak  "
+                      f"{format_value(result, 'wall_p50_s', 6)} s p50{change(result, before, 'wall_p50_s'):7} "
+                      f"{format_value(result, 'wall_max_s', 6)} s max{change(result, before, 'wall_max_s'):7}")
+
+
+if __name__ == "__main__":
+    main_cli()
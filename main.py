@@ -5,27 +5,41 @@ Main entry point with download logic preserved and new iOS-style GUI.
 
 import threading
 import shutil
-from enum import Enum
-from typing import List, Optional
+import functools
+import itertools
+import socket
+import argparse
+import contextlib
+import hashlib
+import zlib
+import base64
+import random
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from dataclasses import dataclass
 import re
 import os
 import json
 import time
 import sys
 import webbrowser
-import tkinter as tk
-from tkinter import messagebox, filedialog
+
+try:
+    import tkinter as tk
+    from tkinter import messagebox, filedialog
+except ImportError:  # Headless servers often ship Python without Tk
+    tk = messagebox = filedialog = None
 
 import requests
 from tqdm import tqdm
 from urllib3.exceptions import IncompleteRead
-from urllib.parse import urlparse
+from http.server import ThreadingHTTPServer
 
 # Connection pooling optimization
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
 
 # Selenium imports for JavaScript rendering
 from selenium import webdriver
@@ -33,146 +47,139 @@ from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 import chromedriver_autoinstaller
 
-# Import the new iOS-style GUI
-from src.gui import VoduDownloaderApp
+from src.core.control import TransferControl
+from src.core.daemon import DAEMON_DEFAULT_PORT, DaemonRequestHandler, DownloadDaemon
+from src.core.metrics import (
+    ACTIVE_TRANSFERS, DISK_SYNC_SECONDS, DISK_WRITE_SECONDS, DOWNLOADED_BYTES, DOWNLOAD_RETRIES, METRICS,
+    RESOLUTION_SECONDS,
+)
+from src.core.models import (
+    DownloadPart, DownloadSession, PartStatus, PhaseTimings, SessionStatus,
+    finalize_session_status, update_speed_tracking,
+)
+from src.core.reports import save_session_report
+from src.core.segments import SEGMENT_CONNECTIONS, SEGMENT_HEDGE_BYTES, SEGMENT_MIN_BYTES, SegmentScheduler
+from src.core.session_store import make_session_id, open_session_store, recall_part_digest
+from src.core.tracing import TRACE, save_trace, trace_instant, traced
+
 
 # ============================================================================
-# Apps and Games Download - Data Classes and Enums
+# Transfer Phase Timing
 # ============================================================================
 
+# Off unless VODU_PHASE_TIMING is set or a trace is recorded; when off,
+# requests use the plain adapter and nothing is recorded per request.
+PHASE_TIMING_ENABLED = os.environ.get('VODU_PHASE_TIMING', '') not in ('', '0') or TRACE is not None
+# The request being timed on this thread; connections opened while it is
+# set add their DNS, connect and TLS time to it
+_phase_context = threading.local()
 
-class PartStatus(Enum):
-    PENDING = "pending"
-    DOWNLOADING = "downloading"
-    COMPLETED = "completed"
-    FAILED = "failed"
-    SKIPPED = "skipped"
-
-
-class SessionStatus(Enum):
-    INITIALIZED = "initialized"
-    DOWNLOADING = "downloading"
-    PAUSED = "paused"
-    COMPLETED = "completed"
-    PARTIALLY_COMPLETED = "partially_completed"
-    FAILED = "failed"
-    CANCELLED = "cancelled"
-
-
-@dataclass
-class DownloadPart:
-    part_number: int
-    filename: str
-    download_url: str
-    expected_size: int
-    downloaded_size: int = 0
-    status: PartStatus = PartStatus.PENDING
-    retry_count: int = 0
-    local_path: Optional[str] = None
-    last_attempt_at: Optional[datetime] = None
-    completed_at: Optional[datetime] = None
-    instant_speed_mb: float = 0.0
-    speed_samples: List[float] = None
-    last_speed_update: Optional[datetime] = None
-
-    def __post_init__(self):
-        if self.speed_samples is None:
-            self.speed_samples = []
-
-    def is_complete(self) -> bool:
-        return self.status in [PartStatus.COMPLETED, PartStatus.SKIPPED]
-
-    def is_resumable(self) -> bool:
-        return self.downloaded_size > 0 and self.downloaded_size < self.expected_size
-
-
-@dataclass
-class DownloadSession:
-    session_id: str
-    vodu_store_url: str
-    download_location: str
-    app_name: str
-    parts: List[DownloadPart]
-    total_parts: int
-    completed_parts: int = 0
-    overall_progress: float = 0.0
-    total_downloaded_bytes: int = 0
-    total_expected_bytes: int = 0
-    status: SessionStatus = SessionStatus.INITIALIZED
-    created_at: datetime = None
-    started_at: Optional[datetime] = None
-    completed_at: Optional[datetime] = None
-    last_error: Optional[str] = None
-    peak_speed_mb: float = 0.0
-    average_speed_mb: float = 0.0
-    speed_variance: float = 0.0
-    speed_stability_score: float = 0.0
-
-    def __post_init__(self):
-        if self.created_at is None:
-            self.created_at = datetime.now()
-
-    def calculate_progress(self) -> float:
-        if self.total_expected_bytes == 0:
-            return 0.0
-        self.total_downloaded_bytes = sum(
-            p.downloaded_size for p in self.parts)
-        self.overall_progress = (
-            self.total_downloaded_bytes / self.total_expected_bytes) * 100
-        return self.overall_progress
-
-    def get_next_pending_part(self) -> Optional[DownloadPart]:
-        for part in self.parts:
-            if part.status in [PartStatus.PENDING, PartStatus.FAILED]:
-                return part
-        return None
 
-    def mark_part_completed(self, part: DownloadPart):
-        part.status = PartStatus.COMPLETED
-        part.completed_at = datetime.now()
-        self.completed_parts += 1
-        self.calculate_progress()
+class _PhaseTimedConnection:
+    def _new_conn(self):
+        timings = getattr(_phase_context, 'current', None)
+        if timings is None:
+            return super()._new_conn()
+        started = time.perf_counter()
+        try:
+            address = socket.getaddrinfo(self._dns_host, self.port, 0, socket.SOCK_STREAM)[0][4][0]
+        except OSError:
+            # Let urllib3 resolve again and raise its usual error
+            return super()._new_conn()
+        resolved = time.perf_counter()
+        dns_host, self._dns_host = self._dns_host, address
+        try:
+            sock = super()._new_conn()
+        finally:
+            self._dns_host = dns_host
+        connected = time.perf_counter()
+        timings.dns += resolved - started
+        timings.connect += connected - resolved
+        if TRACE is not None:
+            TRACE.complete('dns', 'connect', started, resolved, host=dns_host)
+            TRACE.complete('connect', 'connect', resolved, connected, address=address, port=self.port)
+        return sock
+
+    def connect(self):
+        timings = getattr(_phase_context, 'current', None)
+        if timings is None:
+            return super().connect()
+        started = time.perf_counter()
+        opened = timings.dns + timings.connect
+        try:
+            super().connect()
+        finally:
+            if isinstance(self, HTTPSConnection):
+                ended = time.perf_counter()
+                tls = max(0.0, ended - started - (timings.dns + timings.connect - opened))
+                timings.tls += tls
+                if TRACE is not None:
+                    TRACE.complete('tls', 'connect', ended - tls, ended, host=self.host)
 
 
-# ============================================================================
-# Speed Tracking Functions
-# ============================================================================
+class PhaseTimedHTTPConnection(_PhaseTimedConnection, HTTPConnection):
+    pass
+
+
+class PhaseTimedHTTPSConnection(_PhaseTimedConnection, HTTPSConnection):
+    pass
+
+
+class PhaseTimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = PhaseTimedHTTPConnection
 
-def update_speed_tracking(part: DownloadPart, bytes_downloaded: int, elapsed_seconds: float):
-    if elapsed_seconds <= 0:
-        return
-    speed_mb = (bytes_downloaded / (1024 * 1024)) / elapsed_seconds
-    part.instant_speed_mb = speed_mb
-    part.last_speed_update = datetime.now()
-    part.speed_samples.append(speed_mb)
-    if len(part.speed_samples) > 10:
-        part.speed_samples.pop(0)
 
+class PhaseTimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = PhaseTimedHTTPSConnection
 
-def calculate_session_metrics(session: DownloadSession):
-    if not session.parts:
+
+class PhaseTimingAdapter(HTTPAdapter):
+    """HTTPAdapter whose new connections report their DNS, connect and TLS time."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': PhaseTimedHTTPConnectionPool,
+            'https': PhaseTimedHTTPSConnectionPool,
+        }
+
+
+@contextlib.contextmanager
+def timed_request(timings):
+    """
+    Time the block as one request waiting for its response headers.
+
+    Connections opened inside the block add their DNS, connect and TLS
+    time to timings; the rest of the block counts as ttfb. With None the
+    block runs untimed.
+    """
+    if timings is None:
+        yield
         return
-    all_speeds = []
-    peak = 0.0
-    for part in session.parts:
-        if part.speed_samples:
-            all_speeds.extend(part.speed_samples)
-            part_peak = max(part.speed_samples)
-            peak = max(peak, part_peak)
-    if all_speeds:
-        import statistics
-        session.peak_speed_mb = peak
-        session.average_speed_mb = statistics.mean(all_speeds)
-        if len(all_speeds) > 1:
-            session.speed_variance = statistics.stdev(all_speeds)
-            if session.average_speed_mb > 0:
-                cv = session.speed_variance / session.average_speed_mb
-                session.speed_stability_score = max(0.0, 1.0 - cv)
-            else:
-                session.speed_stability_score = 0.0
-        else:
-            session.speed_variance = 0.0
-            session.speed_stability_score = 1.0
+    opened = timings.dns + timings.connect + timings.tls
+    started = time.perf_counter()
+    _phase_context.current = timings
+    try:
+        yield
+    finally:
+        _phase_context.current = None
+        ended = time.perf_counter()
+        timings.ttfb += max(0.0, ended - started - (timings.dns + timings.connect + timings.tls - opened))
+        if TRACE is not None:
+            TRACE.complete('request', 'transfer', started, ended)
+
+
+def part_phase_fields(part):
+    """Event fields with the part's summed phase timings; empty while timing is off."""
+    if not part.phase_timings:
+        return {}
+    return {'phases': PhaseTimings.combine(part.phase_timings).to_dict()}
+
+
+def emit_phase_summary(on_event, session):
+    if session.phase_timings is not None:
+        emit_event(on_event, 'phase_summary', phases=session.phase_timings.to_dict(),
+                   slowest=session.phase_timings.slowest())
 
 
 # ============================================================================
@@ -186,7 +193,8 @@ def create_optimized_session():
         backoff_factor=0.1,
         status_forcelist=[429, 500, 502, 503, 504],
     )
-    adapter = HTTPAdapter(
+    adapter_class = PhaseTimingAdapter if PHASE_TIMING_ENABLED else HTTPAdapter
+    adapter = adapter_class(
         pool_connections=30,
         pool_maxsize=30,
         max_retries=retry_strategy,
@@ -208,121 +216,9 @@ def create_optimized_session():
 # Resume State Functions
 # ============================================================================
 
-def get_resume_state_path():
-    home_dir = os.path.expanduser("~")
-    vodu_dir = os.path.join(home_dir, ".vodu_downloader")
-    os.makedirs(vodu_dir, exist_ok=True)
-    return os.path.join(vodu_dir, "resume_state.json")
-
-
-def load_resume_state():
-    json_path = get_resume_state_path()
-    try:
-        with open(json_path, 'r') as f:
-            data = json.load(f)
-        version = data.get('version', '1.0')
-        sessions_data = data.get('sessions', [])
-        sessions = []
-        for session_dict in sessions_data:
-            session = DownloadSession(
-                session_id=session_dict['session_id'],
-                vodu_store_url=session_dict['vodu_store_url'],
-                download_location=session_dict['download_location'],
-                app_name=session_dict['session_id'],
-                parts=[],
-                total_parts=session_dict.get('total_parts', 0),
-                completed_parts=session_dict.get('completed_parts', 0),
-                overall_progress=session_dict.get('overall_progress', 0.0),
-                total_downloaded_bytes=session_dict.get('total_downloaded_bytes', 0),
-                total_expected_bytes=session_dict.get('total_expected_bytes', 0),
-                status=SessionStatus(session_dict.get('status', 'initialized')),
-                created_at=datetime.fromisoformat(session_dict['created_at']) if session_dict.get('created_at') else datetime.now(),
-                started_at=datetime.fromisoformat(session_dict['started_at']) if session_dict.get('started_at') else None,
-                completed_at=datetime.fromisoformat(session_dict['completed_at']) if session_dict.get('completed_at') else None,
-                last_error=session_dict.get('last_error'),
-                peak_speed_mb=session_dict.get('peak_speed_mb', 0.0),
-                average_speed_mb=session_dict.get('average_speed_mb', 0.0),
-                speed_variance=session_dict.get('speed_variance', 0.0),
-                speed_stability_score=session_dict.get('speed_stability_score', 0.0)
-            )
-            for part_dict in session_dict.get('parts', []):
-                part = DownloadPart(
-                    part_number=part_dict['part_number'],
-                    filename=part_dict['filename'],
-                    download_url=part_dict['download_url'],
-                    expected_size=part_dict['expected_size'],
-                    downloaded_size=part_dict.get('downloaded_size', 0),
-                    status=PartStatus(part_dict.get('status', 'pending')),
-                    retry_count=part_dict.get('retry_count', 0),
-                    local_path=part_dict.get('local_path'),
-                    last_attempt_at=datetime.fromisoformat(part_dict['last_attempt_at']) if part_dict.get('last_attempt_at') else None,
-                    completed_at=datetime.fromisoformat(part_dict['completed_at']) if part_dict.get('completed_at') else None,
-                    instant_speed_mb=part_dict.get('instant_speed_mb', 0.0),
-                    speed_samples=part_dict.get('speed_samples', []),
-                    last_speed_update=datetime.fromisoformat(part_dict['last_speed_update']) if part_dict.get('last_speed_update') else None
-                )
-                session.parts.append(part)
-            sessions.append(session)
-        return sessions
-    except (FileNotFoundError, json.JSONDecodeError):
-        return []
-
-
-def save_resume_state(sessions):
-    json_path = get_resume_state_path()
-    sessions_data = []
-    for session in sessions:
-        session_dict = {
-            'session_id': session.session_id,
-            'vodu_store_url': session.vodu_store_url,
-            'download_location': session.download_location,
-            'app_name': session.app_name,
-            'total_parts': session.total_parts,
-            'completed_parts': session.completed_parts,
-            'overall_progress': session.overall_progress,
-            'total_downloaded_bytes': session.total_downloaded_bytes,
-            'total_expected_bytes': session.total_expected_bytes,
-            'status': session.status.value if isinstance(session.status, SessionStatus) else session.status,
-            'created_at': session.created_at.isoformat() if session.created_at else None,
-            'started_at': session.started_at.isoformat() if session.started_at else None,
-            'completed_at': session.completed_at.isoformat() if session.completed_at else None,
-            'last_error': session.last_error,
-            'peak_speed_mb': session.peak_speed_mb,
-            'average_speed_mb': session.average_speed_mb,
-            'speed_variance': session.speed_variance,
-            'speed_stability_score': session.speed_stability_score,
-            'parts': []
-        }
-        for part in session.parts:
-            part_dict = {
-                'part_number': part.part_number,
-                'filename': part.filename,
-                'download_url': part.download_url,
-                'expected_size': part.expected_size,
-                'downloaded_size': part.downloaded_size,
-                'status': part.status.value if isinstance(part.status, PartStatus) else part.status,
-                'retry_count': part.retry_count,
-                'local_path': part.local_path,
-                'last_attempt_at': part.last_attempt_at.isoformat() if part.last_attempt_at else None,
-                'completed_at': part.completed_at.isoformat() if part.completed_at else None,
-                'instant_speed_mb': part.instant_speed_mb,
-                'speed_samples': part.speed_samples,
-                'last_speed_update': part.last_speed_update.isoformat() if part.last_speed_update else None
-            }
-            session_dict['parts'].append(part_dict)
-        sessions_data.append(session_dict)
-    data = {
-        'version': '1.1',
-        'sessions': sessions_data
-    }
-    temp_path = json_path + '.tmp'
-    with open(temp_path, 'w') as f:
-        json.dump(data, f, indent=2, default=str)
-    os.replace(temp_path, json_path)
-
-
 def check_existing_part(file_path, expected_size):
-    if os.path.exists(file_path):
+    # A sidecar range map means the file is still incomplete, whatever its size
+    if os.path.exists(file_path) and not has_range_map(file_path):
         actual_size = os.path.getsize(file_path)
         return actual_size == expected_size
     return False
@@ -337,10 +233,584 @@ def check_disk_space(path, required_bytes):
         return True
 
 
+# ============================================================================
+# Byte-Range Completion Maps
+# ============================================================================
+
+RANGE_MAP_SUFFIX = '.vdmap'
+RANGE_MAP_CHECKPOINT_BYTES = 16 * 1024 * 1024
+RANGE_MAP_CHECKPOINT_SECONDS = 2.0
+TAIL_CHECK_BYTES = 64 * 1024
+
+
+def parse_content_range(header_value):
+    # "bytes 100-199/1000" -> (100, 200, 1000); total is None for "*"
+    match = re.match(r'bytes\s+(\d+)-(\d+)/(\d+|\*)', header_value or '')
+    if not match:
+        return None
+    start, last, total = match.groups()
+    return int(start), int(last) + 1, None if total == '*' else int(total)
+
+
+class RangeMap:
+    """
+    Completed byte ranges of a partially downloaded file.
+
+    The interval list lives in a small '<file>.vdmap' sidecar that is only
+    updated after the data it describes has been fsync'd. Each interval
+    also records the CRC32 of its last block so a torn tail left by a
+    power loss is detected on load by reading one block per interval.
+    """
+
+    def __init__(self, data_path, total_size=0, ranges=None, etag=None):
+        self.data_path = data_path
+        self.map_path = data_path + RANGE_MAP_SUFFIX
+        self.total_size = total_size
+        self.ranges = ranges or []  # sorted, non-overlapping [start, end, tail_crc]
+        self.etag = etag
+        # Segments of one file add ranges from several threads
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, data_path):
+        range_map = cls(data_path)
+        if not os.path.exists(data_path):
+            return range_map
+        try:
+            with open(range_map.map_path, 'r') as f:
+                data = json.load(f)
+            range_map.total_size = data.get('size', 0)
+            range_map.etag = data.get('etag')
+            range_map.ranges = [list(r) for r in data.get('ranges', [])]
+        except FileNotFoundError:
+            # Legacy partial file: trust the prefix except its possibly torn last block
+            file_size = os.path.getsize(data_path)
+            trusted = max(0, file_size - TAIL_CHECK_BYTES)
+            if trusted:
+                range_map.ranges = [[0, trusted, range_map.tail_crc(0, trusted)]]
+            return range_map
+        except (json.JSONDecodeError, TypeError, ValueError):
+            range_map.ranges = []
+            return range_map
+        range_map._verify_tails()
+        return range_map
+
+    def _verify_tails(self):
+        file_size = os.path.getsize(self.data_path)
+        verified = []
+        with open(self.data_path, 'rb') as f:
+            for start, end, tail_crc in self.ranges:
+                end = min(end, file_size)
+                if tail_crc is None or end <= start:
+                    continue  # Nothing to check it against: fetch it again
+                block_start = max(start, end - TAIL_CHECK_BYTES)
+                f.seek(block_start)
+                if zlib.crc32(f.read(end - block_start)) != tail_crc:
+                    # Torn or overwritten last block: fetch it again
+                    end = block_start
+                    tail_crc = self.tail_crc(start, end, f) if end > start else None
+                if end > start:
+                    verified.append([start, end, tail_crc])
+        self.ranges = verified
+
+    def tail_crc(self, start, end, f=None):
+        """CRC32 of the last block of the interval [start, end), read from the data file."""
+        block_start = max(start, end - TAIL_CHECK_BYTES)
+        if f is None:
+            with open(self.data_path, 'rb') as f:
+                f.seek(block_start)
+                return zlib.crc32(f.read(end - block_start))
+        f.seek(block_start)
+        return zlib.crc32(f.read(end - block_start))
+
+    def add(self, start, end, tail_crc=None):
+        if end <= start:
+            return
+        with self._lock:
+            self._add(start, end, tail_crc)
+
+    def _add(self, start, end, tail_crc):
+        merged = []
+        new_range = [start, end, tail_crc]
+        for existing in self.ranges:
+            if existing[1] < new_range[0] or existing[0] > new_range[1]:
+                merged.append(existing)
+                continue
+            if existing[1] > new_range[1]:
+                new_range[2] = existing[2]
+            new_range[0] = min(new_range[0], existing[0])
+            new_range[1] = max(new_range[1], existing[1])
+        merged.append(new_range)
+        self.ranges = sorted(merged)
+
+    def completed_bytes(self):
+        return sum(end - start for start, end, _ in self.ranges)
+
+    def missing(self):
+        """Return missing [start, end) ranges; end is None while the size is unknown."""
+        gaps = []
+        position = 0
+        for start, end, _ in self.ranges:
+            if start > position:
+                gaps.append((position, start))
+            position = max(position, end)
+        if not self.total_size:
+            gaps.append((position, None))
+        elif position < self.total_size:
+            gaps.append((position, self.total_size))
+        return gaps
+
+    def is_complete(self):
+        return bool(self.total_size) and not self.missing()
+
+    def reset(self):
+        self.ranges = []
+        self.total_size = 0
+        self.etag = None
+
+    def save(self):
+        # The new map must be on disk before it replaces the old one, and the
+        # rename itself must be durable, or a crash can leave either no map
+        # or an empty one
+        temp_path = self.map_path + '.tmp'
+        with self._lock, open(temp_path, 'w') as f:
+            json.dump({'v': 1, 'size': self.total_size, 'etag': self.etag, 'ranges': self.ranges}, f,
+                      separators=(',', ':'))
+            f.flush()
+            os.fsync(f.fileno())
+            f.close()
+            os.replace(temp_path, self.map_path)
+            fsync_directory(os.path.dirname(self.map_path))
+
+    def discard(self):
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(self.map_path)
+
+
+def fsync_directory(path):
+    # Makes a rename in path durable; Windows cannot open directories and
+    # does not need it
+    try:
+        fd = os.open(path or '.', os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def has_range_map(file_path):
+    return os.path.exists(file_path + RANGE_MAP_SUFFIX)
+
+
+# ============================================================================
+# Streaming Integrity Hashing
+# ============================================================================
+
+# ETags are opaque, so one that merely looks like an MD5 is only trusted as
+# the file's checksum when asked to, or from Amazon S3 (single-part uploads)
+ETAG_IS_MD5 = os.environ.get('VODU_ETAG_MD5', '') not in ('', '0')
+
+
+def etag_is_md5(headers):
+    return ETAG_IS_MD5 or headers.get('Server') == 'AmazonS3' or 'x-amz-request-id' in headers
+
+
+def server_checksum(headers, partial=False):
+    """Return an 'algorithm:hex' checksum advertised by the server, if any."""
+    for header, algorithm in (('X-Checksum-Sha256', 'sha256'), ('X-Checksum-Md5', 'md5')):
+        value = headers.get(header, '').strip().lower()
+        if re.fullmatch(r'[0-9a-f]+', value):
+            return f"{algorithm}:{value}"
+    digest_header = headers.get('Digest', '')
+    match = re.search(r'(sha-256|md5)=([A-Za-z0-9+/=]+)', digest_header, re.IGNORECASE)
+    if match:
+        algorithm = 'sha256' if match.group(1).lower() == 'sha-256' else 'md5'
+        with contextlib.suppress(ValueError):
+            return f"{algorithm}:{base64.b64decode(match.group(2)).hex()}"
+    content_md5 = headers.get('Content-MD5')
+    if content_md5 and not partial:
+        with contextlib.suppress(ValueError):
+            return f"md5:{base64.b64decode(content_md5).hex()}"
+    # Single-part S3-style ETags are the MD5 of the whole entity; other
+    # ETags only serve as If-Range validators in the range map
+    if not etag_is_md5(headers):
+        return None
+    etag = headers.get('ETag', '').strip().lower()
+    if etag.startswith('w/'):
+        return None
+    etag = etag.strip('"')
+    if re.fullmatch(r'[0-9a-f]{32}', etag):
+        return f"md5:{etag}"
+    return None
+
+
+class StreamingDigest:
+    """
+    Running hash of a file that is written front to back.
+
+    Chunks are hashed as they are written, so a completed download is
+    checked against the server checksum or the digest recorded for the
+    part without reading the file again. After an interruption the prefix
+    already on disk is hashed once before the transfer continues.
+    """
+
+    def __init__(self, recorded=None):
+        self.recorded = recorded
+        self.algorithm = recorded.split(':', 1)[0] if recorded else None
+        self.server_expected = None
+        self.position = 0
+        self._hash = None
+        self._broken = False
+
+    def start(self, headers, partial):
+        if self._hash is not None or self._broken:
+            return
+        advertised = server_checksum(headers, partial)
+        if self.algorithm is None:
+            self.algorithm = advertised.split(':', 1)[0] if advertised else 'sha256'
+        if advertised and advertised.startswith(self.algorithm + ':'):
+            self.server_expected = advertised
+        self._hash = hashlib.new(self.algorithm)
+
+    def restart(self, content_changed=False):
+        # The file is written again from byte 0, so the next start() takes
+        # the checksum of the new response. A digest recorded for the old
+        # content would fail the new file, so a content change drops it.
+        self._hash = None
+        self.server_expected = None
+        self.position = 0
+        self._broken = False
+        if content_changed:
+            self.recorded = None
+            self.algorithm = None
+
+    def catch_up(self, file_path, offset, range_map):
+        """Hash bytes [position, offset) from disk when they are known to be complete."""
+        if self._hash is None or self._broken or offset <= self.position:
+            return
+        if not any(start <= self.position and offset <= end for start, end, _ in range_map.ranges):
+            self._broken = True  # Out-of-order ranges cannot feed a sequential hash
+            return
+        with open(file_path, 'rb') as f:
+            f.seek(self.position)
+            while self.position < offset:
+                block = f.read(min(8 * 1024 * 1024, offset - self.position))
+                if not block:
+                    self._broken = True
+                    return
+                self.update(self.position, block)
+
+    def update(self, offset, chunk):
+        if self._hash is None or self._broken:
+            return
+        if offset != self.position:
+            self._broken = True
+            return
+        self._hash.update(chunk)
+        self.position += len(chunk)
+
+    def result(self):
+        if self._hash is None or self._broken:
+            return None
+        return f"{self.algorithm}:{self._hash.hexdigest()}"
+
+    def mismatch(self):
+        """Return the expected digest that the data failed to match, or None."""
+        actual = self.result()
+        if actual is None:
+            return None
+        # The server's checksum describes the content just sent; a recorded
+        # digest may be from an older version of the file
+        expected = self.server_expected or self.recorded
+        return expected if expected and expected != actual else None
+
+
+# ============================================================================
+# Parallel Verification of Existing Files
+# ============================================================================
+
+VERIFY_READ_BYTES = 8 * 1024 * 1024
+VERIFY_MAX_WORKERS = max(4, os.cpu_count() or 4)
+
+
+def hash_file(file_path, algorithm='sha256'):
+    # Large sequential reads into one reusable buffer; hashlib releases the
+    # GIL while hashing it, so several files hash on several cores at once.
+    file_hash = hashlib.new(algorithm)
+    buffer = bytearray(VERIFY_READ_BYTES)
+    view = memoryview(buffer)
+    with open(file_path, 'rb', buffering=0) as f:
+        while True:
+            read = f.readinto(buffer)
+            if not read:
+                break
+            file_hash.update(view[:read])
+    return f"{algorithm}:{file_hash.hexdigest()}"
+
+
+@traced('probe')
+def probe_content_lengths(urls, max_workers=VERIFY_MAX_WORKERS):
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(probe_content_length, urls))
+
+
+class PartVerifier:
+    """
+    Decides which parts are already on disk before their downloads start.
+
+    Every part is checked on a thread pool in the order the downloads will
+    be scheduled, so the first parts are ready while later ones are still
+    being read. Sizes that are unknown are probed with a HEAD request only
+    when the file exists. With full=True each file is also hashed and
+    compared with the digest recorded for the part; a file that fails the
+    check is removed so it is downloaded again.
+    """
+
+    def __init__(self, parts, full=False, max_workers=VERIFY_MAX_WORKERS, on_event=None):
+        self.full = full
+        self.on_event = on_event
+        self.verified_files = 0
+        self.verified_bytes = 0
+        self.failed_files = 0
+        self._lock = threading.Lock()
+        self._started_at = time.perf_counter()
+        self._finished_at = self._started_at
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._futures = {id(part): self._executor.submit(self._check, part) for part in parts}
+
+    def is_complete(self, part):
+        future = self._futures.get(id(part))
+        if future is None:
+            return self._check(part)
+        return future.result()
+
+    def _check(self, part):
+        file_path = part.local_path
+        if not file_path or not os.path.exists(file_path) or has_range_map(file_path):
+            return False
+        if part.expected_size <= 0:
+            part.expected_size = probe_content_length(part.download_url)
+        if part.expected_size <= 0 or os.path.getsize(file_path) != part.expected_size:
+            return False
+        if not self.full:
+            return True
+
+        algorithm = part.digest.split(':', 1)[0] if part.digest else 'sha256'
+        actual = hash_file(file_path, algorithm)
+        with self._lock:
+            self._finished_at = time.perf_counter()
+            if part.digest and actual != part.digest:
+                self.failed_files += 1
+            else:
+                self.verified_files += 1
+                self.verified_bytes += part.expected_size
+        if part.digest and actual != part.digest:
+            emit_event(self.on_event, 'verify_failed', filename=part.filename, expected=part.digest, actual=actual)
+            print(f"[WARN] {part.filename} does not match its recorded digest, downloading it again")
+            os.remove(file_path)
+            return False
+        part.digest = actual
+        return True
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        if not self.full:
+            return
+        elapsed = max(self._finished_at - self._started_at, 1e-9)
+        gb_per_second = self.verified_bytes / elapsed / 1e9
+        emit_event(self.on_event, 'verify_finished', files=self.verified_files, failed=self.failed_files,
+                   bytes=self.verified_bytes, seconds=round(elapsed, 3), gb_per_second=round(gb_per_second, 3))
+        if self.verified_files or self.failed_files:
+            print(f"Verified {self.verified_files} file(s), {self.verified_bytes / 1e9:.2f} GB "
+                  f"in {elapsed:.1f}s ({gb_per_second:.2f} GB/s), {self.failed_files} mismatched")
+
+
+# ============================================================================
+# Stall Detection and Retry Backoff
+# ============================================================================
+
+# (connect, read) timeouts for transfers: an unreachable host fails fast
+# and a silent socket is dropped; a trickling one is left to the watchdog
+TRANSFER_TIMEOUT = (10, 30)
+# Throughput floor: a transfer receiving less than this on average over
+# the window is dropped and its missing range requested again. 0 disables.
+STALL_FLOOR_BYTES_PER_S = int(float(os.environ.get('VODU_STALL_FLOOR_KBPS', '32')) * 1024)
+STALL_WINDOW_SECONDS = float(os.environ.get('VODU_STALL_WINDOW', '20'))
+STALL_MIN_READ_BYTES = 64 * 1024
+
+# Backoff per failure kind as (base, cap) seconds; kinds missing here
+# ('client': 4xx other than 408/429) are not retried
+RETRY_BACKOFF = {
+    'network': (1.0, 30.0),      # refused, reset, timed out or stalled
+    'server': (2.0, 60.0),       # 5xx, or the session's own retries ran out
+    'throttled': (5.0, 120.0),   # 429/503; a longer Retry-After wins up to the cap
+    'content': (0.0, 0.0),       # changed file, bad range or checksum: start over at once
+}
+
+STALLED_TRANSFERS = METRICS.counter('vodu_stalled_transfers_total',
+                                    "Transfers dropped for staying below the throughput floor.")
+RECONNECTS = METRICS.counter('vodu_reconnects_total', "Broken or stalled transfers reopened for their missing range.")
+
+
+class WatchedTransfer:
+    """Bytes received by one streaming response, sampled by the watchdog."""
+
+    __slots__ = ('response', 'received', 'samples')
+
+    def __init__(self, response, now):
+        self.response = response
+        self.received = 0
+        # (time, received) per check, reaching back one window
+        self.samples = deque([(now, 0)])
+
+    def abort(self):
+        # Closing the response does not wake a read blocked in another
+        # thread; shutting the socket down does, and the read then fails
+        connection = getattr(self.response.raw, '_connection', None)
+        sock = getattr(connection, 'sock', None)
+        try:
+            if sock is not None:
+                sock.shutdown(socket.SHUT_RDWR)
+            else:
+                self.response.close()
+        except OSError:
+            pass
+
+
+class StallWatchdog:
+    """
+    Drops transfers whose throughput stays below a floor.
+
+    One daemon thread, running while anything is watched, checks every
+    transfer once per interval. A transfer that received less than
+    floor * window bytes during its last window is aborted; the blocked
+    read fails and download_part_with_resume() reconnects for the missing
+    range. read_size() keeps reads small enough that a transfer running
+    at the floor still completes several of them per window.
+    """
+
+    def __init__(self, floor_bytes_per_s=STALL_FLOOR_BYTES_PER_S, window_seconds=STALL_WINDOW_SECONDS,
+                 interval=1.0):
+        self.floor = floor_bytes_per_s
+        self.window = window_seconds
+        self.interval = interval
+        self._transfers = set()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.floor > 0 and self.window > 0
+
+    def read_size(self, default):
+        if not self.enabled:
+            return default
+        return max(STALL_MIN_READ_BYTES, min(default, int(self.floor * self.window / 4)))
+
+    def watch(self, response):
+        transfer = WatchedTransfer(response, time.monotonic())
+        with self._lock:
+            self._transfers.add(transfer)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='vodu-stall-watchdog', daemon=True)
+                self._thread.start()
+        return transfer
+
+    def release(self, transfer):
+        with self._lock:
+            self._transfers.discard(transfer)
+
+    def check(self, now=None):
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            transfers = list(self._transfers)
+        for transfer in transfers:
+            received = transfer.received
+            samples = transfer.samples
+            samples.append((now, received))
+            while len(samples) > 2 and samples[1][0] <= now - self.window:
+                samples.popleft()
+            since, received_then = samples[0]
+            elapsed = now - since
+            if elapsed >= self.window and received - received_then < self.floor * elapsed:
+                self.release(transfer)
+                STALLED_TRANSFERS.inc()
+                trace_instant('stall', 'retry', received=received)
+                transfer.abort()
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            with self._lock:
+                if not self._transfers:
+                    self._thread = None
+                    return
+            self.check()
+
+
+STALL_WATCHDOG = StallWatchdog()
+
+# The kind of the last failed transfer on each thread, read by the retry loops
+_transfer_failure = threading.local()
+
+
+def note_transfer_failure(kind, retry_after=None):
+    _transfer_failure.value = (kind, retry_after)
+
+
+def last_transfer_failure():
+    """(kind, retry_after seconds) of this thread's last failed download_part_with_resume() call."""
+    return getattr(_transfer_failure, 'value', ('network', None))
+
+
+def classify_transfer_error(error):
+    """Return (kind, retry_after) for a requests exception; see RETRY_BACKOFF for the kinds."""
+    if isinstance(error, requests.exceptions.HTTPError) and error.response is not None:
+        status = error.response.status_code
+        retry_after = error.response.headers.get('Retry-After', '')
+        retry_after = float(retry_after) if retry_after.isdigit() else None
+        if status in (429, 503):
+            return 'throttled', retry_after
+        if status >= 500 or status == 408:
+            return 'server', retry_after
+        return 'client', None
+    if isinstance(error, requests.exceptions.RetryError):
+        return 'server', None
+    return 'network', None
+
+
+def retry_delay(attempt, failure=None):
+    """
+    Seconds to wait before retry number attempt (from 1), or None to give up.
+
+    Exponential in attempt up to the kind's cap, with equal jitter: half
+    the delay is fixed and half random, so parts that failed together do
+    not reconnect together.
+    """
+    kind, retry_after = failure or last_transfer_failure()
+    if kind not in RETRY_BACKOFF:
+        return None
+    base, cap = RETRY_BACKOFF[kind]
+    ceiling = min(cap, base * 2 ** (attempt - 1))
+    delay = ceiling / 2 + random.uniform(0, ceiling / 2)
+    if retry_after:
+        delay = max(delay, min(retry_after, cap))
+    return delay
+
+
 # ============================================================================
 # URL Extraction Functions
 # ============================================================================
 
+# Base of the store's JSON API; overridable to point resolution at a local fixture site
+STORE_API_BASE = os.environ.get('VODU_STORE_API_BASE', 'https://share.vodu.store').rstrip('/')
+
+
+@traced('resolve')
 def extract_download_links(html_content):
     if not html_content:
         return []
@@ -372,11 +842,11 @@ def extract_download_links(html_content):
 
 
 def get_file_info_api(app_id):
-    api_url = f"https://share.vodu.store/api/v1/file/{app_id}"
+    api_url = f"{STORE_API_BASE}/api/v1/file/{app_id}"
     headers = {
         "Accept": "application/json, text/plain, */*",
         "Accept-Language": "en-US,en;q=0.5",
-        "Referer": "https://share.vodu.store/",
+        "Referer": f"{STORE_API_BASE}/",
         "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
     }
     cookies = {"G_ENABLED_IDPS": "google"}
@@ -401,10 +871,10 @@ def get_file_info_api(app_id):
 
 
 def get_download_url_for_file(file_id):
-    api_url = f"https://share.vodu.store/api/v1/download/no-recaptcha/{file_id}"
+    api_url = f"{STORE_API_BASE}/api/v1/download/no-recaptcha/{file_id}"
     headers = {
         "Accept": "application/json, text/plain, */*",
-        "Referer": "https://share.vodu.store/",
+        "Referer": f"{STORE_API_BASE}/",
         "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
     }
     cookies = {"G_ENABLED_IDPS": "google"}
@@ -421,6 +891,7 @@ def get_download_url_for_file(file_id):
         return None
 
 
+@traced('resolve')
 def try_api_endpoint(url):
     id_match = re.search(r'/details/(\d+)', url)
     if not id_match:
@@ -430,10 +901,10 @@ def try_api_endpoint(url):
     result = get_file_info_api(app_id)
     if result:
         return result
-    api_url = f"https://share.vodu.store/api/v1/download/no-recaptcha/{app_id}"
+    api_url = f"{STORE_API_BASE}/api/v1/download/no-recaptcha/{app_id}"
     headers = {
         "Accept": "application/json, text/plain, */*",
-        "Referer": "https://share.vodu.store/",
+        "Referer": f"{STORE_API_BASE}/",
         "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:146.0) Gecko/20100101 Firefox/146.0"
     }
     cookies = {"G_ENABLED_IDPS": "google"}
@@ -466,49 +937,253 @@ def try_api_endpoint(url):
     return None
 
 
-def download_part_with_resume(url, save_path, progress_callback=None, session=None, download_part=None):
-    headers = {}
-    mode = 'wb'
-    if os.path.exists(save_path):
-        existing_size = os.path.getsize(save_path)
-        headers['Range'] = f'bytes={existing_size}-'
-        mode = 'ab'
+def download_part_with_resume(url, save_path, progress_callback=None, session=None, download_part=None,
+                              control=None):
+    # Only the ranges missing from the sidecar map are fetched, so parallel or
+    # preallocated writes and torn tails never count as valid bytes.
+    part_started = time.perf_counter()
+    note_transfer_failure('network')
+    range_map = RangeMap.load(save_path)
+    digest = StreamingDigest(download_part.digest if download_part else None)
     close_session = False
     if session is None:
         session = create_optimized_session()
         close_session = True
     try:
-        response = session.get(url, headers=headers, stream=True, timeout=600)
-        response.raise_for_status()
-        total_size = int(response.headers.get("content-length", 0))
-        if mode == 'ab':
-            total_size = existing_size + total_size
-        downloaded_size = os.path.getsize(save_path) if mode == 'ab' else 0
-        chunk_size = 4 * 1024 * 1024
-        last_update_time = time.time()
-        bytes_since_last_update = 0
-        with open(save_path, mode, buffering=256 * 1024) as file:
-            for chunk in response.iter_content(chunk_size=chunk_size):
-                if chunk:
-                    file.write(chunk)
-                    downloaded_size += len(chunk)
-                    bytes_since_last_update += len(chunk)
-                    current_time = time.time()
-                    elapsed = current_time - last_update_time
-                    if download_part and elapsed >= 1.0:
-                        update_speed_tracking(download_part, bytes_since_last_update, elapsed)
-                        last_update_time = current_time
-                        bytes_since_last_update = 0
-                    if progress_callback:
-                        progress_callback(len(chunk), downloaded_size, total_size)
+        missing = range_map.missing()
+        while missing:
+            # A pause drops the connection; resuming requests the missing range again
+            if control is not None and not control.wait_while_paused():
+                return False
+            completed = range_map.completed_bytes()
+            try:
+                written = fetch_missing_range(session, url, save_path, range_map, missing[0],
+                                              progress_callback, download_part, digest, control)
+            except requests.exceptions.RequestException:
+                # A connection that broke or stalled after writing data is
+                # reopened for the rest at once; one that wrote nothing fails
+                if range_map.completed_bytes() <= completed:
+                    raise
+                RECONNECTS.inc()
+                trace_instant('reconnect', 'retry', file=os.path.basename(save_path))
+            else:
+                if not written and not (control is not None and control.interrupted()):
+                    # Nothing usable: the range map was reset or the server sent the wrong range
+                    note_transfer_failure('content')
+                    return False
+            missing = range_map.missing()
+        expected = digest.mismatch()
+        if expected:
+            print(f"\n[WARN] Checksum mismatch for {os.path.basename(save_path)}: expected {expected}, "
+                  f"got {digest.result()}. Discarding the file.")
+            range_map.discard()
+            os.remove(save_path)
+            note_transfer_failure('content')
+            return False
+        range_map.discard()
+        if download_part:
+            download_part.digest = digest.result() or download_part.digest
         return True
-    except requests.exceptions.RequestException:
+    except requests.exceptions.RequestException as e:
+        note_transfer_failure(*classify_transfer_error(e))
         return False
     finally:
         if close_session:
             session.close()
+        if TRACE is not None:
+            TRACE.complete(os.path.basename(save_path), 'part', part_started, time.perf_counter())
+
 
+def fetch_missing_range(session, url, save_path, range_map, missing_range, progress_callback=None,
+                        download_part=None, digest=None, control=None, segment=None):
+    # With a Segment, the range ends wherever segment.end has moved to, and
+    # an unexpected response returns 0 instead of resetting the shared map
+    start, end = missing_range
+    headers = {}
+    wants_range = start > 0 or (end is not None and end != range_map.total_size) or segment is not None
+    if wants_range:
+        headers['Range'] = f'bytes={start}-{end - 1}' if end is not None else f'bytes={start}-'
+        if range_map.etag:
+            headers['If-Range'] = range_map.etag
+    # A trace needs the timings even for downloads that have no part to keep them
+    timings = None
+    if PHASE_TIMING_ENABLED and (download_part is not None or TRACE is not None):
+        timings = PhaseTimings(requests=1)
+    try:
+        with timed_request(timings):
+            response = session.get(url, headers=headers, stream=True, timeout=TRANSFER_TIMEOUT)
+    except requests.exceptions.RequestException:
+        if timings is not None and download_part is not None:
+            download_part.record_phase_timings(timings)
+        raise
+    ACTIVE_TRANSFERS.inc()
+
+    def content_changed():
+        # Start over on the next attempt, without the old content's digest
+        range_map.reset()
+        range_map.save()
+        if digest:
+            digest.restart(content_changed=True)
+        if download_part:
+            download_part.digest = None
 
+    try:
+        if response.status_code == 416:
+            # The local data is longer than the remote file: start over
+            if segment is None:
+                content_changed()
+            return 0
+        response.raise_for_status()
+        etag = response.headers.get('ETag')
+        if segment is not None:
+            content_range = parse_content_range(response.headers.get('Content-Range'))
+            if response.status_code != 206 or content_range is None or content_range[0] != start or \
+                    content_range[2] != range_map.total_size or (range_map.etag and etag != range_map.etag):
+                return 0
+        if response.status_code == 206:
+            content_range = parse_content_range(response.headers.get('Content-Range'))
+            if content_range is None or content_range[0] != start:
+                return 0
+            total_size = content_range[2]
+            if (range_map.etag and etag and etag != range_map.etag) or \
+                    (range_map.total_size and total_size and total_size != range_map.total_size):
+                # The file changed on the server
+                content_changed()
+                return 0
+        else:
+            # Full body: the server ignored the range or the content changed
+            total_size = int(response.headers.get("content-length", 0))
+            if (range_map.etag and etag and etag != range_map.etag) or \
+                    (range_map.total_size and total_size and total_size != range_map.total_size):
+                content_changed()
+            elif wants_range or range_map.ranges:
+                range_map.reset()
+            start, end = 0, None
+        range_map.total_size = total_size or range_map.total_size
+        range_map.etag = etag or range_map.etag
+        if digest:
+            if start == 0:
+                digest.restart()
+            digest.start(response.headers, partial=response.status_code == 206)
+            if start > 0:
+                digest.catch_up(save_path, start, range_map)
+
+        mode = 'r+b' if os.path.exists(save_path) else 'wb'
+        with open(save_path, mode, buffering=256 * 1024) as file:
+            if start == 0 and end is None:
+                file.truncate(0)
+            file.seek(start)
+            return stream_range_to_file(response, file, range_map, start, end, progress_callback, download_part,
+                                        digest, control, timings, segment)
+    finally:
+        response.close()
+        ACTIVE_TRANSFERS.dec()
+        if timings is not None and download_part is not None:
+            download_part.record_phase_timings(timings)
+
+
+def stream_range_to_file(response, file, range_map, start, end, progress_callback=None, download_part=None,
+                         digest=None, control=None, timings=None, segment=None):
+    # With timings, the wait for each chunk counts as transfer and the
+    # write and checkpoint as write; hashing and callbacks count as neither.
+    position = start
+    checkpoint_position = start
+    completed_before = range_map.completed_bytes()
+    tail = b''
+    chunk_size = STALL_WATCHDOG.read_size(4 * 1024 * 1024)
+    last_update_time = time.time()
+    last_checkpoint_time = last_update_time
+    bytes_since_last_update = 0
+    waiting_since = time.perf_counter() if timings is not None else 0.0
+    watched = STALL_WATCHDOG.watch(response) if STALL_WATCHDOG.enabled else None
+    try:
+        for chunk in response.iter_content(chunk_size=chunk_size):
+            if not chunk:
+                continue
+            received_at = time.perf_counter()
+            if watched is not None:
+                watched.received += len(chunk)
+            if timings is not None:
+                timings.transfer += received_at - waiting_since
+            if segment is not None:
+                end = segment.end
+                if position >= end:
+                    break
+            if end is not None and position + len(chunk) > end:
+                chunk = chunk[:end - position]
+            file.write(chunk)
+            write_seconds = time.perf_counter() - received_at
+            DISK_WRITE_SECONDS.observe(write_seconds)
+            DOWNLOADED_BYTES.inc(len(chunk))
+            if timings is not None:
+                timings.bytes += len(chunk)
+                timings.write += write_seconds
+            if TRACE is not None:
+                # Tracing turns phase timing on, so waiting_since is set
+                TRACE.complete('receive', 'transfer', waiting_since, received_at, bytes=len(chunk))
+                TRACE.complete('write', 'disk', received_at, received_at + write_seconds)
+            if digest:
+                digest.update(position, chunk)
+            position += len(chunk)
+            if segment is not None:
+                segment.position = position
+            tail = (tail + chunk[-TAIL_CHECK_BYTES:])[-TAIL_CHECK_BYTES:]
+            bytes_since_last_update += len(chunk)
+            current_time = time.time()
+            elapsed = current_time - last_update_time
+            if download_part and elapsed >= 1.0:
+                update_speed_tracking(download_part, bytes_since_last_update, elapsed)
+                last_update_time = current_time
+                bytes_since_last_update = 0
+            if (position - checkpoint_position >= RANGE_MAP_CHECKPOINT_BYTES
+                    or current_time - last_checkpoint_time >= RANGE_MAP_CHECKPOINT_SECONDS):
+                checkpoint_range(file, range_map, start, position, tail, timings)
+                checkpoint_position = position
+                last_checkpoint_time = current_time
+            if progress_callback:
+                progress_callback(len(chunk), completed_before + position - start, range_map.total_size)
+            if timings is not None:
+                waiting_since = time.perf_counter()
+            if end is not None and position >= end:
+                break
+            if control is not None and control.interrupted():
+                break
+    finally:
+        if watched is not None:
+            STALL_WATCHDOG.release(watched)
+        checkpoint_range(file, range_map, start, position, tail, timings)
+    if end is None and not range_map.total_size and not (control is not None and control.interrupted()):
+        range_map.total_size = position
+        range_map.save()
+    return position - start
+
+
+def checkpoint_range(file, range_map, start, position, tail, timings=None):
+    if position <= start:
+        return
+    # Data must be durable before the map claims it
+    synced_from = time.perf_counter()
+    file.flush()
+    os.fsync(file.fileno())
+    sync_seconds = time.perf_counter() - synced_from
+    DISK_SYNC_SECONDS.observe(sync_seconds)
+    if TRACE is not None:
+        TRACE.complete('fsync', 'disk', synced_from, synced_from + sync_seconds)
+    if timings is not None:
+        timings.write += sync_seconds
+    # tail holds the end of this pass; a short pass that continues an
+    # earlier interval takes the rest of the block from the file
+    interval_start = next((r_start for r_start, r_end, _ in range_map.ranges if r_start < start <= r_end), start)
+    block_start = max(interval_start, position - TAIL_CHECK_BYTES)
+    if block_start < start:
+        tail_crc = range_map.tail_crc(interval_start, position)
+    else:
+        tail_crc = zlib.crc32(tail[len(tail) - (position - block_start):])
+    range_map.add(start, position, tail_crc)
+    range_map.save()
+
+
+@traced('resolve')
 def get_vodu_download_links_with_selenium(url):
     driver = None
     try:
@@ -575,10 +1250,157 @@ def get_vodu_download_links_with_selenium(url):
                 pass
 
 
+# ============================================================================
+# Segmented Download Engine
+# ============================================================================
+
+def download_part_segmented(url, save_path, progress_callback=None, session=None, download_part=None,
+                            control=None, connections=None, steal=True, hedge_bytes=None):
+    """
+    download_part_with_resume() over several connections per file.
+
+    Uses the sequential engine for one connection, for files too small to
+    split and for servers that do not accept ranges. Segments share the
+    file's range map, so an interrupted download resumes either way. When
+    there is a checksum to compare with, the segment at the front of the
+    file hashes its data as it arrives; the bytes after it are read back
+    once at the end.
+    """
+    connections = SEGMENT_CONNECTIONS if connections is None else connections
+    hedge_bytes = SEGMENT_HEDGE_BYTES if hedge_bytes is None else hedge_bytes
+    if connections <= 1:
+        return download_part_with_resume(url, save_path, progress_callback, session, download_part, control)
+    close_session = False
+    if session is None:
+        session = create_optimized_session()
+        close_session = True
+    part_started = time.perf_counter()
+    note_transfer_failure('network')
+    try:
+        head = session.head(url, timeout=TRANSFER_TIMEOUT, allow_redirects=True)
+        head.raise_for_status()
+        total_size = int(head.headers.get('Content-Length', 0))
+        if head.headers.get('Accept-Ranges', '').lower() != 'bytes' or total_size < 2 * SEGMENT_MIN_BYTES:
+            return download_part_with_resume(url, save_path, progress_callback, session, download_part, control)
+
+        range_map = RangeMap.load(save_path)
+        etag = head.headers.get('ETag')
+        if (range_map.etag and etag and etag != range_map.etag) or \
+                (range_map.total_size and range_map.total_size != total_size):
+            range_map.reset()
+            if download_part:
+                download_part.digest = None
+        range_map.total_size = total_size
+        range_map.etag = etag or range_map.etag
+        # Preallocated, so every segment writes at its own offset
+        with open(save_path, 'r+b' if os.path.exists(save_path) else 'wb') as file:
+            file.truncate(total_size)
+        range_map.save()
+        expected = server_checksum(head.headers) or (download_part.digest if download_part else None)
+        digest = StreamingDigest(expected) if expected else None
+
+        progress_lock = threading.Lock()
+        done = range_map.completed_bytes()
+        speed_mark = [time.time(), 0]
+
+        def report(segment, chunk_bytes, downloaded, total):
+            # Each segment reports its own offset; the file total is summed
+            # here, counting what both copies of a hedged tail wrote once
+            nonlocal done
+            with progress_lock:
+                chunk_bytes = max(0, segment.position - segment.reported[0])
+                if not chunk_bytes:
+                    return
+                segment.reported[0] = segment.position
+                done = min(total_size, done + chunk_bytes)
+                speed_mark[1] += chunk_bytes
+                elapsed = time.time() - speed_mark[0]
+                if download_part and elapsed >= 1.0:
+                    update_speed_tracking(download_part, speed_mark[1], elapsed)
+                    speed_mark[:] = [time.time(), 0]
+                if progress_callback:
+                    progress_callback(chunk_bytes, done, total_size)
+
+        def run_connection(scheduler):
+            # Other segments are written out of order; only the first one is hashed in flight
+            segment = scheduler.next_segment()
+            while segment is not None:
+                if control is not None and control.interrupted():
+                    scheduler.give_up(segment, None)
+                    return
+                before = segment.position
+                failure = None
+                try:
+                    fetch_missing_range(session, url, save_path, range_map, (segment.position, segment.end),
+                                        functools.partial(report, segment), None,
+                                        digest if segment is scheduler.first else None, control, segment)
+                except requests.exceptions.RequestException as e:
+                    failure = classify_transfer_error(e)
+                if segment.remaining and not (control is not None and control.interrupted()):
+                    if segment.position > before:
+                        RECONNECTS.inc()
+                        continue
+                    if failure is None:
+                        scheduler.abort()
+                    scheduler.give_up(segment, failure or ('content', None))
+                    return
+                segment = scheduler.next_segment(segment)
+
+        while True:
+            missing = range_map.missing()
+            if not missing:
+                break
+            if control is not None and not control.wait_while_paused():
+                return False
+            before = range_map.completed_bytes()
+            scheduler = SegmentScheduler(missing, connections, steal, hedge_bytes)
+            with ThreadPoolExecutor(max_workers=connections, thread_name_prefix='vodu-segment') as executor:
+                for _ in executor.map(run_connection, [scheduler] * connections):
+                    pass
+            if scheduler.content_changed:
+                # The file changed under the segments: start it over on one connection
+                range_map.reset()
+                range_map.save()
+                if download_part:
+                    download_part.digest = None
+                return download_part_with_resume(url, save_path, progress_callback, session, download_part,
+                                                 control)
+            if range_map.completed_bytes() <= before and not (control is not None and control.interrupted()):
+                note_transfer_failure(*(scheduler.failure or ('network', None)))
+                return False
+
+        if digest is not None:
+            digest.start(head.headers, partial=False)
+            digest.catch_up(save_path, total_size, range_map)
+            actual = digest.result() or hash_file(save_path, digest.algorithm)
+            expected = digest.server_expected or expected
+            if actual != expected:
+                print(f"\n[WARN] Checksum mismatch for {os.path.basename(save_path)}: expected {expected}, "
+                      f"got {actual}. Discarding the file.")
+                range_map.discard()
+                os.remove(save_path)
+                note_transfer_failure('content')
+                return False
+            if download_part:
+                download_part.digest = actual
+        range_map.discard()
+        return True
+    except requests.exceptions.RequestException as e:
+        note_transfer_failure(*classify_transfer_error(e))
+        return False
+    finally:
+        if close_session:
+            session.close()
+        if TRACE is not None:
+            TRACE.complete(os.path.basename(save_path), 'part', part_started, time.perf_counter(),
+                           connections=connections)
+
+
 # ============================================================================
 # Helper Functions
 # ============================================================================
 
+@traced('resolve')
 def get_html_content(url):
     try:
         response = requests.get(url)
@@ -588,6 +1410,15 @@ def get_html_content(url):
         return None
 
 
+@traced('probe')
+def probe_content_length(url):
+    try:
+        response = requests.head(url, timeout=30)
+        return int(response.headers.get("content-length", 0))
+    except Exception:
+        return 0
+
+
 def get_expected_file_size(video_url):
     try:
         response = requests.head(video_url)
@@ -599,33 +1430,34 @@ def get_expected_file_size(video_url):
     return None
 
 
-def download_with_retry(url, save_path, progress_bar=None, status_label=None, window=None, max_retries=3):
+def download_with_retry(url, save_path, progress_bar=None, status_label=None, window=None, max_retries=3,
+                        progress_callback=None, control=None, session=None):
+    def update_progress(chunk_bytes, downloaded, total):
+        if progress_bar and window:
+            progress = int((downloaded / total) * 100) if total > 0 else 0
+            # GUI callers pass bus proxies, so this only queues the newest value
+            ui_set_progress(progress_bar, progress)
+            ui_refresh(window)
+        if progress_callback:
+            progress_callback(downloaded, total)
+
     for retry in range(max_retries + 1):
-        try:
-            response = requests.get(url, stream=True, timeout=600)
-            response.raise_for_status()
-            total_size = int(response.headers.get("content-length", 0))
-            downloaded_size = 0
-            with open(save_path, "wb") as file:
-                for data in response.iter_content(chunk_size=1024 * 1024):
-                    file.write(data)
-                    downloaded_size += len(data)
-                    if progress_bar and window:
-                        progress = int((downloaded_size / total_size) * 100) if total_size > 0 else 0
-                        # Update the progress bar
-                        if hasattr(progress_bar, 'set_progress'):
-                            progress_bar.set_progress(progress)
-                        else:
-                            progress_bar["value"] = progress
-                        window.update_idletasks()
+        if download_part_segmented(url, save_path, update_progress, session, control=control):
             return True
-        except Exception as e:
-            if retry < max_retries:
-                print(f"Retrying {url} (attempt {retry + 2}/{max_retries + 1})...")
-                time.sleep(5)
+        if control is not None and control.is_cancelled:
+            return False
+        delay = retry_delay(retry + 1) if retry < max_retries else None
+        if delay is not None:
+            DOWNLOAD_RETRIES.inc()
+            trace_instant('retry', 'retry', file=os.path.basename(save_path), attempt=retry + 2)
+            print(f"Retrying {url} in {delay:.1f}s (attempt {retry + 2}/{max_retries + 1})...")
+            if control is not None:
+                control.wait(delay)
             else:
-                print(f"Failed to download {url}")
-                return False
+                time.sleep(delay)
+        else:
+            print(f"Failed to download {url}")
+            return False
     return False
 
 
@@ -636,28 +1468,102 @@ def format_time(seconds):
     return f"{hours:02d}:{minutes:02d}:{secs:02d}"
 
 
+# ============================================================================
+# Worker Reporting Helpers
+# ============================================================================
+
+# Exit codes shared by the workers and the headless CLI (argparse uses 2)
+EXIT_OK = 0
+EXIT_ERROR = 1
+EXIT_PARTIAL = 3
+EXIT_NO_LINKS = 4
+EXIT_NO_DISK_SPACE = 5
+EXIT_CANCELLED = 130
+
+
+def ui_set_progress(progress_bar, value):
+    if progress_bar is None:
+        return
+    if hasattr(progress_bar, 'set_progress'):
+        progress_bar.set_progress(value)
+    else:
+        progress_bar["value"] = value
+
+
+def ui_set_status(status_label, text, short_text=None):
+    if status_label is None:
+        return
+    if hasattr(status_label, 'set_text'):
+        status_label.set_text(text)
+    else:
+        status_label.config(text=short_text or text)
+
+
+def ui_refresh(window):
+    if window is not None:
+        window.update_idletasks()
+
+
+def emit_event(on_event, event, **fields):
+    if on_event is not None:
+        on_event({'event': event, **fields})
+
+
+def notify_user(on_event, level, title, message):
+    # Headless runs report dialogs as events instead of blocking on Tk
+    if on_event is not None:
+        emit_event(on_event, 'message', level=level, title=title, message=message)
+    elif level == 'error':
+        messagebox.showerror(title, message)
+    else:
+        messagebox.showinfo(title, message)
+
+
+def make_progress_emitter(on_event, interval=0.5, **fields):
+    last_emit_time = 0.0
+
+    def report(downloaded, total):
+        nonlocal last_emit_time
+        current_time = time.time()
+        if current_time - last_emit_time >= interval or (total and downloaded >= total):
+            last_emit_time = current_time
+            emit_event(on_event, 'progress', downloaded=downloaded, total=total, **fields)
+
+    return report
+
+
+def combine_exit_codes(codes):
+    if all(code == EXIT_OK for code in codes):
+        return EXIT_OK
+    if any(code in (EXIT_OK, EXIT_PARTIAL) for code in codes):
+        return EXIT_PARTIAL
+    return codes[0] if len(set(codes)) == 1 else EXIT_ERROR
+
+
 # ============================================================================
 # Download Workers
 # ============================================================================
 
-def download_apps_games_worker(vodu_store_url, download_path, progress_bar, status_label, time_label, window):
+def download_apps_games_worker(vodu_store_url, download_path, progress_bar, status_label, time_label, window,
+                               on_event=None, verify=False, control=None):
     session = create_optimized_session()
     try:
         print("\n" + "=" * 60)
         print("Fetching download links from API...")
         print("=" * 60 + "\n")
 
-        download_urls = try_api_endpoint(vodu_store_url)
+        with RESOLUTION_SECONDS.time():
+            download_urls = try_api_endpoint(vodu_store_url)
 
-        if not download_urls:
-            print("\n" + "=" * 60)
-            print("API failed, trying Selenium...")
-            print("=" * 60 + "\n")
-            download_urls = get_vodu_download_links_with_selenium(vodu_store_url)
+            if not download_urls:
+                print("\n" + "=" * 60)
+                print("API failed, trying Selenium...")
+                print("=" * 60 + "\n")
+                download_urls = get_vodu_download_links_with_selenium(vodu_store_url)
 
         if not download_urls:
-            messagebox.showinfo("Info", "No download links found.")
-            return
+            notify_user(on_event, 'info', "Info", "No download links found.")
+            return EXIT_NO_LINKS
 
         total_parts = len(download_urls)
         total_size = 0
@@ -667,157 +1573,222 @@ def download_apps_games_worker(vodu_store_url, download_path, progress_bar, stat
         total_downloaded_bytes = 0
 
         part_sizes = {}
-        for url in download_urls:
-            try:
-                response = requests.head(url, timeout=30)
-                size = int(response.headers.get("content-length", 0))
-                total_size += size
-                filename = os.path.basename(url)
-                part_sizes[filename] = size
-            except:
-                part_sizes[os.path.basename(url)] = 0
+        for url, size in zip(download_urls, probe_content_lengths(download_urls)):
+            total_size += size
+            part_sizes[os.path.basename(url)] = size
 
-        if total_size > 0 and not check_disk_space(download_path, total_size):
-            messagebox.showerror("Error", f"Not enough disk space. Need {total_size / (1024**3):.2f}GB")
-            return
-
-        for i, url in enumerate(download_urls, 1):
-            filename = os.path.basename(url)
-            save_path = os.path.join(download_path, filename)
-            expected_size = part_sizes.get(filename, 0)
-
-            if expected_size > 0 and check_existing_part(save_path, expected_size):
-                if hasattr(status_label, 'set_text'):
-                    status_label.set_text(f"✓ Skipping: Part {i}/{total_parts} - {filename}\n(already downloaded)")
-                else:
-                    status_label.config(text=f"✓ Skipping: Part {i}/{total_parts}")
-                window.update_idletasks()
-                completed_parts += 1
-                total_downloaded_bytes += expected_size
-                overall_progress = (completed_parts / total_parts) * 100
-                if hasattr(progress_bar, 'set_progress'):
-                    progress_bar.set_progress(overall_progress)
-                else:
-                    progress_bar["value"] = overall_progress
-                window.update_idletasks()
-                continue
+        emit_event(on_event, 'links_resolved', total_parts=total_parts, total_bytes=total_size)
 
-            part_start_time = time.time()
-            part_downloaded_bytes = 0
-            last_print_time = time.time()
-            last_print_bytes = 0
-            last_gui_update_time = time.time()
+        if total_size > 0 and not check_disk_space(download_path, total_size):
+            notify_user(on_event, 'error', "Error", f"Not enough disk space. Need {total_size / (1024**3):.2f}GB")
+            return EXIT_NO_DISK_SPACE
+
+        store = open_session_store()
+        download_session = DownloadSession(
+            session_id=make_session_id(vodu_store_url, download_path),
+            vodu_store_url=vodu_store_url,
+            download_location=download_path,
+            app_name=vodu_store_url,
+            parts=[
+                DownloadPart(
+                    part_number=i,
+                    filename=os.path.basename(url),
+                    download_url=url,
+                    expected_size=part_sizes.get(os.path.basename(url), 0),
+                    local_path=os.path.join(download_path, os.path.basename(url))
+                )
+                for i, url in enumerate(download_urls, 1)
+            ],
+            total_parts=total_parts,
+            total_expected_bytes=total_size,
+            status=SessionStatus.DOWNLOADING,
+            started_at=datetime.now()
+        )
+        if store:
+            for part in download_session.parts:
+                recall_part_digest(store, part)
+            store.save_session(download_session)
+        verifier = PartVerifier(download_session.parts, full=verify, on_event=on_event)
+        try:
+            for download_part in download_session.parts:
+                emit_event(on_event, 'part_queued', part=download_part.part_number, total_parts=total_parts,
+                           filename=download_part.filename, expected_size=download_part.expected_size)
 
-            download_part = DownloadPart(
-                part_number=i,
-                filename=filename,
-                download_url=url,
-                expected_size=expected_size,
-                downloaded_size=0,
-                status=PartStatus.PENDING
-            )
+            for i, url in enumerate(download_urls, 1):
+                if control is not None and control.is_cancelled:
+                    break
+                filename = os.path.basename(url)
+                save_path = os.path.join(download_path, filename)
+                expected_size = part_sizes.get(filename, 0)
+                download_part = download_session.parts[i - 1]
+
+                if expected_size > 0 and verifier.is_complete(download_part):
+                    ui_set_status(status_label,
+                                  f"✓ Skipping: Part {i}/{total_parts} - {filename}\n(already downloaded)",
+                                  f"✓ Skipping: Part {i}/{total_parts}")
+                    ui_refresh(window)
+                    completed_parts += 1
+                    total_downloaded_bytes += expected_size
+                    overall_progress = (completed_parts / total_parts) * 100
+                    ui_set_progress(progress_bar, overall_progress)
+                    ui_refresh(window)
+                    emit_event(on_event, 'part_skipped', part=i, total_parts=total_parts, filename=filename,
+                               size=expected_size)
+                    download_part.status = PartStatus.SKIPPED
+                    download_part.downloaded_size = expected_size
+                    download_session.completed_parts += 1
+                    if store:
+                        store.checkpoint(download_session, download_part)
+                    continue
 
-            success = False
-            for attempt in range(3):
-                if attempt > 0:
-                    if hasattr(status_label, 'set_text'):
-                        status_label.set_text(f"⚠ Retrying: Part {i}/{total_parts} - {filename}\nAttempt {attempt + 1}/3...")
-                    else:
-                        status_label.config(text=f"⚠ Retrying: Part {i}/{total_parts}")
-                    window.update_idletasks()
-                    time.sleep(5)
-                else:
-                    if hasattr(status_label, 'set_text'):
-                        status_label.set_text(f"⬇ Downloading: Part {i}/{total_parts} - {filename}\nStarting...")
+                part_start_time = time.time()
+                part_downloaded_bytes = 0
+                last_print_time = time.time()
+                last_print_bytes = 0
+                last_gui_update_time = time.time()
+                last_checkpoint_time = time.time()
+                download_part.status = PartStatus.DOWNLOADING
+
+                success = False
+                for attempt in range(3):
+                    if attempt > 0:
+                        failure = last_transfer_failure()
+                        delay = retry_delay(attempt, failure)
+                        if delay is None:
+                            break
+                        ui_set_status(status_label,
+                                      f"⚠ Retrying: Part {i}/{total_parts} - {filename}\nAttempt {attempt + 1}/3...",
+                                      f"⚠ Retrying: Part {i}/{total_parts}")
+                        ui_refresh(window)
+                        emit_event(on_event, 'part_retry', part=i, total_parts=total_parts, filename=filename,
+                                   attempt=attempt + 1, reason=failure[0], delay=round(delay, 2))
+                        DOWNLOAD_RETRIES.inc()
+                        trace_instant('retry', 'retry', file=filename, attempt=attempt + 1)
+                        if control is not None and control.wait(delay):
+                            break
+                        elif control is None:
+                            time.sleep(delay)
                     else:
-                        status_label.config(text=f"⬇ Downloading: Part {i}/{total_parts}")
-                    window.update_idletasks()
-
-                def update_progress(chunk_bytes, downloaded, total):
-                    nonlocal part_downloaded_bytes, last_print_time, last_print_bytes, last_gui_update_time
-                    part_downloaded_bytes = downloaded
-                    current_time = time.time()
-
-                    if total > 0:
-                        part_progress = (downloaded / total) * 100
-                        current_total_downloaded = total_downloaded_bytes + downloaded
-                        overall_progress = (current_total_downloaded / total_size * 100) if total_size > 0 else (completed_parts / total_parts) * 100 + (part_progress / total_parts)
-
-                        elapsed_time = time.time() - part_start_time
-                        speed_mb = (downloaded / (1024 * 1024)) / elapsed_time if elapsed_time > 0 else 0
-                        display_speed = download_part.instant_speed_mb if download_part.instant_speed_mb > 0 else speed_mb
-
-                        if speed > 0 and downloaded < total:
-                            remaining_bytes = total - downloaded
-                            eta_seconds = remaining_bytes / speed
-                            eta_str = f"{int(eta_seconds // 60)}:{int(eta_seconds % 60):02d}"
-                        else:
-                            eta_str = "Calculating..."
-
-                        if current_time - last_print_time >= 2.0:
-                            time_diff = current_time - last_print_time
-                            bytes_diff = downloaded - last_print_bytes
-                            current_speed = (bytes_diff / time_diff / (1024 * 1024)) if time_diff > 0 else display_speed
-                            print(f"\r  Progress: {part_progress:5.1f}% | {downloaded / (1024*1024):7.1f} MB | Speed: {current_speed:6.1f} MB/s | ETA: {eta_str}", end='', flush=True)
-                            last_print_time = current_time
-                            last_print_bytes = downloaded
-
-                        if current_time - last_gui_update_time >= 0.5:
-                            if hasattr(progress_bar, 'set_progress'):
-                                progress_bar.set_progress(overall_progress)
-                            else:
-                                progress_bar["value"] = overall_progress
-
-                            progress_text = (
-                                f"⬇ Part {i}/{total_parts}: {filename}\n"
-                                f"{part_progress:.1f}% | Speed: {display_speed:.1f} MB/s | ETA: {eta_str}\n"
-                                f"Overall: {overall_progress:.1f}%"
-                            )
-                            if hasattr(status_label, 'set_text'):
-                                status_label.set_text(progress_text)
+                        ui_set_status(status_label,
+                                      f"⬇ Downloading: Part {i}/{total_parts} - {filename}\nStarting...",
+                                      f"⬇ Downloading: Part {i}/{total_parts}")
+                        ui_refresh(window)
+                        emit_event(on_event, 'part_started', part=i, total_parts=total_parts, filename=filename,
+                                   expected_size=expected_size)
+
+                    def update_progress(chunk_bytes, downloaded, total):
+                        nonlocal part_downloaded_bytes, last_print_time, last_print_bytes, last_gui_update_time
+                        nonlocal last_checkpoint_time
+                        part_downloaded_bytes = downloaded
+                        download_part.downloaded_size = downloaded
+                        current_time = time.time()
+
+                        if store and current_time - last_checkpoint_time >= CHECKPOINT_INTERVAL_SECONDS:
+                            store.checkpoint(download_session, download_part)
+                            last_checkpoint_time = current_time
+
+                        if total > 0:
+                            part_progress = (downloaded / total) * 100
+                            current_total_downloaded = total_downloaded_bytes + downloaded
+                            overall_progress = (current_total_downloaded / total_size * 100) if total_size > 0 else (completed_parts / total_parts) * 100 + (part_progress / total_parts)
+
+                            elapsed_time = time.time() - part_start_time
+                            speed_mb = (downloaded / (1024 * 1024)) / elapsed_time if elapsed_time > 0 else 0
+                            display_speed = download_part.instant_speed_mb if download_part.instant_speed_mb > 0 else speed_mb
+                            speed = display_speed * 1024 * 1024
+
+                            if speed > 0 and downloaded < total:
+                                remaining_bytes = total - downloaded
+                                eta_seconds = remaining_bytes / speed
+                                eta_str = f"{int(eta_seconds // 60)}:{int(eta_seconds % 60):02d}"
                             else:
-                                status_label.config(text=progress_text)
-                            window.update_idletasks()
-                            last_gui_update_time = current_time
+                                eta_str = "Calculating..."
+
+                            if current_time - last_print_time >= 2.0:
+                                time_diff = current_time - last_print_time
+                                bytes_diff = downloaded - last_print_bytes
+                                current_speed = (bytes_diff / time_diff / (1024 * 1024)) if time_diff > 0 else display_speed
+                                print(f"\r  Progress: {part_progress:5.1f}% | {downloaded / (1024*1024):7.1f} MB | Speed: {current_speed:6.1f} MB/s | ETA: {eta_str}", end='', flush=True)
+                                last_print_time = current_time
+                                last_print_bytes = downloaded
+
+                            if current_time - last_gui_update_time >= 0.5:
+                                ui_set_progress(progress_bar, overall_progress)
+
+                                progress_text = (
+                                    f"⬇ Part {i}/{total_parts}: {filename}\n"
+                                    f"{part_progress:.1f}% | Speed: {display_speed:.1f} MB/s | ETA: {eta_str}\n"
+                                    f"Overall: {overall_progress:.1f}%"
+                                )
+                                ui_set_status(status_label, progress_text)
+                                ui_refresh(window)
+                                emit_event(on_event, 'progress', part=i, total_parts=total_parts, filename=filename,
+                                           downloaded=downloaded, total=total, speed_mb=round(display_speed, 3),
+                                           overall_progress=round(overall_progress, 2))
+                                last_gui_update_time = current_time
+
+                    download_part.last_attempt_at = datetime.now()
+                    success = download_part_segmented(url, save_path, update_progress, session, download_part,
+                                                        control)
+                    if success or (control is not None and control.is_cancelled):
+                        break
+                    download_part.retry_count += 1
 
-                success = download_part_with_resume(url, save_path, update_progress, session, download_part)
                 if success:
-                    break
-
-            if success:
-                completed_parts += 1
-                total_downloaded_bytes += part_downloaded_bytes
-                part_size_mb = part_downloaded_bytes / (1024 * 1024)
-                elapsed_time = time.time() - part_start_time
-                avg_speed = part_downloaded_bytes / elapsed_time / (1024 * 1024) if elapsed_time > 0 else 0
-
-                if hasattr(status_label, 'set_text'):
-                    status_label.set_text(f"✓ Completed: Part {i}/{total_parts} - {filename}\nSize: {part_size_mb:.1f} MB")
+                    completed_parts += 1
+                    total_downloaded_bytes += part_downloaded_bytes
+                    part_size_mb = part_downloaded_bytes / (1024 * 1024)
+                    elapsed_time = time.time() - part_start_time
+                    avg_speed = part_downloaded_bytes / elapsed_time / (1024 * 1024) if elapsed_time > 0 else 0
+
+                    ui_set_status(status_label,
+                                  f"✓ Completed: Part {i}/{total_parts} - {filename}\nSize: {part_size_mb:.1f} MB",
+                                  f"✓ Completed: {i}/{total_parts}")
+                    ui_refresh(window)
+                    emit_event(on_event, 'part_completed', part=i, total_parts=total_parts, filename=filename,
+                               size=part_downloaded_bytes, avg_speed_mb=round(avg_speed, 3),
+                               **part_phase_fields(download_part))
+                    download_session.mark_part_completed(download_part)
+                elif control is not None and control.is_cancelled:
+                    # Keep the offset so the next run resumes this part
+                    download_part.status = PartStatus.PENDING
+                    emit_event(on_event, 'part_interrupted', part=i, total_parts=total_parts, filename=filename,
+                               downloaded=download_part.downloaded_size)
                 else:
-                    status_label.config(text=f"✓ Completed: {i}/{total_parts}")
-                window.update_idletasks()
-            else:
-                failed_parts.append((i, filename))
-
-        session.close()
+                    failed_parts.append((i, filename))
+                    emit_event(on_event, 'part_failed', part=i, total_parts=total_parts, filename=filename)
+                    download_part.status = PartStatus.FAILED
+                if store:
+                    store.checkpoint(download_session, download_part)
+        finally:
+            verifier.close()
+
+        if control is not None and control.is_cancelled:
+            download_session.status = SessionStatus.CANCELLED
+            if store:
+                store.checkpoint(download_session)
+            ui_set_status(status_label, "Download cancelled")
+            return EXIT_CANCELLED
+        finalize_session_status(download_session)
+        if store:
+            store.checkpoint(download_session)
+        emit_phase_summary(on_event, download_session)
+        save_session_report(download_session)
+        save_trace()
 
         final_progress = 100 if not failed_parts else (completed_parts / total_parts) * 100
-        if hasattr(progress_bar, 'set_progress'):
-            progress_bar.set_progress(final_progress)
-        else:
-            progress_bar["value"] = final_progress
-        window.update_idletasks()
+        ui_set_progress(progress_bar, final_progress)
+        ui_refresh(window)
 
         if failed_parts:
             failed_list = "\n".join([f"  - Part {idx}: {name}" for idx, name in failed_parts])
             message = f"Download completed with errors:\n\nSuccessfully downloaded: {completed_parts}/{total_parts} files\n\nFailed parts:\n{failed_list}"
-            if hasattr(status_label, 'set_text'):
-                status_label.set_text(f"Partial completion: {completed_parts}/{total_parts} files")
-            messagebox.showinfo("Download Partially Complete", message)
-        else:
-            if hasattr(status_label, 'set_text'):
-                status_label.set_text("Download completed successfully")
-            messagebox.showinfo("Download Complete", f"Successfully downloaded {total_parts} files to:\n{download_path}")
+            ui_set_status(status_label, f"Partial completion: {completed_parts}/{total_parts} files")
+            notify_user(on_event, 'info', "Download Partially Complete", message)
+            return EXIT_PARTIAL if completed_parts else EXIT_ERROR
+        ui_set_status(status_label, "Download completed successfully")
+        notify_user(on_event, 'info', "Download Complete", f"Successfully downloaded {total_parts} files to:\n{download_path}")
+        return EXIT_OK
 
     except Exception as e:
         error_msg = str(e)
@@ -825,9 +1796,370 @@ def download_apps_games_worker(vodu_store_url, download_path, progress_bar, stat
             error_msg = "Network error: Please check your internet connection"
         elif "Permission" in error_msg or "denied" in error_msg.lower():
             error_msg = "Permission denied: Choose a different location"
-        messagebox.showerror("Error", f"An error occurred:\n\n{error_msg}")
-        if hasattr(status_label, 'set_text'):
-            status_label.set_text("Download failed")
+        notify_user(on_event, 'error', "Error", f"An error occurred:\n\n{error_msg}")
+        ui_set_status(status_label, "Download failed")
+        return EXIT_ERROR
+    finally:
+        session.close()
+
+
+# ============================================================================
+# Series and Subtitle Extraction
+# ============================================================================
+
+VIDEO_QUALITY_NUMBERS = {"360p": "360", "720p": "720", "1080p": "1080"}
+
+SUBTITLE_URL_PATTERN = r"https://movie\.vodu\.me/subtitles/(.*?)_S(\d+)E(\d+)_(\d+)\.webvtt\" data-srt=\"(.*?)\.srt"
+
+
+@traced('resolve')
+def find_video_links(html_content, quality):
+    qnum = VIDEO_QUALITY_NUMBERS.get(quality, "360")
+    video_matches = re.findall(rf"https://\S+-{qnum}\.mp4", html_content)
+    if not video_matches:
+        alternative_patterns = [
+            rf"https://\S+-{qnum}p\.mp4",
+            rf"https://\S+_{qnum}\.mp4",
+            rf"https://\S+_{qnum}p\.mp4",
+        ]
+        for pattern in alternative_patterns:
+            video_matches = re.findall(pattern, html_content)
+            if video_matches:
+                break
+    return video_matches
+
+
+def find_available_qualities(html_content):
+    return [f"{q}p" for q in ["360", "720", "1080"] if re.findall(rf"https://\S+-{q}\.mp4", html_content)]
+
+
+@traced('resolve')
+def group_videos_by_season(video_matches, season="all"):
+    series_name = "Unknown_Series"
+    if video_matches:
+        first_video = os.path.basename(video_matches[0])
+        match = re.match(r"(.+?)_S\d+E\d+", first_video)
+        if match:
+            series_name = match.group(1)
+
+    season_videos = {}
+    for video_link in video_matches:
+        video_filename = os.path.basename(video_link)
+        season_match = re.search(r"_S(\d+)E\d+", video_filename)
+        if season_match:
+            season_num = int(season_match.group(1))
+            if season != "all" and season_num != int(season):
+                continue
+            season_videos.setdefault(season_num, []).append(video_link)
+    return series_name, season_videos
+
+
+@traced('resolve')
+def find_subtitle_links(html_content):
+    subtitle_links = []
+    for series_name, season_number, episode_number, _, subtitle_link in re.findall(SUBTITLE_URL_PATTERN, html_content):
+        if not subtitle_link.endswith(".srt"):
+            subtitle_link += ".srt"
+        subtitle_links.append((f"{series_name}_S{season_number}E{episode_number}.srt", subtitle_link))
+    return subtitle_links
+
+
+def download_season_videos(season_videos, series_name, base_download_path, quality,
+                           progress_bar=None, status_label=None, window=None, on_event=None, control=None):
+    total_videos = sum(len(videos) for videos in season_videos.values())
+    current_video = 0
+    failed_videos = []
+
+    # Episodes are fetched without a session, so no digest is recorded for
+    # them and existing files are only checked by size
+    video_parts = {}
+    for season_num in sorted(season_videos.keys()):
+        season_download_path = os.path.join(base_download_path, f"{series_name}_Season_{season_num:02d}")
+        for video_link in season_videos[season_num]:
+            video_filename = os.path.basename(video_link)
+            video_part = DownloadPart(part_number=len(video_parts) + 1, filename=video_filename,
+                                      download_url=video_link, expected_size=0,
+                                      local_path=os.path.join(season_download_path, video_filename))
+            video_parts[video_link] = video_part
+            emit_event(on_event, 'video_queued', filename=video_filename, season=season_num)
+    verifier = PartVerifier(video_parts.values(), on_event=on_event)
+    http_session = create_optimized_session()
+    try:
+        for season_num in sorted(season_videos.keys()):
+            if control is not None and control.is_cancelled:
+                break
+            videos = season_videos[season_num]
+            season_folder_name = f"{series_name}_Season_{season_num:02d}"
+            season_download_path = os.path.join(base_download_path, season_folder_name)
+            os.makedirs(season_download_path, exist_ok=True)
+
+            for video_link in videos:
+                if control is not None and control.is_cancelled:
+                    break
+                current_video += 1
+                video_filename = os.path.basename(video_link)
+                video_save_path = os.path.join(season_download_path, video_filename)
+
+                if verifier.is_complete(video_parts[video_link]):
+                    emit_event(on_event, 'video_skipped', filename=video_filename, season=season_num,
+                               index=current_video, total_videos=total_videos)
+                    continue
+
+                progress_text = f"Downloading {video_filename} ({quality}) - S{season_num} ({current_video}/{total_videos})"
+                ui_set_status(status_label, progress_text)
+                ui_refresh(window)
+                emit_event(on_event, 'video_started', filename=video_filename, season=season_num,
+                           index=current_video, total_videos=total_videos)
+
+                progress_callback = None
+                if on_event is not None:
+                    progress_callback = make_progress_emitter(on_event, filename=video_filename,
+                                                              index=current_video, total_videos=total_videos)
+                if download_with_retry(video_link, video_save_path, progress_bar, status_label, window,
+                                       progress_callback=progress_callback, control=control, session=http_session):
+                    print(f"Downloaded '{video_filename}'")
+                    emit_event(on_event, 'video_completed', filename=video_filename, season=season_num,
+                               index=current_video, total_videos=total_videos)
+                elif control is None or not control.is_cancelled:
+                    failed_videos.append(video_filename)
+                    emit_event(on_event, 'video_failed', filename=video_filename, season=season_num,
+                               index=current_video, total_videos=total_videos)
+    finally:
+        verifier.close()
+        http_session.close()
+    return total_videos, failed_videos
+
+
+def download_subtitle_files(subtitle_links, download_path, progress_bar=None, status_label=None, window=None,
+                            on_event=None, control=None):
+    failed_subtitles = []
+    http_session = create_optimized_session()
+    try:
+        for subtitle_filename, subtitle_link in subtitle_links:
+            if control is not None and control.is_cancelled:
+                break
+            subtitle_save_path = os.path.join(download_path, subtitle_filename)
+
+            ui_set_status(status_label, f"Downloading {subtitle_filename}")
+            ui_refresh(window)
+
+            if download_with_retry(subtitle_link, subtitle_save_path, progress_bar, status_label, window,
+                                   control=control, session=http_session):
+                emit_event(on_event, 'subtitle_completed', filename=subtitle_filename)
+            elif control is None or not control.is_cancelled:
+                failed_subtitles.append(subtitle_filename)
+                emit_event(on_event, 'subtitle_failed', filename=subtitle_filename)
+    finally:
+        http_session.close()
+    return failed_subtitles
+
+
+def download_series_worker(url, quality, season, base_download_path, progress_bar=None, status_label=None,
+                           window=None, on_event=None, include_subtitles=False, control=None):
+    with RESOLUTION_SECONDS.time():
+        sample_text = get_html_content(url)
+        video_matches = find_video_links(sample_text, quality) if sample_text else []
+    if not sample_text:
+        notify_user(on_event, 'error', "Error", "Failed to fetch content from URL.")
+        return EXIT_ERROR
+
+    if not video_matches:
+        available_qualities = find_available_qualities(sample_text)
+        message = f"No {quality} videos found."
+        if available_qualities:
+            message += f"\n\nAvailable: {', '.join(available_qualities)}"
+        notify_user(on_event, 'info', "Info", message)
+        return EXIT_NO_LINKS
+
+    series_name, season_videos = group_videos_by_season(video_matches, season)
+    if not season_videos:
+        notify_user(on_event, 'info', "Info", "No videos found for the selected season.")
+        return EXIT_NO_LINKS
+
+    emit_event(on_event, 'links_resolved', series=series_name,
+               total_videos=sum(len(videos) for videos in season_videos.values()))
+    total_videos, failed_videos = download_season_videos(
+        season_videos, series_name, base_download_path, quality, progress_bar, status_label, window, on_event,
+        control)
+
+    total_files = total_videos
+    failed_files = len(failed_videos)
+    if include_subtitles:
+        subtitle_links = find_subtitle_links(sample_text)
+        total_files += len(subtitle_links)
+        failed_files += len(download_subtitle_files(
+            subtitle_links, base_download_path, progress_bar, status_label, window, on_event, control))
+
+    if control is not None and control.is_cancelled:
+        return EXIT_CANCELLED
+    if not failed_files:
+        return EXIT_OK
+    return EXIT_PARTIAL if failed_files < total_files else EXIT_ERROR
+
+
+# ============================================================================
+# Session Download Engine (DownloadSession/DownloadPart based)
+# ============================================================================
+
+CHECKPOINT_INTERVAL_SECONDS = 5.0
+
+
+def build_store_parts(vodu_store_url, download_path):
+    with RESOLUTION_SECONDS.time():
+        download_urls = try_api_endpoint(vodu_store_url)
+        if not download_urls:
+            download_urls = get_vodu_download_links_with_selenium(vodu_store_url)
+    download_urls = download_urls or []
+    parts = []
+    for i, (url, size) in enumerate(zip(download_urls, probe_content_lengths(download_urls)), 1):
+        filename = os.path.basename(url)
+        parts.append(DownloadPart(
+            part_number=i,
+            filename=filename,
+            download_url=url,
+            expected_size=size,
+            local_path=os.path.join(download_path, filename)
+        ))
+    return parts
+
+
+def build_series_parts(url, quality, season, base_download_path, include_subtitles=False):
+    with RESOLUTION_SECONDS.time():
+        sample_text = get_html_content(url)
+        video_matches = find_video_links(sample_text, quality) if sample_text else []
+    if not sample_text:
+        return None, []
+    series_name, season_videos = group_videos_by_season(video_matches, season)
+    parts = []
+    for season_num in sorted(season_videos.keys()):
+        season_download_path = os.path.join(base_download_path, f"{series_name}_Season_{season_num:02d}")
+        for video_link in season_videos[season_num]:
+            filename = os.path.basename(video_link)
+            parts.append(DownloadPart(
+                part_number=len(parts) + 1,
+                filename=filename,
+                download_url=video_link,
+                expected_size=0,
+                local_path=os.path.join(season_download_path, filename)
+            ))
+    for part, size in zip(parts, probe_content_lengths([part.download_url for part in parts])):
+        part.expected_size = size
+    if include_subtitles and parts:
+        for subtitle_filename, subtitle_link in find_subtitle_links(sample_text):
+            parts.append(DownloadPart(
+                part_number=len(parts) + 1,
+                filename=subtitle_filename,
+                download_url=subtitle_link,
+                expected_size=0,
+                local_path=os.path.join(base_download_path, subtitle_filename)
+            ))
+    return series_name, parts
+
+
+def resolve_session_parts(session):
+    options = session.job_options or {}
+    if options.get('kind') == 'series':
+        series_name, parts = build_series_parts(
+            session.vodu_store_url, options.get('quality', '360p'), options.get('season', 'all'),
+            session.download_location, options.get('subtitles', False))
+        if series_name:
+            session.app_name = series_name
+    else:
+        parts = build_store_parts(session.vodu_store_url, session.download_location)
+    session.parts = parts
+    session.total_parts = len(parts)
+    session.total_expected_bytes = sum(part.expected_size for part in parts)
+    return parts
+
+
+def download_session_parts(session, http_session=None, on_event=None, checkpoint=None, control=None):
+    # checkpoint(part) persists one part row; it is called after every part
+    # and every CHECKPOINT_INTERVAL_SECONDS while a part is transferring.
+    # Pause and cancel take effect within one chunk through control: the
+    # interrupted part goes back to PENDING with its offset kept, and the
+    # loop stops as soon as another thread moves the session out of DOWNLOADING.
+    options = session.job_options or {}
+    verifier = PartVerifier([part for part in session.parts if not part.is_complete() and part.expected_size > 0],
+                            full=options.get('verify', False), on_event=on_event)
+    try:
+        for part in session.parts:
+            if session.status != SessionStatus.DOWNLOADING:
+                return
+            if part.is_complete():
+                continue
+
+            os.makedirs(os.path.dirname(part.local_path) or '.', exist_ok=True)
+            if part.expected_size > 0 and verifier.is_complete(part):
+                part.downloaded_size = part.expected_size
+                part.status = PartStatus.SKIPPED
+                session.completed_parts += 1
+                session.calculate_progress()
+                emit_event(on_event, 'part_skipped', part=part.part_number, filename=part.filename)
+                if checkpoint:
+                    checkpoint(part)
+                continue
+
+            part.status = PartStatus.DOWNLOADING
+            emit_event(on_event, 'part_started', part=part.part_number, filename=part.filename,
+                       expected_size=part.expected_size)
+            report = make_progress_emitter(on_event, part=part.part_number, filename=part.filename)
+            last_checkpoint_time = time.time()
+
+            def update_progress(chunk_bytes, downloaded, total, part=part):
+                nonlocal last_checkpoint_time
+                part.downloaded_size = downloaded
+                report(downloaded, total)
+                if checkpoint and time.time() - last_checkpoint_time >= CHECKPOINT_INTERVAL_SECONDS:
+                    last_checkpoint_time = time.time()
+                    session.calculate_progress()
+                    checkpoint(part)
+
+            success = False
+            for attempt in range(3):
+                if attempt > 0:
+                    failure = last_transfer_failure()
+                    delay = retry_delay(attempt, failure)
+                    if delay is None:
+                        break
+                    emit_event(on_event, 'part_retry', part=part.part_number, filename=part.filename,
+                               attempt=attempt + 1, reason=failure[0], delay=round(delay, 2))
+                    DOWNLOAD_RETRIES.inc()
+                    trace_instant('retry', 'retry', file=part.filename, attempt=attempt + 1)
+                    if control is not None and control.wait(delay):
+                        break
+                    elif control is None:
+                        time.sleep(delay)
+                part.last_attempt_at = datetime.now()
+                success = download_part_segmented(part.download_url, part.local_path, update_progress,
+                                                    http_session, part, control)
+                if success or (control is not None and control.is_cancelled):
+                    break
+                part.retry_count += 1
+
+            if not success and control is not None and control.is_cancelled:
+                part.status = PartStatus.PENDING
+                emit_event(on_event, 'part_interrupted', part=part.part_number, filename=part.filename,
+                           downloaded=part.downloaded_size)
+                if checkpoint:
+                    checkpoint(part)
+                return
+
+            if success:
+                if part.expected_size == 0:
+                    part.expected_size = part.downloaded_size
+                    session.total_expected_bytes += part.downloaded_size
+                session.mark_part_completed(part)
+                emit_event(on_event, 'part_completed', part=part.part_number, filename=part.filename,
+                           size=part.downloaded_size, **part_phase_fields(part))
+            else:
+                part.status = PartStatus.FAILED
+                emit_event(on_event, 'part_failed', part=part.part_number, filename=part.filename)
+            if checkpoint:
+                checkpoint(part)
+
+    finally:
+        verifier.close()
+        emit_phase_summary(on_event, session)
 
 
 # ============================================================================
@@ -842,6 +2174,13 @@ class DownloadHandlers:
         self.selected_quality = '360p'
         self.selected_season = 'all'
         self.html_cache = None
+        # Downloads run here so the Tk thread only ever draws and shows dialogs
+        self.executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='vodu-download')
+        self._controls = {}
+        self._jobs_lock = threading.Lock()
+        # id() of a finished job's control can be handed to the next one,
+        # while its row is still on the dashboard
+        self._job_ids = itertools.count(1)
 
     def set_quality(self, quality: str):
         self.selected_quality = quality
@@ -849,185 +2188,175 @@ class DownloadHandlers:
     def set_season(self, season: str):
         self.selected_season = season
 
+    # ========================================================================
+    # Background Jobs
+    # ========================================================================
+
+    def _submit(self, title, job, *args, controls=True):
+        """
+        Run job(control, on_event, *args) on the download executor.
+
+        With controls, the job gets Pause/Resume/Cancel buttons and its
+        events are shown on the Jobs dashboard.
+        """
+        control = TransferControl()
+        job_id = next(self._job_ids)
+        with self._jobs_lock:
+            self._controls[job_id] = control
+
+        def on_event(event):
+            self._handle_worker_event(event)
+            if controls:
+                self.app.post_job_event({'job': job_id, **event})
+
+        def pause():
+            control.pause()
+            emit_event(on_event, 'job_paused')
+
+        def resume():
+            control.resume()
+            emit_event(on_event, 'job_resumed')
+
+        def run():
+            state = 'done'
+            if controls:
+                emit_event(on_event, 'job_started', title=title)
+                self.app.ui_bus.call(self.app.add_job_controls, job_id, title, pause, resume, control.cancel)
+            try:
+                job(control, on_event, *args)
+            except Exception as e:
+                state = 'error'
+                self._show_dialog('error', "Error", str(e))
+            finally:
+                with self._jobs_lock:
+                    self._controls.pop(job_id, None)
+                if controls:
+                    emit_event(on_event, 'job_finished', state='cancelled' if control.is_cancelled else state)
+                    self.app.ui_bus.call(self.app.remove_job_controls, job_id)
+
+        return self.executor.submit(run)
+
+    def cancel_downloads(self):
+        """Ask every running download to stop at its next chunk."""
+        with self._jobs_lock:
+            for control in self._controls.values():
+                control.cancel()
+
+    def _on_ui(self, func, *args, **kwargs):
+        """Run func on the Tk thread and wait for its result."""
+        return self.app.ui_bus.call(func, *args, **kwargs).result()
+
+    def _show_dialog(self, level, title, message):
+        show = {'error': messagebox.showerror, 'warning': messagebox.showwarning}.get(level, messagebox.showinfo)
+        self.app.ui_bus.call(show, title, message)
+
+    def _handle_worker_event(self, event):
+        """Show worker messages as dialogs on the Tk thread."""
+        if event.get('event') == 'message':
+            self._show_dialog(event.get('level'), event.get('title'), event.get('message'))
+
+    # ========================================================================
+    # Movies and Series
+    # ========================================================================
+
     def handle_video_download(self, url, quality, season, progress_bar, status_label, time_label, window):
         """Handle video download request."""
         if not url:
             messagebox.showinfo("Info", "Please enter a URL.")
             return
+        self._submit(f"Videos ({quality})", self._video_download_job, url, quality, season, progress_bar,
+                     status_label, window)
 
-        # Get HTML content
+    def _video_download_job(self, control, on_event, url, quality, season, progress_bar, status_label, window):
+        """Fetch the series page and download the selected videos."""
+        ui_set_status(status_label, "Fetching episode list...")
         sample_text = get_html_content(url)
         if not sample_text:
-            messagebox.showinfo("Info", "Failed to fetch content from URL.")
+            self._show_dialog('info', "Info", "Failed to fetch content from URL.")
             return
 
         self.html_cache = sample_text
 
-        # Create video URL pattern based on quality
-        qnum = {"360p": "360", "720p": "720", "1080p": "1080"}.get(quality, "360")
-        video_url_pattern = rf"https://\S+-{qnum}\.mp4"
-        video_matches = re.findall(video_url_pattern, sample_text)
-
-        if not video_matches:
-            alternative_patterns = [
-                rf"https://\S+-{qnum}p\.mp4",
-                rf"https://\S+_{qnum}\.mp4",
-                rf"https://\S+_{qnum}p\.mp4",
-            ]
-            for pattern in alternative_patterns:
-                video_matches = re.findall(pattern, sample_text)
-                if video_matches:
-                    break
-
+        video_matches = find_video_links(sample_text, quality)
         if not video_matches:
-            available_qualities = []
-            for q in ["360", "720", "1080"]:
-                if re.findall(rf"https://\S+-{q}\.mp4", sample_text):
-                    available_qualities.append(f"{q}p")
+            available_qualities = find_available_qualities(sample_text)
             if available_qualities:
                 qualities_str = ", ".join(available_qualities)
-                messagebox.showinfo("Info", f"No {quality} videos found.\n\nAvailable: {qualities_str}")
+                self._show_dialog('info', "Info", f"No {quality} videos found.\n\nAvailable: {qualities_str}")
             else:
-                messagebox.showinfo("Info", f"No {quality} videos found.")
+                self._show_dialog('info', "Info", f"No {quality} videos found.")
             return
 
         # Select download path
-        base_download_path = filedialog.askdirectory(title="Choose Download Path")
+        base_download_path = self._on_ui(filedialog.askdirectory, title="Choose Download Path")
         if not base_download_path:
             return
 
         # Group videos by season
-        season_videos = {}
-        series_name = "Unknown_Series"
-        if video_matches:
-            first_video = os.path.basename(video_matches[0])
-            match = re.match(r"(.+?)_S\d+E\d+", first_video)
-            if match:
-                series_name = match.group(1)
-
-        for video_link in video_matches:
-            video_filename = os.path.basename(video_link)
-            season_match = re.search(r"_S(\d+)E\d+", video_filename)
-            if season_match:
-                season_num = int(season_match.group(1))
-                if season != "all" and season_num != int(season):
-                    continue
-                if season_num not in season_videos:
-                    season_videos[season_num] = []
-                season_videos[season_num].append(video_link)
-
+        series_name, season_videos = group_videos_by_season(video_matches, season)
         if not season_videos:
-            messagebox.showinfo("Info", "No videos found for the selected season.")
+            self._show_dialog('info', "Info", "No videos found for the selected season.")
             return
 
-        total_videos = sum(len(videos) for videos in season_videos.values())
-        current_video = 0
-
         # Download videos
-        for season_num in sorted(season_videos.keys()):
-            videos = season_videos[season_num]
-            season_folder_name = f"{series_name}_Season_{season_num:02d}"
-            season_download_path = os.path.join(base_download_path, season_folder_name)
-            os.makedirs(season_download_path, exist_ok=True)
-
-            for video_link in videos:
-                current_video += 1
-                video_filename = os.path.basename(video_link)
-                video_save_path = os.path.join(season_download_path, video_filename)
-
-                if os.path.exists(video_save_path):
-                    existing_size = os.path.getsize(video_save_path)
-                    expected_size = get_expected_file_size(video_link)
-                    if expected_size and existing_size == expected_size:
-                        continue
-
-                progress_text = f"Downloading {video_filename} ({quality}) - S{season_num} ({current_video}/{total_videos})"
-                if hasattr(status_label, 'set_text'):
-                    status_label.set_text(progress_text)
-                else:
-                    status_label.config(text=progress_text)
-                window.update_idletasks()
+        total_videos, _ = download_season_videos(
+            season_videos, series_name, base_download_path, quality, progress_bar, status_label, window,
+            on_event=on_event, control=control)
 
-                if download_with_retry(video_link, video_save_path, progress_bar, status_label, window):
-                    print(f"Downloaded '{video_filename}'")
-
-        if hasattr(progress_bar, 'set_progress'):
-            progress_bar.set_progress(100)
-        else:
-            progress_bar["value"] = 100
-        if hasattr(status_label, 'set_text'):
-            status_label.set_text("Download Completed")
-        messagebox.showinfo("Download Complete", f"Downloaded {total_videos} videos to:\n{base_download_path}")
+        if control.is_cancelled:
+            ui_set_status(status_label, "Download cancelled")
+            return
+        ui_set_progress(progress_bar, 100)
+        ui_set_status(status_label, "Download Completed")
+        self._show_dialog('info', "Download Complete", f"Downloaded {total_videos} videos to:\n{base_download_path}")
 
     def handle_subtitle_download(self, url, progress_bar, status_label, window):
         """Handle subtitle download request."""
         if not url:
             messagebox.showinfo("Info", "Please enter a URL.")
             return
+        self._submit("Subtitles", self._subtitle_download_job, url, progress_bar, status_label, window)
 
+    def _subtitle_download_job(self, control, on_event, url, progress_bar, status_label, window):
+        """Fetch the series page and download its subtitles."""
         sample_text = get_html_content(url)
         if not sample_text:
-            messagebox.showinfo("Info", "Failed to fetch content from URL.")
+            self._show_dialog('info', "Info", "Failed to fetch content from URL.")
             return
 
-        download_path = filedialog.askdirectory(title="Choose Download Path")
+        download_path = self._on_ui(filedialog.askdirectory, title="Choose Download Path")
         if not download_path:
             return
 
         os.makedirs(download_path, exist_ok=True)
 
-        subtitle_url_pattern = r"https://movie\.vodu\.me/subtitles/(.*?)_S(\d+)E(\d+)_(\d+)\.webvtt\" data-srt=\"(.*?)\.srt"
-        subtitle_matches = re.findall(subtitle_url_pattern, sample_text)
+        download_subtitle_files(find_subtitle_links(sample_text), download_path, progress_bar, status_label, window,
+                                on_event=on_event, control=control)
 
-        for series_name, season_number, episode_number, _, subtitle_link in subtitle_matches:
-            subtitle_filename = f"{series_name}_S{season_number}E{episode_number}.srt"
-            subtitle_save_path = os.path.join(download_path, subtitle_filename)
-
-            if not subtitle_link.endswith(".srt"):
-                subtitle_link += ".srt"
-
-            if hasattr(status_label, 'set_text'):
-                status_label.set_text(f"Downloading {subtitle_filename}")
-            else:
-                status_label.config(text=f"Downloading {subtitle_filename}")
-            window.update_idletasks()
-
-            download_with_retry(subtitle_link, subtitle_save_path, progress_bar, status_label, window)
-
-        if hasattr(progress_bar, 'set_progress'):
-            progress_bar.set_progress(100)
-        if hasattr(status_label, 'set_text'):
-            status_label.set_text("Subtitle download completed")
-        messagebox.showinfo("Complete", "Subtitle download completed.")
+        if control.is_cancelled:
+            ui_set_status(status_label, "Subtitle download cancelled")
+            return
+        ui_set_progress(progress_bar, 100)
+        ui_set_status(status_label, "Subtitle download completed")
+        self._show_dialog('info', "Complete", "Subtitle download completed.")
 
     def handle_open_video_urls(self, url, quality, season):
         """Handle open video URLs request."""
         if not url:
             messagebox.showinfo("Info", "Please enter a URL.")
             return
+        self._submit("Open URLs", self._open_video_urls_job, url, quality, season, controls=False)
 
+    def _open_video_urls_job(self, control, on_event, url, quality, season):
+        """Fetch the series page and open the selected videos in the browser."""
         sample_text = get_html_content(url)
         if not sample_text:
-            messagebox.showinfo("Info", "Failed to fetch content from URL.")
+            self._show_dialog('info', "Info", "Failed to fetch content from URL.")
             return
 
-        qnum = {"360p": "360", "720p": "720", "1080p": "1080"}.get(quality, "360")
-        video_url_pattern = rf"https://\S+-{qnum}\.mp4"
-        video_matches = re.findall(video_url_pattern, sample_text)
-
-        if not video_matches:
-            alternative_patterns = [
-                rf"https://\S+-{qnum}p\.mp4",
-                rf"https://\S+_{qnum}\.mp4",
-                rf"https://\S+_{qnum}p\.mp4",
-            ]
-            for pattern in alternative_patterns:
-                video_matches = re.findall(pattern, sample_text)
-                if video_matches:
-                    break
-
+        video_matches = find_video_links(sample_text, quality)
         if not video_matches:
-            messagebox.showinfo("Info", f"No {quality} videos found.")
+            self._show_dialog('info', "Info", f"No {quality} videos found.")
             return
 
         # Filter by season
@@ -1041,27 +2370,33 @@ class DownloadHandlers:
                     filtered_videos.append(video_link)
 
         if not filtered_videos:
-            messagebox.showinfo("Info", "No videos found for the selected season.")
+            self._show_dialog('info', "Info", "No videos found for the selected season.")
             return
 
         # Confirm before opening
         num_videos = len(filtered_videos)
         if num_videos > 10:
-            if not messagebox.askyesno("Confirm", f"This will open {num_videos} URLs. Continue?"):
+            if not self._on_ui(messagebox.askyesno, "Confirm", f"This will open {num_videos} URLs. Continue?"):
                 return
         elif num_videos > 1:
-            if not messagebox.askyesno("Confirm", f"Open {num_videos} URLs?"):
+            if not self._on_ui(messagebox.askyesno, "Confirm", f"Open {num_videos} URLs?"):
                 return
 
         # Open URLs
         for video_url in filtered_videos:
+            if control.is_cancelled:
+                return
             try:
                 webbrowser.open(video_url)
-                time.sleep(0.5)
+                control.wait(0.5)
             except Exception as e:
                 print(f"Failed to open URL: {e}")
 
-        messagebox.showinfo("URLs Opened", f"Opened {num_videos} video URLs in your browser.")
+        self._show_dialog('info', "URLs Opened", f"Opened {num_videos} video URLs in your browser.")
+
+    # ========================================================================
+    # Apps and Games
+    # ========================================================================
 
     def handle_apps_download(self, url, progress_bar, status_label, time_label, window):
         """Handle apps/games download request."""
@@ -1076,12 +2411,14 @@ class DownloadHandlers:
         if not download_path:
             return
 
-        download_thread = threading.Thread(
-            target=download_apps_games_worker,
-            args=(url, download_path, progress_bar, status_label, time_label, window),
-            daemon=True
-        )
-        download_thread.start()
+        self._submit("App / game files", self._apps_download_job, url, download_path, progress_bar, status_label,
+                     time_label, window)
+
+    def _apps_download_job(self, control, on_event, url, download_path, progress_bar, status_label, time_label,
+                           window):
+        """Download every part of a store item."""
+        download_apps_games_worker(url, download_path, progress_bar, status_label, time_label, window,
+                                   on_event=on_event, control=control)
 
     def handle_apps_open_urls(self, url):
         """Handle open apps URLs request."""
@@ -1115,14 +2452,183 @@ class DownloadHandlers:
         messagebox.showinfo("URLs Opened", f"Opened {num_urls} file URLs in your browser.")
 
 
+# ============================================================================
+# Download Daemon
+# ============================================================================
+
+def run_serve_command(args):
+    http_session = create_optimized_session()
+
+    def download_parts(session, on_event, checkpoint, control):
+        download_session_parts(session, http_session, on_event, checkpoint, control)
+
+    download_daemon = DownloadDaemon(job_kind, resolve_session_parts, download_parts,
+                                     max_concurrent_jobs=args.concurrency, default_output=args.output)
+    download_daemon.start()
+    server = ThreadingHTTPServer((args.host, args.port), DaemonRequestHandler)
+    server.download_daemon = download_daemon
+    print(f"Vodu Downloader daemon listening on http://{args.host}:{args.port}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        download_daemon.stop()
+    return EXIT_OK
+
+
+# ============================================================================
+# Headless Command-Line Interface
+# ============================================================================
+
+class JsonLinesReporter:
+    """Thread-safe progress sink that writes one JSON object per line."""
+
+    def __init__(self, stream=None):
+        self._stream = stream or sys.stdout
+        self._lock = threading.Lock()
+
+    def __call__(self, event):
+        line = json.dumps({'ts': round(time.time(), 3), **event}, ensure_ascii=False, default=str)
+        with self._lock:
+            self._stream.write(line + '\n')
+            self._stream.flush()
+
+    def for_job(self, job_id, url):
+        """Return an event callback that tags every event with its job."""
+        def on_event(event):
+            self({'job': job_id, 'url': url, **event})
+        return on_event
+
+
+def read_url_file(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip() and not line.strip().startswith('#')]
+
+
+def is_store_url(url):
+    return "share.vodu.store" in url
+
+
+def job_kind(url):
+    return 'store' if is_store_url(url) else 'series'
+
+
+def run_cli_job(job_id, url, args, reporter, control=None):
+    on_event = reporter.for_job(job_id, url)
+    kind = job_kind(url)
+    if control is not None and control.is_cancelled:
+        exit_code = EXIT_CANCELLED
+        emit_event(on_event, 'job_finished', kind=kind, exit_code=exit_code)
+        return exit_code
+    emit_event(on_event, 'job_started', kind=kind)
+    try:
+        if kind == 'store':
+            exit_code = download_apps_games_worker(url, args.output, None, None, None, None, on_event=on_event,
+                                                   verify=args.verify, control=control)
+        else:
+            exit_code = download_series_worker(url, args.quality, args.season, args.output, on_event=on_event,
+                                               include_subtitles=args.subtitles, control=control)
+    except Exception as e:
+        emit_event(on_event, 'message', level='error', title="Error", message=str(e))
+        exit_code = EXIT_ERROR
+    emit_event(on_event, 'job_finished', kind=kind, exit_code=exit_code)
+    return exit_code
+
+
+def run_download_command(args):
+    urls = list(args.urls)
+    if args.input_file:
+        urls.extend(read_url_file(args.input_file))
+    if not urls:
+        print("No URLs given. Pass URLs as arguments or with --input-file.", file=sys.stderr)
+        return EXIT_NO_LINKS
+
+    os.makedirs(args.output, exist_ok=True)
+    if args.season != 'all' and not args.season.isdigit():
+        print(f"Invalid season: {args.season}", file=sys.stderr)
+        return EXIT_ERROR
+
+    reporter = JsonLinesReporter(sys.stdout)
+    control = TransferControl()
+    # Worker diagnostics go to stderr so stdout stays machine-readable
+    with contextlib.redirect_stdout(sys.stderr):
+        with ThreadPoolExecutor(max_workers=max(1, args.jobs)) as executor:
+            futures = [executor.submit(run_cli_job, job_id, url, args, reporter, control)
+                       for job_id, url in enumerate(urls, 1)]
+            try:
+                exit_codes = [future.result() for future in futures]
+            except KeyboardInterrupt:
+                # Ctrl+C stops every transfer within one chunk; partial files
+                # keep their range maps and resume on the next run
+                control.cancel()
+                exit_codes = [future.result() for future in futures]
+
+    exit_code = combine_exit_codes(exit_codes)
+    reporter({'event': 'summary', 'jobs': len(exit_codes),
+              'succeeded': exit_codes.count(EXIT_OK), 'exit_code': exit_code})
+    return exit_code
+
+
+def build_cli_parser():
+    parser = argparse.ArgumentParser(
+        prog='vodu_downloader',
+        description="Vodu Downloader. Run without arguments to open the GUI.",
+        epilog=(f"Exit codes: {EXIT_OK}=success, {EXIT_ERROR}=failed, 2=usage error, "
+                f"{EXIT_PARTIAL}=partially completed, {EXIT_NO_LINKS}=no download links, "
+                f"{EXIT_NO_DISK_SPACE}=not enough disk space, {EXIT_CANCELLED}=cancelled (Ctrl+C)")
+    )
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    download = subparsers.add_parser('download', help="Download series or store URLs without the GUI",
+                                     epilog=parser.epilog)
+    download.add_argument('urls', nargs='*', help="Series (vodu.me) or store (share.vodu.store) URLs")
+    download.add_argument('-i', '--input-file', help="File with one URL per line ('#' starts a comment)")
+    download.add_argument('-o', '--output', default=os.getcwd(), help="Download directory (default: current)")
+    download.add_argument('-q', '--quality', default='360p', choices=list(VIDEO_QUALITY_NUMBERS),
+                          help="Video quality for series URLs (default: 360p)")
+    download.add_argument('-s', '--season', default='all', help="Season number or 'all' (default: all)")
+    download.add_argument('-j', '--jobs', type=int, default=1, help="URLs to download concurrently (default: 1)")
+    download.add_argument('--subtitles', action='store_true', help="Also download subtitles for series URLs")
+    download.add_argument('--verify', action='store_true',
+                          help="Hash files of store URLs that already exist and re-download any that fail their "
+                               "recorded digest (series episodes are only checked by size)")
+    download.set_defaults(func=run_download_command)
+
+    serve = subparsers.add_parser('serve', help="Run the download daemon with a local HTTP/JSON API")
+    serve.add_argument('--host', default='127.0.0.1', help="Address to bind (default: 127.0.0.1)")
+    serve.add_argument('--port', type=int, default=DAEMON_DEFAULT_PORT,
+                       help=f"Port to listen on (default: {DAEMON_DEFAULT_PORT})")
+    serve.add_argument('-o', '--output', default=os.getcwd(), help="Default download directory for new jobs")
+    serve.add_argument('-c', '--concurrency', type=int, default=2, help="Jobs downloading at once (default: 2)")
+    serve.set_defaults(func=run_serve_command)
+    return parser
+
+
+def run_cli(argv):
+    args = build_cli_parser().parse_args(argv)
+    return args.func(args)
+
+
 # ============================================================================
 # Main Entry Point
 # ============================================================================
 
-def main():
+def main(argv=None):
     """Main entry point for the application."""
+    argv = sys.argv[1:] if argv is None else argv
+    if argv:
+        return run_cli(argv)
+
+    # Import the iOS-style GUI lazily so headless runs never need Tk
+    from src.gui import VoduDownloaderApp
+
     # Create and run the app
     app = VoduDownloaderApp()
+    if TRACE is not None:
+        app.ui_bus.on_drain = lambda started, ended, updates: TRACE.complete('drain', 'ui', started, ended,
+                                                                             updates=updates)
 
     # Create download handlers
     handlers = DownloadHandlers(app)
@@ -1134,10 +2640,11 @@ def main():
         'open_video_urls': handlers.handle_open_video_urls,
         'apps_download': handlers.handle_apps_download,
         'apps_open_urls': handlers.handle_apps_open_urls,
+        'cancel_all': handlers.cancel_downloads,
     }
 
     app.mainloop()
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
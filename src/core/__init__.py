@@ -0,0 +1,5 @@
+"""
+Vodu Downloader - Core
+Download models, session store, segment scheduler, daemon, metrics and tracing,
+shared by the GUI, the command-line interface and the daemon in main.py.
+"""
@@ -0,0 +1,53 @@
+"""
+Transfer Control
+Pause, resume and cancel signal shared by a download job and its chunk loops.
+"""
+
+import threading
+
+
+class TransferControl:
+    """
+    Pause, resume and cancel signal shared by a job and its chunk loops.
+
+    The chunk loops check interrupted() after every chunk. A paused or
+    cancelled job closes its response at once, so it stops using bandwidth
+    and keeps what it wrote. wait_while_paused() blocks until the job is
+    resumed (True) or cancelled (False); resuming then fetches the missing
+    ranges with a Range request on the job's pooled session.
+    """
+
+    def __init__(self):
+        self._running = threading.Event()
+        self._running.set()
+        self._cancelled = threading.Event()
+
+    def pause(self):
+        if not self._cancelled.is_set():
+            self._running.clear()
+
+    def resume(self):
+        self._running.set()
+
+    def cancel(self):
+        self._cancelled.set()
+        self._running.set()
+
+    @property
+    def is_paused(self) -> bool:
+        return not self._running.is_set()
+
+    @property
+    def is_cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def interrupted(self) -> bool:
+        return not self._running.is_set() or self._cancelled.is_set()
+
+    def wait_while_paused(self) -> bool:
+        self._running.wait()
+        return not self._cancelled.is_set()
+
+    def wait(self, seconds) -> bool:
+        # Retry back-off that ends early on cancel; returns True if cancelled
+        return self._cancelled.wait(seconds)
@@ -0,0 +1,350 @@
+"""
+Download Daemon
+Persistent job queue with a local HTTP/JSON API.
+"""
+
+import json
+import os
+import queue
+import re
+import threading
+import time
+import uuid
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler
+from urllib.parse import urlparse
+
+from .control import TransferControl
+from .metrics import METRICS, QUEUED_JOBS
+from .models import DownloadSession, PartStatus, SessionStatus, finalize_session_status
+from .reports import save_session_report, session_report, session_report_csv
+from .session_store import get_session_store, recall_part_digest, session_to_dict
+from .tracing import save_trace
+
+
+DAEMON_DEFAULT_PORT = 8770
+
+
+class DownloadDaemon:
+    """
+    Runs queued download sessions in the background and persists them.
+
+    The download engine is passed in: job_kind(url) names the kind of a new
+    job ('store' or 'series'), resolve_parts(session) fills in its parts and
+    returns them, and download_parts(session, on_event, checkpoint, control)
+    downloads the pending ones.
+    """
+
+    def __init__(self, job_kind, resolve_parts, download_parts, max_concurrent_jobs=2, default_output=None,
+                 store=None):
+        self.job_kind = job_kind
+        self.resolve_parts = resolve_parts
+        self.download_parts = download_parts
+        self.max_concurrent_jobs = max(1, max_concurrent_jobs)
+        self.default_output = default_output or os.getcwd()
+        self._store = store or get_session_store()
+        self._sessions = {}
+        self._threads = {}
+        self._controls = {}
+        self._subscribers = set()
+        self._lock = threading.RLock()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+
+    def start(self):
+        for session in self._store.load_sessions():
+            if session.job_options is None:
+                continue  # Sessions recorded by the GUI are not daemon jobs
+            if session.status == SessionStatus.DOWNLOADING:
+                session.status = SessionStatus.INITIALIZED
+            for part in session.parts:
+                if part.status == PartStatus.DOWNLOADING:
+                    part.status = PartStatus.PENDING
+            self._sessions[session.session_id] = session
+        threading.Thread(target=self._schedule_loop, name='vodu-scheduler', daemon=True).start()
+
+    def stop(self):
+        # Running jobs stay DOWNLOADING in the store and are re-queued on start
+        self._stopping.set()
+        self._wakeup.set()
+
+    # ------------------------------------------------------------------
+    # Job control
+    # ------------------------------------------------------------------
+
+    def submit(self, url, output=None, quality='360p', season='all', subtitles=False, verify=False):
+        kind = self.job_kind(url)
+        session = DownloadSession(
+            session_id=uuid.uuid4().hex[:12],
+            vodu_store_url=url,
+            download_location=output or self.default_output,
+            app_name=url,
+            parts=[],
+            total_parts=0,
+            job_options={'kind': kind, 'quality': quality, 'season': str(season), 'subtitles': bool(subtitles),
+                         'verify': bool(verify)}
+        )
+        with self._lock:
+            self._sessions[session.session_id] = session
+            self._store.save_session(session)
+        self.publish({'job': session.session_id, 'event': 'job_queued', 'kind': kind})
+        self._wakeup.set()
+        return session
+
+    def get_job(self, job_id):
+        with self._lock:
+            return self._sessions.get(job_id)
+
+    def list_jobs(self):
+        with self._lock:
+            return list(self._sessions.values())
+
+    def pause(self, job_id):
+        return self._transition(job_id, SessionStatus.PAUSED,
+                                (SessionStatus.INITIALIZED, SessionStatus.DOWNLOADING))
+
+    def resume(self, job_id):
+        with self._lock:
+            # A job whose worker is still alive (paused, or not yet stopped)
+            # continues in place; one that exited is queued again and
+            # resumes from its offsets
+            control = self._controls.get(job_id)
+            running = job_id in self._threads and control is not None and not control.is_cancelled
+            target = SessionStatus.DOWNLOADING if running else SessionStatus.INITIALIZED
+            return self._transition(job_id, target,
+                                    (SessionStatus.PAUSED, SessionStatus.FAILED,
+                                     SessionStatus.PARTIALLY_COMPLETED))
+
+    def cancel(self, job_id):
+        return self._transition(job_id, SessionStatus.CANCELLED,
+                                (SessionStatus.INITIALIZED, SessionStatus.DOWNLOADING, SessionStatus.PAUSED))
+
+    def _transition(self, job_id, new_status, allowed_from):
+        with self._lock:
+            session = self._sessions.get(job_id)
+            if session is None:
+                return None
+            if session.status not in allowed_from:
+                raise ValueError(f"Cannot change job {job_id} from {session.status.value} to {new_status.value}")
+            if new_status in (SessionStatus.INITIALIZED, SessionStatus.DOWNLOADING):
+                for part in session.parts:
+                    if part.status == PartStatus.FAILED:
+                        part.status = PartStatus.PENDING
+            control = self._controls.get(job_id)
+            if control is not None:
+                # Both drop the connection now instead of finishing the current
+                # part; a paused worker keeps its place and waits for resume()
+                if new_status == SessionStatus.PAUSED:
+                    control.pause()
+                elif new_status == SessionStatus.CANCELLED:
+                    control.cancel()
+                elif new_status == SessionStatus.DOWNLOADING:
+                    control.resume()
+            session.status = new_status
+            self._store.save_session(session)
+        self.publish({'job': job_id, 'event': 'job_status', 'status': new_status.value})
+        self._wakeup.set()
+        return session
+
+    # ------------------------------------------------------------------
+    # Scheduling
+    # ------------------------------------------------------------------
+
+    def _schedule_loop(self):
+        while not self._stopping.is_set():
+            with self._lock:
+                for session in self._sessions.values():
+                    if len(self._threads) >= self.max_concurrent_jobs:
+                        break
+                    if session.status != SessionStatus.INITIALIZED or session.session_id in self._threads:
+                        continue
+                    session.status = SessionStatus.DOWNLOADING
+                    session.started_at = session.started_at or datetime.now()
+                    control = TransferControl()
+                    thread = threading.Thread(target=self._run_job, args=(session, control),
+                                              name=f'vodu-job-{session.session_id}', daemon=True)
+                    self._threads[session.session_id] = thread
+                    self._controls[session.session_id] = control
+                    thread.start()
+                QUEUED_JOBS.set(sum(1 for session in self._sessions.values()
+                                    if session.status == SessionStatus.INITIALIZED))
+            self._wakeup.wait(1.0)
+            self._wakeup.clear()
+
+    def _run_job(self, session, control):
+        job_id = session.session_id
+
+        def on_event(event):
+            self.publish({'job': job_id, **event})
+
+        on_event({'event': 'job_started'})
+        try:
+            if not session.parts:
+                on_event({'event': 'job_resolving'})
+                if not self.resolve_parts(session):
+                    with self._lock:
+                        session.status = SessionStatus.FAILED
+                        session.last_error = "No download links found"
+                    return
+                on_event({'event': 'links_resolved', 'total_parts': session.total_parts,
+                          'total_bytes': session.total_expected_bytes})
+                for part in session.parts:
+                    recall_part_digest(self._store, part)
+                self._store.save_session(session)
+            self.download_parts(session, on_event, lambda part: self.checkpoint(session, part), control)
+            with self._lock:
+                if session.status == SessionStatus.DOWNLOADING:
+                    finalize_session_status(session)
+        except Exception as e:
+            with self._lock:
+                session.status = SessionStatus.FAILED
+                session.last_error = str(e)
+        finally:
+            with self._lock:
+                self._threads.pop(job_id, None)
+                self._controls.pop(job_id, None)
+            on_event({'event': 'job_finished', 'status': session.status.value, 'error': session.last_error})
+            self.checkpoint(session)
+            if session.status not in (SessionStatus.PAUSED, SessionStatus.INITIALIZED):
+                save_session_report(session)
+                save_trace()
+            self._wakeup.set()
+
+    def checkpoint(self, session, part=None):
+        with self._lock:
+            self._store.checkpoint(session, part)
+
+    # ------------------------------------------------------------------
+    # Progress events
+    # ------------------------------------------------------------------
+
+    def subscribe(self):
+        subscriber = queue.Queue(maxsize=1000)
+        with self._lock:
+            self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+    def publish(self, event):
+        event = {'ts': round(time.time(), 3), **event}
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            try:
+                subscriber.put_nowait(event)
+            except queue.Full:
+                pass  # Slow clients lose events rather than stall downloads
+
+
+class DaemonRequestHandler(BaseHTTPRequestHandler):
+    """Local JSON API: /jobs, /jobs/<id>, /jobs/<id>/<action>, /events, plus /metrics for Prometheus."""
+
+    server_version = "VoduDownloaderDaemon/1.0"
+
+    @property
+    def download_daemon(self):
+        return self.server.download_daemon
+
+    def do_GET(self):
+        path = urlparse(self.path).path.rstrip('/')
+        if path == '/jobs':
+            self._send_json(200, [session_to_dict(s, include_parts=False)
+                                  for s in self.download_daemon.list_jobs()])
+            return
+        if path == '/events':
+            self._stream_events()
+            return
+        if path == '/metrics':
+            self._send_text(200, METRICS.render(), 'text/plain; version=0.0.4; charset=utf-8')
+            return
+        match = re.fullmatch(r'/jobs/(\w+)/report\.(json|csv)', path)
+        if match:
+            session = self.download_daemon.get_job(match.group(1))
+            if session is None:
+                self._send_json(404, {'error': 'job not found'})
+            elif match.group(2) == 'json':
+                self._send_json(200, session_report(session))
+            else:
+                self._send_text(200, session_report_csv(session), 'text/csv; charset=utf-8')
+            return
+        match = re.fullmatch(r'/jobs/(\w+)', path)
+        if match:
+            session = self.download_daemon.get_job(match.group(1))
+            if session is None:
+                self._send_json(404, {'error': 'job not found'})
+            else:
+                self._send_json(200, session_to_dict(session))
+            return
+        self._send_json(404, {'error': 'not found'})
+
+    def do_POST(self):
+        path = urlparse(self.path).path.rstrip('/')
+        if path == '/jobs':
+            body = self._read_json()
+            if not isinstance(body, dict) or not body.get('url'):
+                self._send_json(400, {'error': "expected a JSON object with a 'url'"})
+                return
+            season = str(body.get('season', 'all'))
+            if season != 'all' and not season.isdigit():
+                self._send_json(400, {'error': f"invalid season: {season}"})
+                return
+            session = self.download_daemon.submit(
+                body['url'], body.get('output'), body.get('quality', '360p'), season, body.get('subtitles', False),
+                body.get('verify', False))
+            self._send_json(201, session_to_dict(session, include_parts=False))
+            return
+        match = re.fullmatch(r'/jobs/(\w+)/(pause|resume|cancel)', path)
+        if match:
+            job_id, action = match.groups()
+            try:
+                session = getattr(self.download_daemon, action)(job_id)
+            except ValueError as e:
+                self._send_json(409, {'error': str(e)})
+                return
+            if session is None:
+                self._send_json(404, {'error': 'job not found'})
+            else:
+                self._send_json(200, session_to_dict(session, include_parts=False))
+            return
+        self._send_json(404, {'error': 'not found'})
+
+    def _read_json(self):
+        length = int(self.headers.get('Content-Length', 0))
+        try:
+            return json.loads(self.rfile.read(length) or b'null')
+        except json.JSONDecodeError:
+            return None
+
+    def _send_json(self, status, payload):
+        self._send_text(status, json.dumps(payload, ensure_ascii=False, default=str),
+                        'application/json; charset=utf-8')
+
+    def _send_text(self, status, text, content_type):
+        body = text.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _stream_events(self):
+        subscriber = self.download_daemon.subscribe()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/x-ndjson')
+        self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        try:
+            while True:
+                try:
+                    event = subscriber.get(timeout=15)
+                except queue.Empty:
+                    event = {'ts': round(time.time(), 3), 'event': 'keepalive'}
+                self.wfile.write((json.dumps(event, ensure_ascii=False, default=str) + '\n').encode('utf-8'))
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            self.download_daemon.unsubscribe(subscriber)
@@ -0,0 +1,140 @@
+"""
+Metrics
+Counters, gauges and histograms rendered in the Prometheus text format.
+"""
+
+import bisect
+import contextlib
+import threading
+import time
+
+
+class Counter:
+    """Monotonically increasing total."""
+
+    kind = 'counter'
+
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help = help_text
+        self._value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1):
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self):
+        return self._value
+
+    def samples(self):
+        yield self.name, '', self._value
+
+
+class Gauge(Counter):
+    """Value that goes up and down."""
+
+    kind = 'gauge'
+
+    def dec(self, amount=1):
+        self.inc(-amount)
+
+    def set(self, value):
+        with self._lock:
+            self._value = value
+
+
+class Histogram:
+    """
+    Distribution of observed values in cumulative buckets.
+
+    observe() is a binary search and three additions under a lock, cheap
+    enough for once per written chunk.
+    """
+
+    kind = 'histogram'
+
+    def __init__(self, name, help_text, buckets):
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+            self._count += 1
+
+    @contextlib.contextmanager
+    def time(self):
+        """Observe the duration of the block in seconds."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started)
+
+    @property
+    def count(self):
+        return self._count
+
+    def samples(self):
+        with self._lock:
+            counts, total, count = list(self._counts), self._sum, self._count
+        cumulative = 0
+        for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+            cumulative += bucket_count
+            le = '+Inf' if bound == float('inf') else repr(bound)
+            yield f"{self.name}_bucket", f'{{le="{le}"}}', cumulative
+        yield f"{self.name}_sum", '', total
+        yield f"{self.name}_count", '', count
+
+
+class MetricsRegistry:
+    """Process-wide metrics, rendered for a Prometheus scrape."""
+
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name, help_text):
+        return self.register(Counter(name, help_text))
+
+    def gauge(self, name, help_text):
+        return self.register(Gauge(name, help_text))
+
+    def histogram(self, name, help_text, buckets):
+        return self.register(Histogram(name, help_text, buckets))
+
+    def render(self):
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(f"{name}{labels} {value}" for name, labels, value in metric.samples())
+        return '\n'.join(lines) + '\n'
+
+
+METRICS = MetricsRegistry()
+DOWNLOADED_BYTES = METRICS.counter('vodu_downloaded_bytes_total', "Bytes downloaded and written to disk.")
+ACTIVE_TRANSFERS = METRICS.gauge('vodu_active_transfers', "HTTP responses currently being streamed to disk.")
+DOWNLOAD_RETRIES = METRICS.counter('vodu_download_retries_total', "Download attempts repeated after a failure.")
+QUEUED_JOBS = METRICS.gauge('vodu_queued_jobs', "Daemon jobs waiting for a download slot.")
+RESOLUTION_SECONDS = METRICS.histogram(
+    'vodu_link_resolution_seconds', "Time to resolve the download links of a job.",
+    (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120))
+DISK_WRITE_SECONDS = METRICS.histogram(
+    'vodu_disk_write_seconds', "Time to write one downloaded chunk.",
+    (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1))
+DISK_SYNC_SECONDS = METRICS.histogram(
+    'vodu_disk_sync_seconds', "Time to flush and fsync a file before its range map is saved.",
+    (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5))
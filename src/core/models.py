@@ -0,0 +1,437 @@
+"""
+Download Models
+Sessions, parts, their statuses, speed statistics and per-request phase timings.
+"""
+
+import heapq
+import math
+import time
+from array import array
+from datetime import datetime
+from enum import Enum
+from typing import List, Optional
+
+
+# ============================================================================
+# Transfer Phase Timing
+# ============================================================================
+
+PHASES = ('dns', 'connect', 'tls', 'ttfb', 'transfer', 'write')
+# Per-request records kept on a part; older ones are folded together
+PHASE_TIMING_MAX_REQUESTS = 64
+
+
+class PhaseTimings:
+    """
+    Seconds spent in each phase of one HTTP request, or summed over several.
+
+    dns, connect and tls are zero when the request reused a pooled
+    connection. ttfb runs from sending the request to receiving the
+    response headers, transfer is the time spent waiting for body bytes,
+    and write the time spent writing and syncing them to disk.
+    """
+
+    __slots__ = PHASES + ('requests', 'bytes')
+
+    def __init__(self, requests=0, bytes=0, **seconds):
+        self.requests = requests
+        self.bytes = bytes
+        for phase in PHASES:
+            setattr(self, phase, seconds.get(phase, 0.0))
+
+    def add(self, other):
+        self.requests += other.requests
+        self.bytes += other.bytes
+        for phase in PHASES:
+            setattr(self, phase, getattr(self, phase) + getattr(other, phase))
+        return self
+
+    @classmethod
+    def combine(cls, timings):
+        total = cls()
+        for item in timings:
+            total.add(item)
+        return total
+
+    def slowest(self):
+        """Name of the phase that took the most time."""
+        return max(PHASES, key=lambda phase: getattr(self, phase))
+
+    def to_dict(self):
+        return {'requests': self.requests, 'bytes': self.bytes,
+                **{phase: round(getattr(self, phase), 6) for phase in PHASES}}
+
+    @classmethod
+    def from_dict(cls, timing_dict):
+        return cls(timing_dict.get('requests', 0), timing_dict.get('bytes', 0),
+                   **{phase: timing_dict.get(phase, 0.0) for phase in PHASES})
+
+
+# ============================================================================
+# Data Classes and Enums
+# ============================================================================
+
+class PartStatus(Enum):
+    PENDING = "pending"
+    DOWNLOADING = "downloading"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    SKIPPED = "skipped"
+
+
+PENDING_PART_STATUSES = (PartStatus.PENDING, PartStatus.FAILED)
+
+
+class SessionStatus(Enum):
+    INITIALIZED = "initialized"
+    DOWNLOADING = "downloading"
+    PAUSED = "paused"
+    COMPLETED = "completed"
+    PARTIALLY_COMPLETED = "partially_completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+def iso_or_none(value):
+    """ISO 8601 text for an optional datetime, as stored in JSON and SQLite."""
+    return value.isoformat() if value else None
+
+
+def datetime_or_none(value):
+    """Inverse of iso_or_none()."""
+    return datetime.fromisoformat(value) if value else None
+
+
+class TimestampField:
+    """Exposes a float epoch slot as an Optional[datetime] attribute."""
+
+    def __init__(self, slot):
+        self.slot = slot
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        timestamp = getattr(instance, self.slot)
+        return None if timestamp is None else datetime.fromtimestamp(timestamp)
+
+    def __set__(self, instance, value):
+        setattr(instance, self.slot, None if value is None else value.timestamp())
+
+
+class DownloadPart:
+    """One file of a download session, slotted to keep large queues small."""
+
+    __slots__ = (
+        'part_number', 'filename', 'download_url', 'expected_size', '_downloaded_size', '_status', 'retry_count',
+        'local_path', 'last_attempt_ts', 'completed_ts', 'instant_speed_mb', 'speed_stats', 'last_speed_update_ts',
+        'digest', 'phase_timings', '_session', '_position',
+    )
+
+    last_attempt_at = TimestampField('last_attempt_ts')
+    completed_at = TimestampField('completed_ts')
+    last_speed_update = TimestampField('last_speed_update_ts')
+
+    def __init__(self, part_number: int, filename: str, download_url: str, expected_size: int,
+                 downloaded_size: int = 0, status: PartStatus = PartStatus.PENDING, retry_count: int = 0,
+                 local_path: Optional[str] = None, last_attempt_at: Optional[datetime] = None,
+                 completed_at: Optional[datetime] = None, instant_speed_mb: float = 0.0,
+                 speed_samples: Optional[List[float]] = None, last_speed_update: Optional[datetime] = None,
+                 digest: Optional[str] = None, phase_timings: Optional[list] = None):
+        self.part_number = part_number
+        self.filename = filename
+        self.download_url = download_url
+        self.expected_size = expected_size
+        self._session = None
+        self._position = 0
+        self._downloaded_size = downloaded_size
+        self._status = status
+        self.retry_count = retry_count
+        self.local_path = local_path
+        self.last_attempt_at = last_attempt_at
+        self.completed_at = completed_at
+        self.instant_speed_mb = instant_speed_mb
+        self.speed_stats = None
+        self.speed_samples = speed_samples
+        self.last_speed_update = last_speed_update
+        self.digest = digest
+        # One PhaseTimings per HTTP request, only while phase timing is on
+        self.phase_timings = phase_timings
+
+    def __repr__(self):
+        return (f"DownloadPart(part_number={self.part_number!r}, filename={self.filename!r}, "
+                f"status={self.status}, downloaded_size={self.downloaded_size}, "
+                f"expected_size={self.expected_size})")
+
+    # The owning session keeps running totals and a pending-part index, so
+    # byte counts and status changes are reported to it as they happen.
+
+    @property
+    def downloaded_size(self) -> int:
+        return self._downloaded_size
+
+    @downloaded_size.setter
+    def downloaded_size(self, value):
+        delta = value - self._downloaded_size
+        self._downloaded_size = value
+        if self._session is not None and delta:
+            self._session.total_downloaded_bytes += delta
+
+    @property
+    def status(self) -> PartStatus:
+        return self._status
+
+    @status.setter
+    def status(self, value):
+        self._status = value
+        if self._session is not None and value in PENDING_PART_STATUSES:
+            self._session._queue_part(self)
+
+    @property
+    def speed_samples(self) -> List[float]:
+        return self.speed_stats.samples if self.speed_stats else []
+
+    @speed_samples.setter
+    def speed_samples(self, samples):
+        # Statistics are allocated with the first sample; most parts never get one
+        self.speed_stats = SpeedStats(samples) if samples else None
+
+    def is_complete(self) -> bool:
+        return self._status in (PartStatus.COMPLETED, PartStatus.SKIPPED)
+
+    def is_resumable(self) -> bool:
+        return self.downloaded_size > 0 and self.downloaded_size < self.expected_size
+
+    def record_phase_timings(self, timings):
+        if self.phase_timings is None:
+            self.phase_timings = []
+        self.phase_timings.append(timings)
+        if len(self.phase_timings) > PHASE_TIMING_MAX_REQUESTS:
+            self.phase_timings[1].add(self.phase_timings.pop(0))
+        if self._session is not None:
+            self._session._add_phase_timings(timings)
+
+
+class DownloadSession:
+    """A queued or running download made of DownloadParts."""
+
+    __slots__ = (
+        'session_id', 'vodu_store_url', 'download_location', 'app_name', '_parts', 'total_parts',
+        'completed_parts', 'overall_progress', 'total_downloaded_bytes', 'total_expected_bytes', 'status',
+        'created_ts', 'started_ts', 'completed_ts', 'last_error', 'peak_speed_mb', 'average_speed_mb',
+        'speed_variance', 'speed_stability_score', 'job_options', 'phase_timings', '_pending', '_queued',
+    )
+
+    created_at = TimestampField('created_ts')
+    started_at = TimestampField('started_ts')
+    completed_at = TimestampField('completed_ts')
+
+    def __init__(self, session_id: str, vodu_store_url: str, download_location: str, app_name: str,
+                 parts: List[DownloadPart], total_parts: int, completed_parts: int = 0,
+                 overall_progress: float = 0.0, total_downloaded_bytes: int = 0, total_expected_bytes: int = 0,
+                 status: SessionStatus = SessionStatus.INITIALIZED, created_at: Optional[datetime] = None,
+                 started_at: Optional[datetime] = None, completed_at: Optional[datetime] = None,
+                 last_error: Optional[str] = None, peak_speed_mb: float = 0.0, average_speed_mb: float = 0.0,
+                 speed_variance: float = 0.0, speed_stability_score: float = 0.0,
+                 job_options: Optional[dict] = None):
+        self.session_id = session_id
+        self.vodu_store_url = vodu_store_url
+        self.download_location = download_location
+        self.app_name = app_name
+        self.total_parts = total_parts
+        self.completed_parts = completed_parts
+        self.overall_progress = overall_progress
+        self.total_downloaded_bytes = total_downloaded_bytes
+        self.total_expected_bytes = total_expected_bytes
+        self._parts = []
+        self.parts = parts
+        self.status = status
+        self.created_at = created_at or datetime.now()
+        self.started_at = started_at
+        self.completed_at = completed_at
+        self.last_error = last_error
+        self.peak_speed_mb = peak_speed_mb
+        self.average_speed_mb = average_speed_mb
+        self.speed_variance = speed_variance
+        self.speed_stability_score = speed_stability_score
+        self.job_options = job_options
+
+    def __repr__(self):
+        return (f"DownloadSession(session_id={self.session_id!r}, app_name={self.app_name!r}, "
+                f"status={self.status}, parts={len(self.parts)})")
+
+    @property
+    def parts(self) -> List[DownloadPart]:
+        return self._parts
+
+    @parts.setter
+    def parts(self, parts):
+        # Attaching parts is the only O(parts) step; afterwards the byte total
+        # follows downloaded_size deltas and pending parts sit in a heap
+        # keyed by list position.
+        for part in self._parts:
+            part._session = None
+        self._parts = parts
+        self._pending = []
+        self._queued = set()
+        for position, part in enumerate(parts):
+            part._session = self
+            part._position = position
+            if part.status in PENDING_PART_STATUSES:
+                self._queue_part(part)
+        self.total_downloaded_bytes = sum(part.downloaded_size for part in parts)
+        self.phase_timings = None
+        for part in parts:
+            for timings in part.phase_timings or ():
+                self._add_phase_timings(timings)
+
+    def _add_phase_timings(self, timings):
+        if self.phase_timings is None:
+            self.phase_timings = PhaseTimings()
+        self.phase_timings.add(timings)
+
+    def _queue_part(self, part):
+        if part._position not in self._queued:
+            self._queued.add(part._position)
+            heapq.heappush(self._pending, (part._position, part))
+
+    def calculate_progress(self) -> float:
+        if self.total_expected_bytes == 0:
+            return 0.0
+        self.overall_progress = (
+            self.total_downloaded_bytes / self.total_expected_bytes) * 100
+        return self.overall_progress
+
+    def get_next_pending_part(self) -> Optional[DownloadPart]:
+        # Entries whose part has since left PENDING/FAILED are dropped lazily
+        while self._pending:
+            position, part = self._pending[0]
+            if part.status in PENDING_PART_STATUSES:
+                return part
+            heapq.heappop(self._pending)
+            self._queued.discard(position)
+        return None
+
+    def mark_part_completed(self, part: DownloadPart):
+        part.status = PartStatus.COMPLETED
+        part.completed_at = datetime.now()
+        self.completed_parts += 1
+        self.calculate_progress()
+
+
+# ============================================================================
+# Speed Tracking Functions
+# ============================================================================
+
+SPEED_WINDOW_SIZE = 10
+SPEED_EWMA_ALPHA = 0.3
+
+
+class SpeedStats:
+    """
+    Streaming speed statistics for one part, updated in O(1) per sample.
+
+    Mean, variance (Welford) and peak cover the samples in a fixed-size
+    ring buffer: the oldest sample is removed as a new one arrives. The
+    EWMA rate smooths the displayed speed.
+    """
+
+    __slots__ = ('alpha', 'count', 'mean', 'm2', 'ewma', '_ring', '_head')
+
+    def __init__(self, samples=(), window=SPEED_WINDOW_SIZE, alpha=SPEED_EWMA_ALPHA):
+        self._ring = array('d', bytes(8 * window))
+        self._head = 0
+        self.alpha = alpha
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.ewma = 0.0
+        for sample in samples:
+            self.add(sample)
+
+    @property
+    def samples(self) -> List[float]:
+        window = len(self._ring)
+        return [self._ring[(self._head + i) % window] for i in range(self.count)]
+
+    def add(self, sample):
+        window = len(self._ring)
+        if self.count == window:
+            self._remove(self._ring[self._head])
+            self._head = (self._head + 1) % window
+        self._ring[(self._head + self.count) % window] = sample
+        self.count += 1
+        delta = sample - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (sample - self.mean)
+        self.ewma = sample if self.count == 1 and not self.ewma else (
+            self.alpha * sample + (1 - self.alpha) * self.ewma)
+
+    def _remove(self, sample):
+        if self.count <= 1:
+            self.count, self.mean, self.m2 = 0, 0.0, 0.0
+            return
+        self.count -= 1
+        delta = sample - self.mean
+        self.mean -= delta / self.count
+        self.m2 = max(0.0, self.m2 - delta * (sample - self.mean))
+
+    @property
+    def peak(self):
+        # Order does not matter for the maximum, and the ring only starts
+        # rotating once it is full. A handful of samples scans faster than
+        # a monotonic queue would update.
+        return max(self._ring[:self.count]) if self.count else 0.0
+
+
+def update_speed_tracking(part: DownloadPart, bytes_downloaded: int, elapsed_seconds: float):
+    if elapsed_seconds <= 0:
+        return
+    speed_mb = (bytes_downloaded / (1024 * 1024)) / elapsed_seconds
+    if part.speed_stats is None:
+        part.speed_stats = SpeedStats()
+    part.speed_stats.add(speed_mb)
+    part.instant_speed_mb = part.speed_stats.ewma
+    part.last_speed_update_ts = time.time()
+
+
+def calculate_session_metrics(session: DownloadSession):
+    if not session.parts:
+        return
+    # Merge the per-part accumulators (Chan et al.) instead of re-scanning samples
+    count, mean, m2, peak = 0, 0.0, 0.0, 0.0
+    for part in session.parts:
+        stats = part.speed_stats
+        if stats is None or not stats.count:
+            continue
+        total = count + stats.count
+        delta = stats.mean - mean
+        mean += delta * stats.count / total
+        m2 += stats.m2 + delta * delta * count * stats.count / total
+        count = total
+        peak = max(peak, stats.peak)
+    if count:
+        session.peak_speed_mb = peak
+        session.average_speed_mb = mean
+        if count > 1:
+            session.speed_variance = math.sqrt(m2 / (count - 1))
+            if session.average_speed_mb > 0:
+                cv = session.speed_variance / session.average_speed_mb
+                session.speed_stability_score = max(0.0, 1.0 - cv)
+            else:
+                session.speed_stability_score = 0.0
+        else:
+            session.speed_variance = 0.0
+            session.speed_stability_score = 1.0
+
+
+def finalize_session_status(session):
+    failed = [part for part in session.parts if part.status == PartStatus.FAILED]
+    if not failed:
+        session.status = SessionStatus.COMPLETED
+    elif len(failed) < len(session.parts):
+        session.status = SessionStatus.PARTIALLY_COMPLETED
+    else:
+        session.status = SessionStatus.FAILED
+    session.completed_at = datetime.now()
+    session.calculate_progress()
+    calculate_session_metrics(session)
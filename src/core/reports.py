@@ -0,0 +1,101 @@
+"""
+Session Reports
+JSON and CSV summaries of finished download sessions.
+"""
+
+import csv
+import io
+import json
+import os
+from datetime import datetime
+
+from .models import PHASES, PartStatus, PhaseTimings, SessionStatus, calculate_session_metrics, iso_or_none
+
+
+# When set, a JSON and a CSV report are written here for every finished session
+REPORT_DIR = os.environ.get('VODU_REPORT_DIR')
+REPORT_PART_FIELDS = (
+    'part_number', 'filename', 'status', 'expected_size', 'downloaded_size', 'retry_count',
+    'average_speed_mb', 'peak_speed_mb', 'speed_samples', 'requests',
+) + PHASES
+
+
+def part_report(part):
+    stats = part.speed_stats
+    timings = PhaseTimings.combine(part.phase_timings) if part.phase_timings else None
+    row = {
+        'part_number': part.part_number,
+        'filename': part.filename,
+        'status': part.status.value if isinstance(part.status, PartStatus) else part.status,
+        'expected_size': part.expected_size,
+        'downloaded_size': part.downloaded_size,
+        'retry_count': part.retry_count,
+        'average_speed_mb': round(stats.mean, 3) if stats else None,
+        'peak_speed_mb': round(stats.peak, 3) if stats else None,
+        'speed_samples': stats.count if stats else 0,
+    }
+    if timings is not None:
+        row['requests'] = timings.requests
+        row.update({phase: round(getattr(timings, phase), 6) for phase in PHASES})
+    else:
+        row.update(dict.fromkeys(('requests',) + PHASES))
+    return row
+
+
+def session_report(session):
+    """Summary of one session: totals, speed statistics, phase timings and a row per part."""
+    calculate_session_metrics(session)
+    elapsed = None
+    if session.started_at:
+        elapsed = ((session.completed_at or datetime.now()) - session.started_at).total_seconds()
+    return {
+        'session_id': session.session_id,
+        'app_name': session.app_name,
+        'vodu_store_url': session.vodu_store_url,
+        'status': session.status.value if isinstance(session.status, SessionStatus) else session.status,
+        'started_at': iso_or_none(session.started_at),
+        'completed_at': iso_or_none(session.completed_at),
+        'elapsed_seconds': round(elapsed, 3) if elapsed is not None else None,
+        'total_parts': len(session.parts),
+        'completed_parts': sum(1 for part in session.parts if part.is_complete()),
+        'failed_parts': sum(1 for part in session.parts if part.status == PartStatus.FAILED),
+        'total_downloaded_bytes': session.total_downloaded_bytes,
+        'total_expected_bytes': session.total_expected_bytes,
+        'retries': sum(part.retry_count for part in session.parts),
+        'throughput_mb': round(session.total_downloaded_bytes / 1024 ** 2 / elapsed, 3) if elapsed else None,
+        'average_speed_mb': round(session.average_speed_mb, 3),
+        'peak_speed_mb': round(session.peak_speed_mb, 3),
+        'speed_variance': round(session.speed_variance, 3),
+        'speed_stability_score': round(session.speed_stability_score, 3),
+        'phase_timings': session.phase_timings.to_dict() if session.phase_timings else None,
+        'parts': [part_report(part) for part in session.parts],
+    }
+
+
+def session_report_csv(session):
+    """The per-part rows of session_report() as CSV."""
+    output = io.StringIO()
+    writer = csv.DictWriter(output, fieldnames=REPORT_PART_FIELDS, lineterminator='\n')
+    writer.writeheader()
+    writer.writerows(part_report(part) for part in session.parts)
+    return output.getvalue()
+
+
+def write_session_report(session, directory):
+    """Write <session_id>_<timestamp>.json and .csv into directory and return both paths."""
+    os.makedirs(directory, exist_ok=True)
+    base = os.path.join(directory, f"{session.session_id}_{datetime.now():%Y%m%d-%H%M%S}")
+    with open(base + '.json', 'w', encoding='utf-8') as f:
+        json.dump(session_report(session), f, indent=2)
+    with open(base + '.csv', 'w', encoding='utf-8', newline='') as f:
+        f.write(session_report_csv(session))
+    return base + '.json', base + '.csv'
+
+
+def save_session_report(session):
+    if not REPORT_DIR:
+        return
+    try:
+        write_session_report(session, REPORT_DIR)
+    except OSError as e:
+        print(f"Could not write session report: {e}")
@@ -0,0 +1,153 @@
+"""
+Segment Scheduler
+Splits one file's missing byte ranges across connections, with work stealing and hedged tails.
+"""
+
+import os
+import threading
+from collections import deque
+
+from .metrics import METRICS
+from .tracing import trace_instant
+
+
+# Connections per file; 1 keeps the sequential engine
+SEGMENT_CONNECTIONS = max(1, int(os.environ.get('VODU_CONNECTIONS_PER_FILE', '1')))
+# Smallest segment: smaller files are not split, and a range is only split
+# when both halves would be at least this long
+SEGMENT_MIN_BYTES = 2 * 1024 * 1024
+# When nothing is left to split, fetch the last bytes of a lagging segment
+# on a second connection as well; 0 disables
+SEGMENT_HEDGE_BYTES = int(float(os.environ.get('VODU_HEDGE_MB', '0')) * 1024 * 1024)
+
+STOLEN_SEGMENTS = METRICS.counter('vodu_stolen_segments_total',
+                                  "Ranges split off a lagging segment for an idle connection.")
+HEDGED_SEGMENTS = METRICS.counter('vodu_hedged_segments_total',
+                                  "Segment tails fetched on a second connection.")
+
+
+class Segment:
+    """
+    One connection's share [start, end) of a file.
+
+    position is how far its data has been written. end only moves down,
+    when an idle connection steals the back half or a hedge finishes the
+    tail first; the chunk loop re-reads it after every chunk.
+    """
+
+    __slots__ = ('start', 'position', 'end', 'hedge', 'reported')
+
+    def __init__(self, start, end):
+        self.start = start
+        self.position = start
+        self.end = end
+        self.hedge = None  # the other copy of a hedged tail
+        # Offset up to which progress was reported; shared by both copies
+        # of a hedged tail so their bytes count once
+        self.reported = [start]
+
+    @property
+    def remaining(self) -> int:
+        return max(0, self.end - self.position)
+
+
+def split_ranges(ranges, parts, min_bytes=SEGMENT_MIN_BYTES):
+    """Cut [start, end) ranges into pieces of about total / parts bytes, none shorter than min_bytes."""
+    total = sum(end - start for start, end in ranges)
+    target = max(min_bytes, -(-total // parts))
+    pieces = []
+    for start, end in ranges:
+        count = max(1, (end - start) // target)
+        step = (end - start) // count
+        for i in range(count):
+            pieces.append((start + i * step, end if i == count - 1 else start + (i + 1) * step))
+    return pieces
+
+
+class SegmentScheduler:
+    """
+    Hands out the segments of one file to its connections.
+
+    The missing ranges are first cut into one segment per connection. A
+    connection that runs out of work takes the back half of the largest
+    remaining segment (work stealing), so the file does not finish at the
+    pace of its slowest connection. When no segment is worth splitting,
+    it may fetch the tail of a lagging segment a second time (hedging);
+    whichever copy gets there first ends the other.
+    """
+
+    def __init__(self, missing, connections, steal=True, hedge_bytes=0, min_bytes=SEGMENT_MIN_BYTES):
+        self.steal = steal
+        self.hedge_bytes = hedge_bytes
+        self.min_bytes = min_bytes
+        self.failure = None
+        self.content_changed = False
+        self._active = []
+        self._queue = deque(Segment(start, end) for start, end in split_ranges(missing, connections, min_bytes))
+        # Everything before the first segment is complete, so it can feed a sequential hash
+        self.first = self._queue[0] if self._queue else None
+        self._lock = threading.Lock()
+
+    def next_segment(self, done=None):
+        """Return the next segment for a connection that finished done (None at first), or None when idle."""
+        with self._lock:
+            if done is not None:
+                self._release(done)
+            if self.content_changed:
+                return None
+            segment = self._queue.popleft() if self._queue else self._split_largest() or self._hedge_tail()
+            if segment is not None:
+                self._active.append(segment)
+            return segment
+
+    def give_up(self, segment, failure):
+        """The connection failed without progress; its range is left for the next round."""
+        with self._lock:
+            self._release(segment)
+            self.failure = failure
+
+    def abort(self):
+        """The file changed on the server: stop every segment."""
+        with self._lock:
+            self.content_changed = True
+            self._queue.clear()
+            for segment in self._active:
+                segment.end = segment.position
+
+    def _release(self, segment):
+        self._active.remove(segment)
+        partner = segment.hedge
+        if partner is not None:
+            partner.hedge = None
+            if segment.position >= segment.end:
+                # This copy reached the end first; the other one stops
+                partner.end = min(partner.end, partner.position)
+
+    def _split_largest(self):
+        if not self.steal:
+            return None
+        candidates = [segment for segment in self._active if segment.hedge is None]
+        victim = max(candidates, key=lambda segment: segment.remaining, default=None)
+        if victim is None or victim.remaining < 2 * self.min_bytes:
+            return None
+        middle = victim.position + victim.remaining // 2
+        stolen = Segment(middle, victim.end)
+        victim.end = middle
+        STOLEN_SEGMENTS.inc()
+        trace_instant('steal', 'segment', start=middle, end=stolen.end)
+        return stolen
+
+    def _hedge_tail(self):
+        if not self.hedge_bytes:
+            return None
+        candidates = [segment for segment in self._active
+                      if segment.hedge is None and 0 < segment.remaining <= self.hedge_bytes]
+        lagging = max(candidates, key=lambda segment: segment.remaining, default=None)
+        if lagging is None:
+            return None
+        hedge = Segment(lagging.position, lagging.end)
+        hedge.hedge, lagging.hedge = lagging, hedge
+        hedge.reported = lagging.reported
+        HEDGED_SEGMENTS.inc()
+        trace_instant('hedge', 'segment', start=hedge.start, end=hedge.end)
+        return hedge
@@ -0,0 +1,414 @@
+"""
+SQLite Session Store
+Serialization of download sessions and their persistence in a local SQLite database.
+"""
+
+import contextlib
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+from .models import (
+    DownloadPart, DownloadSession, PartStatus, PhaseTimings, SessionStatus, datetime_or_none, iso_or_none,
+)
+
+
+# ============================================================================
+# Session Serialization
+# ============================================================================
+
+def get_resume_state_path():
+    home_dir = os.path.expanduser("~")
+    vodu_dir = os.path.join(home_dir, ".vodu_downloader")
+    os.makedirs(vodu_dir, exist_ok=True)
+    return os.path.join(vodu_dir, "resume_state.json")
+
+
+def part_to_dict(part):
+    return {
+        'part_number': part.part_number,
+        'filename': part.filename,
+        'download_url': part.download_url,
+        'expected_size': part.expected_size,
+        'downloaded_size': part.downloaded_size,
+        'status': part.status.value if isinstance(part.status, PartStatus) else part.status,
+        'retry_count': part.retry_count,
+        'local_path': part.local_path,
+        'last_attempt_at': iso_or_none(part.last_attempt_at),
+        'completed_at': iso_or_none(part.completed_at),
+        'instant_speed_mb': part.instant_speed_mb,
+        'speed_samples': list(part.speed_samples),
+        'last_speed_update': iso_or_none(part.last_speed_update),
+        'digest': part.digest,
+        'phase_timings': [timings.to_dict() for timings in part.phase_timings] if part.phase_timings else None,
+    }
+
+
+def part_from_dict(part_dict):
+    return DownloadPart(
+        part_number=part_dict['part_number'],
+        filename=part_dict['filename'],
+        download_url=part_dict['download_url'],
+        expected_size=part_dict['expected_size'],
+        downloaded_size=part_dict.get('downloaded_size', 0),
+        status=PartStatus(part_dict.get('status', 'pending')),
+        retry_count=part_dict.get('retry_count', 0),
+        local_path=part_dict.get('local_path'),
+        last_attempt_at=datetime_or_none(part_dict.get('last_attempt_at')),
+        completed_at=datetime_or_none(part_dict.get('completed_at')),
+        instant_speed_mb=part_dict.get('instant_speed_mb', 0.0),
+        speed_samples=part_dict.get('speed_samples', []),
+        last_speed_update=datetime_or_none(part_dict.get('last_speed_update')),
+        digest=part_dict.get('digest'),
+        phase_timings=[PhaseTimings.from_dict(t) for t in part_dict['phase_timings']]
+        if part_dict.get('phase_timings') else None
+    )
+
+
+def session_to_dict(session, include_parts=True):
+    session_dict = {
+        'session_id': session.session_id,
+        'vodu_store_url': session.vodu_store_url,
+        'download_location': session.download_location,
+        'app_name': session.app_name,
+        'total_parts': session.total_parts,
+        'completed_parts': session.completed_parts,
+        'overall_progress': session.overall_progress,
+        'total_downloaded_bytes': session.total_downloaded_bytes,
+        'total_expected_bytes': session.total_expected_bytes,
+        'status': session.status.value if isinstance(session.status, SessionStatus) else session.status,
+        'created_at': iso_or_none(session.created_at),
+        'started_at': iso_or_none(session.started_at),
+        'completed_at': iso_or_none(session.completed_at),
+        'last_error': session.last_error,
+        'peak_speed_mb': session.peak_speed_mb,
+        'average_speed_mb': session.average_speed_mb,
+        'speed_variance': session.speed_variance,
+        'speed_stability_score': session.speed_stability_score,
+        'job_options': session.job_options,
+        'phase_timings': session.phase_timings.to_dict() if session.phase_timings else None,
+    }
+    if include_parts:
+        session_dict['parts'] = [part_to_dict(part) for part in session.parts]
+    return session_dict
+
+
+def session_from_dict(session_dict):
+    session = DownloadSession(
+        session_id=session_dict['session_id'],
+        vodu_store_url=session_dict['vodu_store_url'],
+        download_location=session_dict['download_location'],
+        app_name=session_dict.get('app_name') or session_dict['session_id'],
+        parts=[],
+        total_parts=session_dict.get('total_parts', 0),
+        completed_parts=session_dict.get('completed_parts', 0),
+        overall_progress=session_dict.get('overall_progress', 0.0),
+        total_downloaded_bytes=session_dict.get('total_downloaded_bytes', 0),
+        total_expected_bytes=session_dict.get('total_expected_bytes', 0),
+        status=SessionStatus(session_dict.get('status', 'initialized')),
+        created_at=datetime_or_none(session_dict.get('created_at')) or datetime.now(),
+        started_at=datetime_or_none(session_dict.get('started_at')),
+        completed_at=datetime_or_none(session_dict.get('completed_at')),
+        last_error=session_dict.get('last_error'),
+        peak_speed_mb=session_dict.get('peak_speed_mb', 0.0),
+        average_speed_mb=session_dict.get('average_speed_mb', 0.0),
+        speed_variance=session_dict.get('speed_variance', 0.0),
+        speed_stability_score=session_dict.get('speed_stability_score', 0.0),
+        job_options=session_dict.get('job_options')
+    )
+    session.parts = [part_from_dict(part_dict) for part_dict in session_dict.get('parts', [])]
+    return session
+
+
+def load_legacy_resume_state(json_path):
+    try:
+        with open(json_path, 'r') as f:
+            data = json.load(f)
+        version = data.get('version', '1.0')
+        return [session_from_dict(session_dict) for session_dict in data.get('sessions', [])]
+    except (FileNotFoundError, json.JSONDecodeError):
+        return []
+
+
+# ============================================================================
+# SQLite Session Store
+# ============================================================================
+
+SESSION_COLUMNS = (
+    'session_id', 'vodu_store_url', 'download_location', 'app_name', 'total_parts', 'completed_parts',
+    'overall_progress', 'total_downloaded_bytes', 'total_expected_bytes', 'status', 'created_at',
+    'started_at', 'completed_at', 'last_error', 'peak_speed_mb', 'average_speed_mb', 'speed_variance',
+    'speed_stability_score', 'job_options',
+)
+
+PART_COLUMNS = (
+    'part_number', 'filename', 'download_url', 'expected_size', 'downloaded_size', 'status', 'retry_count',
+    'local_path', 'last_attempt_at', 'completed_at', 'instant_speed_mb', 'speed_samples', 'last_speed_update',
+    'digest', 'phase_timings',
+)
+
+# Each entry upgrades the schema by one version (PRAGMA user_version)
+SESSION_STORE_MIGRATIONS = [
+    """
+    CREATE TABLE IF NOT EXISTS sessions (
+        session_id TEXT PRIMARY KEY,
+        vodu_store_url TEXT NOT NULL,
+        download_location TEXT NOT NULL,
+        app_name TEXT,
+        total_parts INTEGER NOT NULL DEFAULT 0,
+        completed_parts INTEGER NOT NULL DEFAULT 0,
+        overall_progress REAL NOT NULL DEFAULT 0,
+        total_downloaded_bytes INTEGER NOT NULL DEFAULT 0,
+        total_expected_bytes INTEGER NOT NULL DEFAULT 0,
+        status TEXT NOT NULL,
+        created_at TEXT,
+        started_at TEXT,
+        completed_at TEXT,
+        last_error TEXT,
+        peak_speed_mb REAL NOT NULL DEFAULT 0,
+        average_speed_mb REAL NOT NULL DEFAULT 0,
+        speed_variance REAL NOT NULL DEFAULT 0,
+        speed_stability_score REAL NOT NULL DEFAULT 0,
+        job_options TEXT
+    );
+    CREATE INDEX IF NOT EXISTS idx_sessions_url ON sessions (vodu_store_url, download_location);
+    CREATE TABLE IF NOT EXISTS parts (
+        session_id TEXT NOT NULL REFERENCES sessions (session_id) ON DELETE CASCADE,
+        part_number INTEGER NOT NULL,
+        filename TEXT NOT NULL,
+        download_url TEXT NOT NULL,
+        expected_size INTEGER NOT NULL DEFAULT 0,
+        downloaded_size INTEGER NOT NULL DEFAULT 0,
+        status TEXT NOT NULL,
+        retry_count INTEGER NOT NULL DEFAULT 0,
+        local_path TEXT,
+        last_attempt_at TEXT,
+        completed_at TEXT,
+        instant_speed_mb REAL NOT NULL DEFAULT 0,
+        speed_samples TEXT,
+        last_speed_update TEXT,
+        PRIMARY KEY (session_id, part_number)
+    );
+    CREATE INDEX IF NOT EXISTS idx_parts_url ON parts (download_url);
+    CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+    """,
+    """
+    ALTER TABLE parts ADD COLUMN digest TEXT;
+    """,
+    """
+    ALTER TABLE parts ADD COLUMN phase_timings TEXT;
+    """,
+]
+
+
+def get_session_store_path():
+    return os.path.join(os.path.dirname(get_resume_state_path()), "sessions.db")
+
+
+def _upsert_sql(table, columns, key_columns):
+    updates = ", ".join(f"{c} = excluded.{c}" for c in columns if c not in key_columns)
+    return (f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))}) "
+            f"ON CONFLICT ({', '.join(key_columns)}) DO UPDATE SET {updates}")
+
+
+class SessionStore:
+    """
+    WAL-mode SQLite store for download sessions.
+
+    Checkpoints touch one session row and at most one part row, so their
+    cost does not grow with the number of stored sessions or parts.
+    """
+
+    def __init__(self, db_path=None, legacy_json_path=None):
+        self.db_path = db_path or get_session_store_path()
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None, timeout=10)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("PRAGMA synchronous = NORMAL")
+        self._conn.execute("PRAGMA foreign_keys = ON")
+        self._session_upsert = _upsert_sql('sessions', SESSION_COLUMNS, ('session_id',))
+        self._part_upsert = _upsert_sql('parts', ('session_id',) + PART_COLUMNS, ('session_id', 'part_number'))
+        self._apply_migrations()
+        self._migrate_legacy_json(legacy_json_path or get_resume_state_path())
+
+    @contextlib.contextmanager
+    def _transaction(self):
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def _apply_migrations(self):
+        with self._lock:
+            version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+            for target, script in enumerate(SESSION_STORE_MIGRATIONS[version:], version + 1):
+                self._conn.executescript(f"BEGIN; {script}; PRAGMA user_version = {target}; COMMIT;")
+
+    def _migrate_legacy_json(self, json_path):
+        if self._get_meta('legacy_json_migrated') or not os.path.exists(json_path):
+            return
+        sessions = load_legacy_resume_state(json_path)
+        with self._transaction() as conn:
+            for session in sessions:
+                self._write_session(conn, session, include_parts=True)
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('legacy_json_migrated', ?)",
+                         (datetime.now().isoformat(),))
+        os.replace(json_path, json_path + '.migrated')
+
+    def _get_meta(self, key):
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row['value'] if row else None
+
+    # ------------------------------------------------------------------
+    # Row conversion
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _session_row(session):
+        session_dict = session_to_dict(session, include_parts=False)
+        if session_dict['job_options'] is not None:
+            session_dict['job_options'] = json.dumps(session_dict['job_options'])
+        return tuple(session_dict[c] for c in SESSION_COLUMNS)
+
+    @staticmethod
+    def _part_row(session_id, part):
+        part_dict = part_to_dict(part)
+        part_dict['speed_samples'] = json.dumps(list(part_dict['speed_samples'] or []))
+        if part_dict['phase_timings'] is not None:
+            part_dict['phase_timings'] = json.dumps(part_dict['phase_timings'])
+        return (session_id,) + tuple(part_dict[c] for c in PART_COLUMNS)
+
+    @staticmethod
+    def _part_from_row(row):
+        part_dict = dict(row)
+        part_dict['speed_samples'] = json.loads(part_dict['speed_samples'] or '[]')
+        if part_dict.get('phase_timings'):
+            part_dict['phase_timings'] = json.loads(part_dict['phase_timings'])
+        return part_from_dict(part_dict)
+
+    def _session_from_row(self, row):
+        session_dict = dict(row)
+        if session_dict['job_options']:
+            session_dict['job_options'] = json.loads(session_dict['job_options'])
+        session = session_from_dict(session_dict)
+        rows = self._conn.execute("SELECT * FROM parts WHERE session_id = ? ORDER BY part_number",
+                                  (session.session_id,)).fetchall()
+        session.parts = [self._part_from_row(part_row) for part_row in rows]
+        return session
+
+    def _write_session(self, conn, session, include_parts):
+        conn.execute(self._session_upsert, self._session_row(session))
+        if include_parts:
+            conn.execute("DELETE FROM parts WHERE session_id = ?", (session.session_id,))
+            conn.executemany(self._part_upsert, [self._part_row(session.session_id, p) for p in session.parts])
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def save_session(self, session, include_parts=True):
+        with self._transaction() as conn:
+            self._write_session(conn, session, include_parts)
+
+    def checkpoint(self, session, part=None):
+        """Persist session counters and, optionally, a single part row."""
+        with self._transaction() as conn:
+            conn.execute(self._session_upsert, self._session_row(session))
+            if part is not None:
+                conn.execute(self._part_upsert, self._part_row(session.session_id, part))
+
+    def save_part(self, session_id, part):
+        with self._transaction() as conn:
+            conn.execute(self._part_upsert, self._part_row(session_id, part))
+
+    def load_session(self, session_id):
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM sessions WHERE session_id = ?", (session_id,)).fetchone()
+            return self._session_from_row(row) if row else None
+
+    def load_sessions(self, statuses=None):
+        query = "SELECT * FROM sessions"
+        params = ()
+        if statuses:
+            query += f" WHERE status IN ({', '.join('?' * len(statuses))})"
+            params = tuple(s.value for s in statuses)
+        with self._lock:
+            rows = self._conn.execute(query + " ORDER BY created_at, rowid", params).fetchall()
+            return [self._session_from_row(row) for row in rows]
+
+    def find_sessions_by_url(self, vodu_store_url, download_location=None):
+        query = "SELECT * FROM sessions WHERE vodu_store_url = ?"
+        params = (vodu_store_url,)
+        if download_location is not None:
+            query += " AND download_location = ?"
+            params += (download_location,)
+        with self._lock:
+            rows = self._conn.execute(query + " ORDER BY created_at", params).fetchall()
+            return [self._session_from_row(row) for row in rows]
+
+    def find_part_by_url(self, download_url):
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM parts WHERE download_url = ? ORDER BY rowid DESC LIMIT 1",
+                                     (download_url,)).fetchone()
+        return (row['session_id'], self._part_from_row(row)) if row else (None, None)
+
+    def delete_session(self, session_id):
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_session_store = None
+_session_store_lock = threading.Lock()
+
+
+def get_session_store():
+    """Get the shared session store, creating (and migrating) it on first use."""
+    global _session_store
+    with _session_store_lock:
+        if _session_store is None:
+            _session_store = SessionStore()
+        return _session_store
+
+
+def open_session_store():
+    try:
+        return get_session_store()
+    except (sqlite3.Error, OSError) as e:
+        print(f"[WARN] Session store unavailable, progress will not be saved: {e}")
+        return None
+
+
+def make_session_id(vodu_store_url, download_location):
+    return hashlib.sha1(f"{vodu_store_url}|{download_location}".encode('utf-8')).hexdigest()[:12]
+
+
+def load_resume_state():
+    return get_session_store().load_sessions()
+
+
+def save_resume_state(sessions):
+    store = get_session_store()
+    for session in sessions:
+        store.save_session(session)
+
+
+def recall_part_digest(store, part):
+    # Reuse the digest of an earlier download of the same URL and size
+    if store is None or part.digest:
+        return
+    _, previous = store.find_part_by_url(part.download_url)
+    if previous and previous.digest and previous.expected_size == part.expected_size:
+        part.digest = previous.digest
@@ -0,0 +1,119 @@
+"""
+Trace Recording
+Spans and instants from every thread, saved as a Chrome trace-event file.
+"""
+
+import atexit
+import contextlib
+import functools
+import json
+import os
+import threading
+import time
+
+
+# When VODU_TRACE names a file, spans from every thread are collected and
+# written there as a Chrome trace, to open in Perfetto or chrome://tracing
+TRACE_PATH = os.environ.get('VODU_TRACE')
+TRACE_MAX_EVENTS = 1_000_000
+
+
+class TraceRecorder:
+    """
+    Trace events collected from any thread.
+
+    Timestamps are time.perf_counter() readings, so spans that phase timing
+    already measured are recorded without reading the clock again. Events
+    beyond max_events are counted and dropped.
+    """
+
+    def __init__(self, max_events=TRACE_MAX_EVENTS):
+        self.max_events = max_events
+        self.dropped = 0
+        self._events = []
+        self._threads = {}
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+        self._pid = os.getpid()
+
+    def _add(self, event):
+        thread = threading.current_thread()
+        event['pid'] = self._pid
+        event['tid'] = thread.ident
+        with self._lock:
+            if len(self._events) >= self.max_events:
+                self.dropped += 1
+                return
+            self._threads[thread.ident] = thread.name
+            self._events.append(event)
+
+    def _microseconds(self, perf_time):
+        return round((perf_time - self._origin) * 1e6, 1)
+
+    def complete(self, name, category, started, ended, **args):
+        """Record a span between two time.perf_counter() readings."""
+        self._add({'name': name, 'cat': category, 'ph': 'X', 'ts': self._microseconds(started),
+                   'dur': round((ended - started) * 1e6, 1), 'args': args})
+
+    def instant(self, name, category, **args):
+        self._add({'name': name, 'cat': category, 'ph': 'i', 's': 't',
+                   'ts': self._microseconds(time.perf_counter()), 'args': args})
+
+    @contextlib.contextmanager
+    def span(self, name, category, **args):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.complete(name, category, started, time.perf_counter(), **args)
+
+    def save(self, path):
+        """Write everything recorded so far; the file is replaced, never left half written."""
+        with self._lock:
+            events = list(self._events)
+            threads = dict(self._threads)
+            dropped = self.dropped
+        metadata = [{'name': 'thread_name', 'ph': 'M', 'pid': self._pid, 'tid': tid, 'args': {'name': name}}
+                    for tid, name in threads.items()]
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        temp_path = path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': metadata + events, 'displayTimeUnit': 'ms',
+                       'otherData': {'dropped_events': dropped}}, f)
+        os.replace(temp_path, path)
+
+
+TRACE = TraceRecorder() if TRACE_PATH else None
+
+
+def traced(category):
+    """Record every call of the decorated function as a span; returns it unchanged while tracing is off."""
+    def decorate(func):
+        if TRACE is None:
+            return func
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with TRACE.span(func.__name__, category):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def trace_instant(name, category, **args):
+    if TRACE is not None:
+        TRACE.instant(name, category, **args)
+
+
+def save_trace():
+    if TRACE is None:
+        return
+    try:
+        TRACE.save(TRACE_PATH)
+    except OSError as e:
+        print(f"Could not write trace: {e}")
+
+
+if TRACE is not None:
+    atexit.register(save_trace)
@@ -1,10 +1,13 @@
 """
 Animation Utilities for iOS-Style GUI
-Provides smooth, 60fps animations for UI elements using the after() method.
+Provides smooth, 60fps animations for UI elements, all driven by one shared frame ticker.
 """
 
+import itertools
+import math
 import time
-from typing import Callable, Optional
+import tkinter as tk
+from typing import Callable, Dict, List, Optional
 import customtkinter as ctk
 
 
@@ -27,23 +30,76 @@ def ease_in(t: float) -> float:
     return t * t * t
 
 
+# Samples per easing table; a 350ms transition at 60fps uses about 21 frames
+EASING_TABLE_SIZE = 256
+
+_easing_tables: Dict[Callable[[float], float], List[float]] = {}
+
+
+def easing_table(easing_func: Callable[[float], float]) -> List[float]:
+    """Return easing_func sampled at EASING_TABLE_SIZE points, computed once per function."""
+    table = _easing_tables.get(easing_func)
+    if table is None:
+        last = EASING_TABLE_SIZE - 1
+        table = [easing_func(i / last) for i in range(EASING_TABLE_SIZE)]
+        _easing_tables[easing_func] = table
+    return table
+
+
 # ============================================================================
 # Animation Manager
 # ============================================================================
 
+class _Animation:
+    """One running animation or pending timer."""
+
+    __slots__ = ('start', 'duration', 'update', 'complete', 'table', 'due')
+
+    def __init__(self, start, duration, update, complete, table, due):
+        self.start = start
+        self.duration = duration
+        self.update = update
+        self.complete = complete
+        self.table = table
+        self.due = due
+
+
 class AnimationManager:
-    """Manages multiple animations and ensures smooth 60fps playback."""
+    """
+    Drives every animation from one frame ticker.
+
+    Each frame advances all running animations in a single after()
+    callback. Timers (delayed calls and repeating effects such as
+    pulses) share the same callback, which sleeps until the next one is
+    due when nothing is moving. With no animations and no timers
+    nothing is scheduled at all, so an idle window costs no CPU.
+    """
 
     def __init__(self, fps: int = 60):
         self.fps = fps
         self.frame_time = 1000 // fps  # ms per frame
-        self.active_animations = []
+        self._animations: Dict[str, _Animation] = {}
+        self._ids = itertools.count(1)
+        self._root = None
+        self._after_id = None
+        self._scheduled_at = None
+        self._suspended = False
+
+    @property
+    def active_animations(self) -> List[str]:
+        """IDs of the animations and timers that are still pending."""
+        return list(self._animations)
+
+    def attach(self, root):
+        """Use root's after() for the ticker instead of the first animated widget's toplevel."""
+        self._root = root
 
     def animate(self,
                 duration_ms: int,
                 update_func: Callable[[float], bool],
                 complete_func: Optional[Callable[[], None]] = None,
-                easing_func: Callable[[float], float] = ease_in_out) -> str:
+                easing_func: Callable[[float], float] = ease_in_out,
+                widget=None) -> str:
         """
         Start a new animation.
 
@@ -52,36 +108,130 @@ class AnimationManager:
             update_func: Callback that receives progress (0.0-1.0) and returns True to continue
             complete_func: Callback when animation completes
             easing_func: Easing function to use
+            widget: Any widget of the window (used to find the Tk root)
 
         Returns:
             Animation ID string
         """
-        animation_id = f"anim_{id(update_func)}_{time.time()}"
+        animation = _Animation(time.monotonic(), max(duration_ms, 1) / 1000, update_func, complete_func,
+                               easing_table(easing_func), None)
+        return self._add(animation, widget)
+
+    def after(self, delay_ms: int, func: Callable[[], None], widget=None) -> str:
+        """Call func once after delay_ms. The returned ID can be cancelled."""
+        now = time.monotonic()
+        return self._add(_Animation(now, None, None, func, None, now + delay_ms / 1000), widget)
+
+    def every(self, interval_ms: int, func: Callable[[], bool], widget=None) -> str:
+        """Call func every interval_ms until it returns False or the ID is cancelled."""
+        now = time.monotonic()
+        return self._add(_Animation(now, interval_ms / 1000, func, None, None, now + interval_ms / 1000), widget)
+
+    def cancel(self, animation_id: Optional[str]):
+        """Stop an animation or timer without calling its complete callback."""
+        self._animations.pop(animation_id, None)
+        if not self._animations:
+            self._unschedule()
 
-        def animation_loop(start_time: float, widget: ctk.CTk):
-            elapsed = time.time() - start_time
-            progress = min(elapsed / (duration_ms / 1000), 1.0)
-            eased_progress = easing_func(progress)
+    def cancel_all(self):
+        """Cancel all active animations."""
+        self._animations.clear()
+        self._unschedule()
+
+    def is_idle(self) -> bool:
+        return not self._animations
+
+    def suspend(self):
+        """Stop ticking while the window cannot be seen; animations keep their start times."""
+        self._suspended = True
+        self._unschedule()
+
+    def resume(self):
+        """Tick again; animations that ran out while suspended finish on the next frame."""
+        if self._suspended:
+            self._suspended = False
+            self._schedule()
+
+    def _add(self, animation: _Animation, widget) -> str:
+        animation_id = f"anim_{next(self._ids)}"
+        if self._root is None or not self._root_exists():
+            self._root = widget.winfo_toplevel() if widget is not None else tk._default_root
+        self._animations[animation_id] = animation
+        self._schedule()
+        return animation_id
 
-            # Call update function
-            should_continue = update_func(eased_progress)
+    def _root_exists(self) -> bool:
+        try:
+            return bool(self._root.winfo_exists())
+        except tk.TclError:
+            return False
 
-            if progress < 1.0 and should_continue:
-                widget.after(self.frame_time, lambda: animation_loop(start_time, widget))
-            else:
-                # Animation complete
-                if complete_func:
-                    complete_func()
-                if animation_id in self.active_animations:
-                    self.active_animations.remove(animation_id)
-
-        self.active_animations.append(animation_id)
-        # Start animation on next frame
-        return animation_id
+    def _schedule(self):
+        """Make sure the ticker fires in time for the next frame or timer."""
+        if self._suspended or not self._animations or self._root is None:
+            return
+        now = time.monotonic()
+        if any(a.due is None for a in self._animations.values()):
+            fire_at = now + self.frame_time / 1000
+        else:
+            fire_at = min(a.due for a in self._animations.values())
+        if self._after_id is not None:
+            if self._scheduled_at <= fire_at:
+                return
+            self._root.after_cancel(self._after_id)
+        # Round up: firing a millisecond early would only reschedule
+        delay_ms = max(0, math.ceil((fire_at - now) * 1000))
+        self._scheduled_at = fire_at
+        try:
+            self._after_id = self._root.after(delay_ms, self._tick)
+        except tk.TclError:
+            # The window is gone: nothing left to animate
+            self._after_id = None
+            self._animations.clear()
+
+    def _unschedule(self):
+        if self._after_id is not None:
+            try:
+                self._root.after_cancel(self._after_id)
+            except tk.TclError:
+                pass
+            self._after_id = None
+
+    def _tick(self):
+        """Advance every animation and fire every due timer in one callback."""
+        self._after_id = None
+        now = time.monotonic()
+        for animation_id, animation in list(self._animations.items()):
+            if self._animations.get(animation_id) is not animation:
+                continue  # Cancelled by an earlier callback in this frame
+            try:
+                finished = self._step(animation, now)
+            except Exception as e:
+                print(f"Animation failed: {e}")
+                finished = True
+                animation.complete = None
+            if finished:
+                self._animations.pop(animation_id, None)
+                if animation.complete:
+                    animation.complete()
+        self._schedule()
 
-    def cancel_all(self):
-        """Cancel all active animations."""
-        self.active_animations.clear()
+    @staticmethod
+    def _step(animation: _Animation, now: float) -> bool:
+        """Run one frame of an animation or timer; return True when it is finished."""
+        if animation.due is None:
+            progress = min((now - animation.start) / animation.duration, 1.0)
+            table = animation.table
+            should_continue = animation.update(table[int(progress * (len(table) - 1) + 0.5)])
+            return progress >= 1.0 or not should_continue
+        if now < animation.due:
+            return False
+        if animation.update is None:
+            return True  # One-shot timer; complete runs the callback
+        if animation.update() is False:
+            return True
+        animation.due = max(animation.due + animation.duration, now)
+        return False
 
 
 # Global animation manager instance
@@ -122,7 +272,7 @@ class FadeAnimation:
             widget.pack()
 
         if complete_func:
-            widget.after(duration_ms, complete_func)
+            return get_animation_manager().after(duration_ms, complete_func, widget)
 
         return "fade_in"
 
@@ -131,11 +281,10 @@ class FadeAnimation:
                  complete_func: Optional[Callable[[], None]] = None) -> str:
         """Fade out a widget and hide it."""
         # Simple implementation - just hide after delay
-        widget.after(duration_ms, lambda: (
+        return get_animation_manager().after(duration_ms, lambda: (
             widget.grid_remove() if widget.winfo_ismapped() else widget.pack_forget(),
             complete_func() if complete_func else None
-        ))
-        return "fade_out"
+        ), widget)
 
 
 class SlideAnimation:
@@ -151,7 +300,6 @@ class SlideAnimation:
 
         start_x = 1.0
         target_x = 0.5
-        start_time = time.time()
 
         def update(progress: float) -> bool:
             current_x = start_x + (target_x - start_x) * progress
@@ -159,7 +307,7 @@ class SlideAnimation:
             return True
 
         manager = get_animation_manager()
-        return manager.animate(duration_ms, update, complete_func, ease_out)
+        return manager.animate(duration_ms, update, complete_func, ease_out, widget)
 
     @staticmethod
     def slide_in_from_left(widget: ctk.CTk, container: ctk.CTk,
@@ -171,7 +319,6 @@ class SlideAnimation:
 
         start_x = 0.0
         target_x = 0.5
-        start_time = time.time()
 
         def update(progress: float) -> bool:
             current_x = start_x + (target_x - start_x) * progress
@@ -179,7 +326,7 @@ class SlideAnimation:
             return True
 
         manager = get_animation_manager()
-        return manager.animate(duration_ms, update, complete_func, ease_out)
+        return manager.animate(duration_ms, update, complete_func, ease_out, widget)
 
 
 class ScaleAnimation:
@@ -220,23 +367,23 @@ class PulseAnimation:
 
     def start(self, duration_ms: int = 1000):
         """Start pulsing animation."""
-        self.is_running = True
-        self._pulse_loop(duration_ms)
-
-    def _pulse_loop(self, duration_ms: int):
-        if not self.is_running:
+        if self.is_running:
             return
+        self.is_running = True
+        self.animation_id = get_animation_manager().every(duration_ms // 2, self._pulse, self.widget)
 
+    def _pulse(self):
         # Toggle between two states
         current_fg = self.widget.cget('fg_color')
         target_color = '#2c2c2e' if current_fg == '#1c1c1e' else '#1c1c1e'
 
         self.widget.configure(fg_color=target_color)
-        self.widget.after(duration_ms // 2, lambda: self._pulse_loop(duration_ms))
 
     def stop(self):
         """Stop pulsing animation."""
         self.is_running = False
+        get_animation_manager().cancel(self.animation_id)
+        self.animation_id = None
 
 
 # ============================================================================
@@ -251,6 +398,10 @@ class AnimatedProgress:
         self.current_value = 0.0
         self.target_value = 0.0
         self.is_animating = False
+        self._animation_id = None
+        self._items = None
+        self._size = None
+        self._drawn = (None, None, None)
 
     def set_value(self, value: float, animated: bool = True):
         """
@@ -263,34 +414,33 @@ class AnimatedProgress:
         self.target_value = max(0, min(100, value))
 
         if not animated:
+            get_animation_manager().cancel(self._animation_id)
+            self.is_animating = False
             self.current_value = self.target_value
             self._update_display()
-        elif not self.is_animating:
+        else:
             self._animate_progress()
 
     def _animate_progress(self):
-        """Animate progress bar to target value."""
+        """Animate progress bar to target value, starting over from wherever it is now."""
+        manager = get_animation_manager()
+        manager.cancel(self._animation_id)
         self.is_animating = True
 
         start_value = self.current_value
         difference = self.target_value - start_value
         duration = 300  # ms
-        start_time = time.time()
 
-        def update():
-            nonlocal start_time
-            elapsed = time.time() - start_time
-            progress = min(elapsed / (duration / 1000), 1.0)
-
-            self.current_value = start_value + difference * ease_out(progress)
+        def update(progress: float) -> bool:
+            self.current_value = start_value + difference * progress
             self._update_display()
+            return True
 
-            if progress < 1.0:
-                self.canvas.after(16, update)  # ~60fps
-            else:
-                self.is_animating = False
+        def complete():
+            self.is_animating = False
+            self._animation_id = None
 
-        update()
+        self._animation_id = manager.animate(duration, update, complete, ease_out, self.canvas)
 
     def _update_display(self):
         """Update the visual display of progress."""
@@ -302,39 +452,61 @@ class AnimatedProgress:
         if width <= 1:  # Canvas not yet rendered
             return
 
-        fill_width = (width - 4) * (self.current_value / 100)
+        if self._items is None:
+            self._create_items(width, height)
+        elif self._size != (width, height):
+            # Resized: move the items instead of rebuilding them
+            self.canvas.coords(self._items[0], 2, 2, width - 2, height - 2)
+            self.canvas.coords(self._items[2], width / 2, height / 2)
+            self._size = (width, height)
+            self._drawn = (None, None, None)
+
+        _, fill_item, text_item = self._items
+        fill_width = round((width - 4) * (self.current_value / 100))
+        if fill_width <= 2:
+            fill_width = None
         color = get_progress_color(self.current_value)
+        text = f"{self.current_value:.1f}%"
+        drawn_width, drawn_color, drawn_text = self._drawn
 
-        # Clear previous drawing
-        self.canvas.delete("all")
-
-        # Draw background
-        self.canvas.create_rectangle(
+        if fill_width != drawn_width:
+            if fill_width is None:
+                self.canvas.itemconfigure(fill_item, state='hidden')
+            else:
+                self.canvas.coords(fill_item, 2, 2, fill_width, height - 2)
+                if drawn_width is None:
+                    self.canvas.itemconfigure(fill_item, state='normal')
+        if color != drawn_color:
+            self.canvas.itemconfigure(fill_item, fill=color)
+        if text != drawn_text:
+            self.canvas.itemconfigure(text_item, text=text)
+        self._drawn = (fill_width, color, text)
+
+    def _create_items(self, width: int, height: int):
+        """Create the background, fill and text items once."""
+        bg_item = self.canvas.create_rectangle(
             2, 2, width - 2, height - 2,
             fill='#1a1a1a',
             outline='#333333',
             width=2,
             tags="progress_bg"
         )
-
-        # Draw progress fill
-        if fill_width > 2:
-            self.canvas.create_rectangle(
-                2, 2, fill_width, height - 2,
-                fill=color,
-                outline="",
-                width=0,
-                tags="progress_fill"
-            )
-
-        # Draw percentage text
-        self.canvas.create_text(
+        fill_item = self.canvas.create_rectangle(
+            2, 2, 2, height - 2,
+            outline="",
+            width=0,
+            state='hidden',
+            tags="progress_fill"
+        )
+        text_item = self.canvas.create_text(
             width / 2, height / 2,
-            text=f"{self.current_value:.1f}%",
+            text="",
             fill='#ffffff',
             font=('Segoe UI', 10, 'bold'),
             tags="progress_text"
         )
+        self._items = (bg_item, fill_item, text_item)
+        self._size = (width, height)
 
 
 # ============================================================================
@@ -3,14 +3,30 @@ Main Vodu Downloader Application
 iOS-style GUI with smooth animations and modern design.
 """
 
+import os
+import time
 import tkinter as tk
 from tkinter import filedialog, messagebox
 import customtkinter as ctk
 from typing import Optional, Callable
 
 from .styles import COLORS, FONTS, SPACING, CORNER_RADIUS, configure_ctk_theme
-from .widgets import GlassCard, SmoothProgressBar, StatusLabel, SegmentedControl
-from .pages import MoviesPage, AppsPage
+from .widgets import GlassCard, SmoothProgressBar, StatusLabel, SegmentedControl, JobControlsPanel
+from .ui_bus import UIUpdateBus, UI_FRAME_RATE
+from .animations import get_animation_manager
+from .dashboard_model import DashboardModel
+from .pages import MoviesPage, AppsPage, DashboardPage
+
+
+# Bus frame rate per window state; 0 stops redrawing until the window is shown again
+RENDER_FRAME_RATES = {
+    'visible': UI_FRAME_RATE,
+    'unfocused': 5,
+    'hidden': 0,
+}
+
+# Print the time, CPU and frames per window state when the window closes
+PRINT_RENDER_STATS = os.environ.get('VODU_RENDER_STATS', '') not in ('', '0')
 
 
 class VoduDownloaderApp(ctk.CTk):
@@ -30,6 +46,7 @@ class VoduDownloaderApp(ctk.CTk):
                 - 'apps_download': function(url)
                 - 'apps_open_urls': function(url)
                 - 'open_video_urls': function(url, quality, season)
+                - 'cancel_all': function() stopping running downloads
         """
         super().__init__()
 
@@ -44,6 +61,19 @@ class VoduDownloaderApp(ctk.CTk):
         # Create widgets
         self._create_widgets()
 
+        # Worker threads update widgets through the bus, never directly
+        self.ui_bus = UIUpdateBus(self)
+        get_animation_manager().attach(self)
+        self.protocol('WM_DELETE_WINDOW', self._on_close)
+
+        # Redraw less, or not at all, while the window is unfocused or minimized
+        self._render_state = 'visible'
+        self._render_stats = {state: {'seconds': 0.0, 'ui_cpu_seconds': 0.0, 'process_cpu_seconds': 0.0,
+                                      'frames': 0} for state in RENDER_FRAME_RATES}
+        self._state_mark = self._stats_sample()
+        for sequence in ('<Map>', '<Unmap>', '<FocusIn>', '<FocusOut>'):
+            self.bind(sequence, self._on_visibility_event, add='+')
+
         # Show default page
         self.show_page('movies')
 
@@ -110,7 +140,7 @@ class VoduDownloaderApp(ctk.CTk):
 
         self.segmented_control = SegmentedControl(
             nav_container,
-            choices=['Movies', 'Apps'],
+            choices=['Movies', 'Apps', 'Jobs'],
             default=0,
             on_change=self._on_tab_change
         )
@@ -146,7 +176,8 @@ class VoduDownloaderApp(ctk.CTk):
         # Status label
         self.status_label = StatusLabel(
             self.progress_section,
-            height=60
+            height=60,
+            log_file=os.environ.get('VODU_STATUS_LOG')
         )
         self.status_label.pack(fill='both', expand=True, padx=SPACING['md'], pady=(SPACING['xs'], SPACING['xs']))
 
@@ -159,6 +190,11 @@ class VoduDownloaderApp(ctk.CTk):
         )
         self.time_label.pack(padx=SPACING['md'], pady=(0, SPACING['sm']))
 
+        # ====================================================================
+        # Job Controls (shown above the progress section while jobs run)
+        # ====================================================================
+        self.job_controls = JobControlsPanel(self)
+
     def _create_pages(self):
         """Create page frames."""
         # Movies/TV Shows Page
@@ -180,10 +216,15 @@ class VoduDownloaderApp(ctk.CTk):
             }
         )
 
+        # Jobs Dashboard Page
+        self.dashboard_model = DashboardModel()
+        self.dashboard_page = DashboardPage(self.content_frame, self.dashboard_model)
+
         self._current_page = None
         self._pages = {
             'movies': self.movies_page,
-            'apps': self.apps_page
+            'apps': self.apps_page,
+            'jobs': self.dashboard_page
         }
 
     # ========================================================================
@@ -195,7 +236,7 @@ class VoduDownloaderApp(ctk.CTk):
         Show a specific page.
 
         Args:
-            page_name: 'movies' or 'apps'
+            page_name: 'movies', 'apps' or 'jobs'
         """
         # Hide current page
         if self._current_page:
@@ -209,8 +250,7 @@ class VoduDownloaderApp(ctk.CTk):
 
     def _on_tab_change(self, index: int, name: str):
         """Handle segmented control change."""
-        page_name = 'movies' if name == 'Movies' else 'apps'
-        self.show_page(page_name)
+        self.show_page(name.lower())
 
     # ========================================================================
     # Download Handlers (Bridge to external handlers)
@@ -223,10 +263,10 @@ class VoduDownloaderApp(ctk.CTk):
                 url=url,
                 quality=quality,
                 season=season,
-                progress_bar=self.progress_bar,
-                status_label=self.status_label,
-                time_label=self.time_label,
-                window=self
+                progress_bar=self.ui_bus.proxy(self.progress_bar),
+                status_label=self.ui_bus.proxy(self.status_label),
+                time_label=self.ui_bus.proxy(self.time_label),
+                window=self.ui_bus.proxy(self)
             )
 
     def _handle_subtitle_download(self, url: str):
@@ -234,9 +274,9 @@ class VoduDownloaderApp(ctk.CTk):
         if 'subtitle' in self.download_handlers:
             self.download_handlers['subtitle'](
                 url=url,
-                progress_bar=self.progress_bar,
-                status_label=self.status_label,
-                window=self
+                progress_bar=self.ui_bus.proxy(self.progress_bar),
+                status_label=self.ui_bus.proxy(self.status_label),
+                window=self.ui_bus.proxy(self)
             )
 
     def _handle_open_video_urls(self, url: str, quality: str, season: str):
@@ -253,10 +293,10 @@ class VoduDownloaderApp(ctk.CTk):
         if 'apps_download' in self.download_handlers:
             self.download_handlers['apps_download'](
                 url=url,
-                progress_bar=self.progress_bar,
-                status_label=self.status_label,
-                time_label=self.time_label,
-                window=self
+                progress_bar=self.ui_bus.proxy(self.progress_bar),
+                status_label=self.ui_bus.proxy(self.status_label),
+                time_label=self.ui_bus.proxy(self.time_label),
+                window=self.ui_bus.proxy(self)
             )
 
     def _handle_apps_open_urls(self, url: str):
@@ -264,10 +304,127 @@ class VoduDownloaderApp(ctk.CTk):
         if 'apps_open_urls' in self.download_handlers:
             self.download_handlers['apps_open_urls'](url=url)
 
+    # ========================================================================
+    # Job Controls
+    # ========================================================================
+
+    def post_job_event(self, event: dict):
+        """
+        Feed a worker event to the Jobs dashboard. Safe to call from any thread.
+
+        Args:
+            event: Worker event tagged with a 'job' key
+        """
+        self.dashboard_model.apply(event)
+        self.ui_bus.post(('dashboard', 'refresh'), self.dashboard_page.refresh)
+
+    def add_job_controls(self, job_id, title: str, on_pause: Callable, on_resume: Callable, on_cancel: Callable):
+        """
+        Show Pause/Resume and Cancel buttons for a running download.
+
+        Args:
+            job_id: Key passed back to remove_job_controls()
+            title: Text shown next to the buttons
+            on_pause: Called when Pause is clicked
+            on_resume: Called when Resume is clicked
+            on_cancel: Called when Cancel is clicked
+        """
+        if not self.job_controls.has_jobs():
+            self.job_controls.pack(fill='x', side='bottom', pady=(0, SPACING['xs']))
+        self.job_controls.add_job(job_id, title, on_pause, on_resume, on_cancel)
+
+    def remove_job_controls(self, job_id):
+        """Remove the buttons of a finished download."""
+        self.job_controls.remove_job(job_id)
+        if not self.job_controls.has_jobs():
+            self.job_controls.pack_forget()
+
     # ========================================================================
     # UI Methods
     # ========================================================================
 
+    def _on_close(self):
+        """Cancel running downloads and stop the update bus before the window goes away."""
+        if 'cancel_all' in self.download_handlers:
+            self.download_handlers['cancel_all']()
+        self.ui_bus.stop()
+        get_animation_manager().cancel_all()
+        if PRINT_RENDER_STATS:
+            self._print_render_stats()
+        self.destroy()
+
+    # ========================================================================
+    # Render State (suspend drawing while minimized or unfocused)
+    # ========================================================================
+
+    def _on_visibility_event(self, event):
+        """Re-check the window state once the focus or map change has settled."""
+        self.after_idle(self._update_render_state)
+
+    def _current_render_state(self) -> str:
+        try:
+            if self.wm_state() in ('iconic', 'withdrawn') or not self.winfo_ismapped():
+                return 'hidden'
+            if self.focus_displayof() is None:
+                return 'unfocused'
+        except (tk.TclError, KeyError):
+            # focus_displayof() cannot name some internal Tk widgets
+            pass
+        return 'visible'
+
+    def _update_render_state(self):
+        """Apply the frame rate for the current window state."""
+        state = self._current_render_state()
+        if state == self._render_state:
+            return
+        self._close_stats_interval()
+        self._render_state = state
+
+        frame_rate = RENDER_FRAME_RATES[state]
+        animations = get_animation_manager()
+        if frame_rate:
+            self.ui_bus.set_frame_rate(frame_rate)
+            self.ui_bus.resume()
+            animations.resume()
+        else:
+            self.ui_bus.pause()
+            animations.suspend()
+
+    def _stats_sample(self):
+        # Sampled on the Tk thread, so thread_time() is the UI's own CPU time
+        return time.monotonic(), time.thread_time(), time.process_time(), self.ui_bus.frames_drawn
+
+    def _close_stats_interval(self):
+        """Add the time since the last state change to the current state's totals."""
+        now = self._stats_sample()
+        stats = self._render_stats[self._render_state]
+        stats['seconds'] += now[0] - self._state_mark[0]
+        stats['ui_cpu_seconds'] += now[1] - self._state_mark[1]
+        stats['process_cpu_seconds'] += now[2] - self._state_mark[2]
+        stats['frames'] += now[3] - self._state_mark[3]
+        self._state_mark = now
+
+    def render_stats(self) -> dict:
+        """
+        Time, CPU and frames drawn per window state since startup.
+
+        Returns:
+            {state: {'seconds', 'ui_cpu_seconds', 'process_cpu_seconds',
+            'frames', 'ui_cpu_percent'}} for 'visible', 'unfocused' and 'hidden'
+        """
+        self._close_stats_interval()
+        report = {}
+        for state, stats in self._render_stats.items():
+            seconds = stats['seconds']
+            report[state] = dict(stats, ui_cpu_percent=stats['ui_cpu_seconds'] / seconds * 100 if seconds else 0.0)
+        return report
+
+    def _print_render_stats(self):
+        for state, stats in self.render_stats().items():
+            if stats['seconds']:
+                print(f"UI {state}: {stats['seconds']:.0f}s, {stats['frames']} frames, "
+                      f"UI CPU {stats['ui_cpu_percent']:.1f}%, process CPU {stats['process_cpu_seconds']:.1f}s")
+
     def _show_developer_info(self):
         """Show developer information dialog."""
         from tkinter import messagebox
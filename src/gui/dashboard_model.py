@@ -0,0 +1,191 @@
+"""
+Download Dashboard Model
+Thread-safe list of jobs and their parts or episodes, fed by worker progress events.
+"""
+
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+
+# Weight of the newest sample in the per-item speed average
+SPEED_SMOOTHING = 0.3
+
+# Event name suffix -> item state ('part_completed', 'video_completed', ...)
+ITEM_STATES = {
+    'queued': 'queued',
+    'started': 'downloading',
+    'retry': 'retrying',
+    'completed': 'done',
+    'skipped': 'skipped',
+    'failed': 'failed',
+    'interrupted': 'stopped',
+}
+
+# One rendered row: (depth, title, state, downloaded, total, speed_bps, eta_seconds)
+Row = Tuple[int, str, str, int, int, float, Optional[float]]
+
+
+class _ItemRow:
+    """One part, episode or subtitle of a job."""
+
+    __slots__ = ('name', 'state', 'downloaded', 'total', 'speed', 'sampled_at')
+
+    def __init__(self, name):
+        self.name = name
+        self.state = 'queued'
+        self.downloaded = 0
+        self.total = 0
+        self.speed = 0.0
+        self.sampled_at = None
+
+
+class _JobRow:
+    """One download started from the GUI."""
+
+    __slots__ = ('job_id', 'title', 'state', 'total', 'items', 'order', 'downloaded', 'item_total', 'speed')
+
+    def __init__(self, job_id, title):
+        self.job_id = job_id
+        self.title = title
+        self.state = 'running'
+        self.total = 0
+        self.items: Dict[str, _ItemRow] = {}
+        self.order: List[_ItemRow] = []
+        # Sums over the items, kept up to date so a job row formats in O(1)
+        self.downloaded = 0
+        self.item_total = 0
+        self.speed = 0.0
+
+
+class DashboardModel:
+    """
+    Jobs and their items, flattened into rows for a virtual list.
+
+    apply() takes the events the download workers already emit, tagged
+    with a 'job' key, and may be called from any thread. Progress only
+    updates rows in place; the flat row list is rebuilt when a job or
+    item is added or removed. rows() formats just the requested slice,
+    so drawing costs the same for ten items as for ten thousand.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._jobs: Dict[object, _JobRow] = {}
+        self._flat: List[object] = []
+        self._flat_valid = True
+        self.version = 0
+
+    def apply(self, event: dict):
+        """Update the model from one worker event."""
+        job_id = event.get('job')
+        name = event.get('event', '')
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if name == 'job_started':
+                # A new job never inherits the items or totals of an old row
+                self._jobs.pop(job_id, None)
+                self._jobs[job_id] = _JobRow(job_id, event.get('title') or str(job_id))
+                self._flat_valid = False
+            elif job is None:
+                return
+            elif name == 'job_finished':
+                job.state = event.get('state', 'done')
+            elif name in ('job_paused', 'job_resumed'):
+                job.state = 'paused' if name == 'job_paused' else 'running'
+            elif name == 'links_resolved':
+                job.total = event.get('total_bytes') or job.total
+            elif name == 'progress':
+                self._apply_progress(job, event)
+            else:
+                state = ITEM_STATES.get(name.rpartition('_')[2])
+                if state is None or not event.get('filename'):
+                    return
+                item = self._item(job, event['filename'])
+                item.state = state
+                size = event.get('size') or event.get('expected_size')
+                if size:
+                    self._set_total(job, item, size)
+                if state in ('done', 'skipped'):
+                    self._set_downloaded(job, item, item.total or item.downloaded)
+                if state != 'downloading':
+                    self._set_speed(job, item, 0.0)
+            self.version += 1
+
+    def remove_finished(self):
+        """Drop jobs that are no longer running or paused."""
+        with self._lock:
+            for job_id in [job_id for job_id, job in self._jobs.items() if job.state not in ('running', 'paused')]:
+                del self._jobs[job_id]
+            self._flat_valid = False
+            self.version += 1
+
+    def row_count(self) -> int:
+        with self._lock:
+            return len(self._flat_rows())
+
+    def rows(self, start: int, count: int) -> List[Row]:
+        """Return up to count formatted rows starting at index start."""
+        with self._lock:
+            return [self._format(row) for row in self._flat_rows()[max(0, start):max(0, start) + count]]
+
+    def _flat_rows(self) -> List[object]:
+        if not self._flat_valid:
+            self._flat = []
+            for job in self._jobs.values():
+                self._flat.append(job)
+                self._flat.extend(job.order)
+            self._flat_valid = True
+        return self._flat
+
+    def _item(self, job: _JobRow, filename: str) -> _ItemRow:
+        item = job.items.get(filename)
+        if item is None:
+            item = job.items[filename] = _ItemRow(filename)
+            job.order.append(item)
+            self._flat_valid = False
+        return item
+
+    def _apply_progress(self, job: _JobRow, event: dict):
+        if not event.get('filename'):
+            return
+        item = self._item(job, event['filename'])
+        now = time.monotonic()
+        downloaded = event.get('downloaded', 0)
+        if 'speed_mb' in event:
+            self._set_speed(job, item, event['speed_mb'] * 1024 * 1024)
+        elif item.sampled_at is not None and now > item.sampled_at and downloaded >= item.downloaded:
+            sample = (downloaded - item.downloaded) / (now - item.sampled_at)
+            self._set_speed(job, item, item.speed + SPEED_SMOOTHING * (sample - item.speed))
+        item.sampled_at = now
+        if event.get('total'):
+            self._set_total(job, item, event['total'])
+        item.state = 'downloading'
+        self._set_downloaded(job, item, downloaded)
+
+    @staticmethod
+    def _set_downloaded(job: _JobRow, item: _ItemRow, downloaded: int):
+        job.downloaded += downloaded - item.downloaded
+        item.downloaded = downloaded
+
+    @staticmethod
+    def _set_total(job: _JobRow, item: _ItemRow, total: int):
+        job.item_total += total - item.total
+        item.total = total
+
+    @staticmethod
+    def _set_speed(job: _JobRow, item: _ItemRow, speed: float):
+        job.speed += speed - item.speed
+        item.speed = speed
+
+    @staticmethod
+    def _format(row) -> Row:
+        if isinstance(row, _JobRow):
+            speed = max(0.0, row.speed)
+            total = row.total or row.item_total
+            remaining = total - row.downloaded
+            eta = remaining / speed if speed > 0 and remaining > 0 else None
+            return 0, row.title, row.state, row.downloaded, total, speed, eta
+        remaining = row.total - row.downloaded
+        eta = remaining / row.speed if row.speed > 0 and remaining > 0 else None
+        return 1, row.name, row.state, row.downloaded, row.total, row.speed, eta
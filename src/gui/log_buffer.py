@@ -0,0 +1,107 @@
+"""
+Status Log Buffer
+Bounded line store behind StatusLabel, with optional spill to a rotating log file.
+"""
+
+import itertools
+import logging
+from collections import deque
+from logging.handlers import RotatingFileHandler
+from typing import List, Optional
+
+
+# Lines kept in memory; older lines are dropped (or only kept in the log file)
+STATUS_LOG_MAX_LINES = 2000
+
+# Rotating spill file: size of one file and number of old files kept
+STATUS_LOG_FILE_BYTES = 2 * 1024 * 1024
+STATUS_LOG_FILE_BACKUPS = 3
+
+
+class LogBuffer:
+    """
+    Ring buffer of text lines.
+
+    write() accepts any text, including partial lines: the text after the
+    last newline stays open and the next write continues it. Once the cap
+    is reached each new line drops the oldest one, so memory and the cost
+    of a write stay flat however long a batch runs. Completed lines can
+    also be written to a rotating log file, which keeps the full history.
+    """
+
+    def __init__(self, max_lines: int = STATUS_LOG_MAX_LINES, log_file: Optional[str] = None):
+        """
+        Args:
+            max_lines: Number of lines kept in memory
+            log_file: Path of a rotating file that receives every completed line
+        """
+        self.max_lines = max(1, max_lines)
+        self._lines = deque(maxlen=self.max_lines)
+        self._open_line = None
+        self.dropped_lines = 0
+        self.version = 0
+        self._spill = self._create_spill_logger(log_file) if log_file else None
+
+    def __len__(self) -> int:
+        return len(self._lines) + (self._open_line is not None)
+
+    def write(self, text: str):
+        """Append text; newlines start new lines."""
+        if not text:
+            return
+        pieces = text.split('\n')
+        if self._open_line is not None:
+            pieces[0] = self._open_line + pieces[0]
+        self._open_line = pieces.pop()
+        for line in pieces:
+            self._push(line)
+        self.version += 1
+
+    def clear(self):
+        """Drop every line kept in memory; the spill file is not touched."""
+        if self._open_line:
+            self._push(self._open_line)
+        self._lines.clear()
+        self._open_line = None
+        self.dropped_lines = 0
+        self.version += 1
+
+    def lines(self, start: int, count: int) -> List[str]:
+        """Return up to count lines starting at index start (0 is the oldest line kept)."""
+        total = len(self)
+        start = max(0, min(start, total))
+        stop = min(total, start + max(0, count))
+        closed = len(self._lines)
+        # Indexing into the middle of a deque is O(n); one slice walks it once
+        result = list(itertools.islice(self._lines, start, min(stop, closed)))
+        if stop > closed:
+            result.append(self._open_line)
+        return result
+
+    def close(self):
+        """Flush the open line to the spill file and close it."""
+        if self._spill is None:
+            return
+        if self._open_line:
+            self._spill.info(self._open_line)
+        for handler in self._spill.handlers:
+            handler.close()
+        self._spill.handlers.clear()
+        self._spill = None
+
+    def _push(self, line: str):
+        if len(self._lines) == self.max_lines:
+            self.dropped_lines += 1
+        self._lines.append(line)
+        if self._spill is not None:
+            self._spill.info(line)
+
+    @staticmethod
+    def _create_spill_logger(log_file: str) -> logging.Logger:
+        # Not registered with logging.getLogger(), so each buffer owns its handler
+        logger = logging.Logger('vodu.status', logging.INFO)
+        handler = RotatingFileHandler(log_file, maxBytes=STATUS_LOG_FILE_BYTES,
+                                      backupCount=STATUS_LOG_FILE_BACKUPS, encoding='utf-8')
+        handler.setFormatter(logging.Formatter('%(asctime)s %(message)s'))
+        logger.addHandler(handler)
+        return logger
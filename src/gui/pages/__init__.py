@@ -4,5 +4,6 @@ Page modules for Vodu Downloader iOS-style GUI.
 
 from .movies_page import MoviesPage
 from .apps_page import AppsPage
+from .dashboard_page import DashboardPage
 
-__all__ = ["MoviesPage", "AppsPage"]
+__all__ = ["MoviesPage", "AppsPage", "DashboardPage"]
@@ -0,0 +1,71 @@
+"""
+Jobs Dashboard Page
+Lists every running or finished download with its parts and episodes.
+"""
+
+import customtkinter as ctk
+from ..styles import COLORS, FONTS, SPACING, CORNER_RADIUS
+from ..widgets import VirtualJobList
+
+
+class DashboardPage(ctk.CTkFrame):
+    """
+    Page showing all downloads, their parts or episodes, state, speed and ETA.
+    """
+
+    def __init__(self, master, model, **kwargs):
+        """
+        Args:
+            master: Parent widget
+            model: DashboardModel fed by the download workers' events
+        """
+        kwargs.setdefault('fg_color', COLORS['background'])
+        super().__init__(master, **kwargs)
+
+        self.model = model
+
+        self._create_widgets()
+
+    def _create_widgets(self):
+        """Create all widgets for the dashboard page."""
+        # ====================================================================
+        # Header
+        # ====================================================================
+        header = ctk.CTkFrame(self, fg_color=COLORS['background'])
+        header.pack(fill='x', padx=SPACING['md'], pady=(SPACING['md'], SPACING['sm']))
+
+        title_label = ctk.CTkLabel(
+            header,
+            text='Jobs',
+            font=FONTS['title2'],
+            text_color=COLORS['text_primary']
+        )
+        title_label.pack(side='left')
+
+        clear_btn = ctk.CTkButton(
+            header,
+            text='Clear finished',
+            font=FONTS['footnote'],
+            corner_radius=CORNER_RADIUS['small'],
+            width=100,
+            height=28,
+            fg_color=COLORS['tertiary'],
+            hover_color=COLORS['quaternary'],
+            text_color=COLORS['text_primary'],
+            command=self._on_clear_finished
+        )
+        clear_btn.pack(side='right')
+
+        # ====================================================================
+        # Job List
+        # ====================================================================
+        self.job_list = VirtualJobList(self, self.model, corner_radius=CORNER_RADIUS['medium'])
+        self.job_list.pack(fill='both', expand=True, padx=SPACING['md'], pady=(0, SPACING['md']))
+
+    def refresh(self):
+        """Redraw the visible rows; does nothing while the page is hidden."""
+        self.job_list.refresh()
+
+    def _on_clear_finished(self):
+        self.model.remove_finished()
+        self.refresh()
@@ -187,7 +187,11 @@ def configure_ctk_theme():
 # Gradient Colors for Progress Bar
 # ============================================================================
 
-def get_progress_color(percentage: float) -> str:
+# Steps per percent in the color table; progress text shows one decimal
+PROGRESS_COLOR_STEPS = 10
+
+
+def _interpolate_progress_color(percentage: float) -> str:
     """
     Return a color based on progress percentage.
     Goes from red (0%) -> orange (30%) -> yellow (70%) -> green (100%)
@@ -214,6 +218,22 @@ def get_progress_color(percentage: float) -> str:
     return f'#{red:02x}{green:02x}{blue:02x}'
 
 
+# One entry per 0.1%, built once so redraws only index a tuple
+PROGRESS_COLORS = tuple(
+    _interpolate_progress_color(step / PROGRESS_COLOR_STEPS)
+    for step in range(100 * PROGRESS_COLOR_STEPS + 1)
+)
+
+
+def get_progress_color(percentage: float) -> str:
+    """
+    Return a color based on progress percentage.
+    Goes from red (0%) -> orange (30%) -> yellow (70%) -> green (100%)
+    """
+    step = int(percentage * PROGRESS_COLOR_STEPS + 0.5)
+    return PROGRESS_COLORS[min(max(step, 0), 100 * PROGRESS_COLOR_STEPS)]
+
+
 # ============================================================================
 # Widget Style Helpers
 # ============================================================================
@@ -0,0 +1,240 @@
+"""
+UI Update Bus
+Thread-safe hand-off of widget updates from download threads to the Tk main loop.
+"""
+
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+# Frames per second at which posted updates are applied
+UI_FRAME_RATE = 30
+
+
+# ============================================================================
+# Update Bus
+# ============================================================================
+
+class UIUpdateBus:
+    """
+    Collects widget updates posted from any thread and applies them on the
+    Tk main loop at a fixed frame rate.
+
+    Updates are coalesced by key: if a progress bar is set 200 times between
+    two frames, only the last value is drawn. The cost of keeping the window
+    current therefore depends on the frame rate, not on the chunk rate or
+    on the number of concurrent downloads.
+    """
+
+    def __init__(self, root, frame_rate: int = UI_FRAME_RATE):
+        """
+        Args:
+            root: Tk root window whose after() drives the bus
+            frame_rate: Frames per second at which updates are applied
+        """
+        self._root = root
+        self._interval_ms = max(1, int(1000 / frame_rate))
+        self._lock = threading.Lock()
+        self._pending: Dict[Any, Tuple[Callable, tuple, dict]] = {}
+        self._main_thread = threading.get_ident()
+        self._last_drain = 0.0
+        self._running = True
+        self._paused = False
+        self.frames_drawn = 0
+        # Optional hook called as on_drain(started, ended, updates) with
+        # time.perf_counter() readings after each frame that applied updates
+        self.on_drain: Optional[Callable[[float, float, int], None]] = None
+
+        self._after_id = self._root.after(self._interval_ms, self._tick)
+
+    def post(self, key, func: Callable, *args, **kwargs):
+        """Queue func(*args, **kwargs), replacing any pending call with the same key."""
+        with self._lock:
+            self._pending.pop(key, None)
+            self._pending[key] = (func, args, kwargs)
+
+    def merge(self, key, func: Callable, **kwargs):
+        """Queue func(**kwargs), merging keyword arguments into a pending call with the same key."""
+        with self._lock:
+            pending = self._pending.pop(key, None)
+            if pending:
+                kwargs = {**pending[2], **kwargs}
+            self._pending[key] = (func, (), kwargs)
+
+    def append(self, key, func: Callable, text: str, set_text: Optional[Callable] = None):
+        """
+        Queue func(text), concatenating text onto a pending call with the same key.
+
+        A pending func or set_text call absorbs the appended text, so
+        set-then-append between two frames still costs a single redraw.
+        Any other call pending under the key is kept and runs first.
+        """
+        with self._lock:
+            pending = self._pending.pop(key, None)
+            if pending and pending[0] in (func, set_text) and len(pending[1]) == 1 and not pending[2]:
+                func = pending[0]
+                text = pending[1][0] + text
+            elif pending:
+                self._pending[object()] = pending
+            self._pending[key] = (func, (text,), {})
+
+    def call(self, func: Callable, *args, **kwargs) -> Future:
+        """
+        Run func on the main loop and return a Future for its result.
+
+        Calls are never coalesced and run in the order they were made.
+        Worker threads use this for dialogs; a call made after the bus has
+        stopped is cancelled instead of waiting forever.
+        """
+        future = Future()
+
+        def run():
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                future.set_result(func(*args, **kwargs))
+            except BaseException as e:
+                future.set_exception(e)
+
+        if self.is_main_thread():
+            run()
+            return future
+        with self._lock:
+            if self._running:
+                self._pending[future] = (run, (), {})
+                return future
+        future.cancel()
+        return future
+
+    def is_main_thread(self) -> bool:
+        return threading.get_ident() == self._main_thread
+
+    def flush(self, force: bool = False):
+        """
+        Apply pending updates now. Only valid on the main thread.
+
+        Without force, updates are applied at most once per frame, so code
+        that still runs on the main thread and flushes per chunk stays cheap.
+        """
+        now = time.monotonic()
+        if not force and now - self._last_drain < self._interval_ms / 1000:
+            return
+        self._last_drain = now
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if pending:
+            self.frames_drawn += 1
+        started = time.perf_counter()
+        for func, args, kwargs in pending.values():
+            try:
+                func(*args, **kwargs)
+            except Exception as e:
+                print(f"UI update failed: {e}")
+        if pending and self.on_drain is not None:
+            self.on_drain(started, time.perf_counter(), len(pending))
+
+    def set_frame_rate(self, frame_rate: int):
+        """Change how often updates are applied; takes effect from the next frame."""
+        self._interval_ms = max(1, int(1000 / frame_rate))
+
+    def pause(self):
+        """
+        Stop applying updates, e.g. while the window is minimized.
+
+        Posts keep coalescing, so a paused bus holds at most one pending
+        call per key and resume() draws the latest state in one frame.
+        """
+        if self._paused:
+            return
+        self._paused = True
+        self._cancel_tick()
+
+    def resume(self):
+        """Apply everything posted while paused and restart the frame loop."""
+        if not self._paused:
+            return
+        self._paused = False
+        if self._running:
+            self.flush(force=True)
+            self._after_id = self._root.after(self._interval_ms, self._tick)
+
+    def stop(self):
+        """Stop the frame loop and cancel calls that are still waiting for it."""
+        with self._lock:
+            self._running = False
+        self._cancel_tick()
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        for key in pending:
+            if isinstance(key, Future):
+                key.cancel()
+
+    def proxy(self, widget):
+        """Return a stand-in for widget that posts its updates to this bus."""
+        if widget is None:
+            return None
+        return WidgetProxy(self, widget)
+
+    def _cancel_tick(self):
+        if self._after_id is not None:
+            try:
+                self._root.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._after_id = None
+
+    def _tick(self):
+        """Drain the bus once per frame."""
+        if not self._running or self._paused:
+            return
+        self.flush(force=True)
+        self._after_id = self._root.after(self._interval_ms, self._tick)
+
+
+# ============================================================================
+# Widget Proxy
+# ============================================================================
+
+class WidgetProxy:
+    """
+    Stands in for a widget on worker threads.
+
+    Calls that change what the widget shows are posted to the bus and
+    return None. update()/update_idletasks() do not redraw from workers,
+    because the frame loop already does. On the main thread they flush
+    the bus at most once per frame. Everything else is passed through.
+    """
+
+    _COALESCED = ('set_progress', 'set_text', 'set_value', 'set')
+    _MERGED = ('configure', 'config')
+    _REFRESH = ('update', 'update_idletasks')
+
+    def __init__(self, bus: UIUpdateBus, widget):
+        self._bus = bus
+        self._widget = widget
+
+    def __getattr__(self, name: str):
+        attr = getattr(self._widget, name)
+        if name in self._REFRESH:
+            return self._refresh
+        if name in self._COALESCED:
+            return lambda *args, **kwargs: self._bus.post((id(self._widget), 'content'), attr, *args, **kwargs)
+        if name in self._MERGED:
+            return lambda **kwargs: self._bus.merge((id(self._widget), 'configure'), attr, **kwargs)
+        if name == 'append_text':
+            return lambda text: self._append(text)
+        return attr
+
+    def __setitem__(self, key, value):
+        self._bus.merge((id(self._widget), 'configure'), self._widget.configure, **{key: value})
+
+    def _append(self, text: str):
+        self._bus.append((id(self._widget), 'content'), self._widget.append_text, text,
+                         getattr(self._widget, 'set_text', None))
+
+    def _refresh(self):
+        if self._bus.is_main_thread():
+            self._bus.flush()
+            self._widget.update_idletasks()
@@ -4,13 +4,15 @@ Provides reusable components with iOS-style design and smooth animations.
 """
 
 import tkinter as tk
+import tkinter.font as tkfont
 from typing import Optional, Callable, List
 import customtkinter as ctk
 from .styles import (
     COLORS, FONTS, SPACING, CORNER_RADIUS,
-    get_button_style, get_entry_style, get_card_style
+    get_button_style, get_entry_style, get_card_style, get_progress_color
 )
 from .animations import ButtonAnimator, AnimatedProgress
+from .log_buffer import LogBuffer, STATUS_LOG_MAX_LINES
 
 
 # ============================================================================
@@ -134,6 +136,31 @@ class SmoothProgressBar(ctk.CTkFrame):
         )
         self.canvas.pack(fill='both', expand=True)
 
+        # Items are created once; updates only move the fill and change text
+        self._bg_item = self.canvas.create_rectangle(
+            2, 2, self._width - 2, self._height - 2,
+            fill='#1a1a1a',
+            outline='#00ff00',
+            width=2,
+            tags="progress_bg"
+        )
+        self._fill_item = self.canvas.create_rectangle(
+            2, 2, 2, self._height - 2,
+            fill=get_progress_color(0),
+            outline="",
+            width=0,
+            state='hidden',
+            tags="progress_fill"
+        )
+        self._text_item = self.canvas.create_text(
+            self._width / 2, self._height / 2,
+            text="",
+            fill='#ffffff',
+            font=('Segoe UI', 10, 'bold'),
+            tags="progress_text"
+        )
+        self._drawn = (None, None, None)
+
         # Initialize display
         self._draw_progress()
 
@@ -149,41 +176,25 @@ class SmoothProgressBar(ctk.CTkFrame):
         self._draw_progress()
 
     def _draw_progress(self):
-        """Draw the progress bar with current value."""
-        from .styles import get_progress_color
-
-        self.canvas.delete("all")
-
-        # Background
-        self.canvas.create_rectangle(
-            2, 2, self._width - 2, self._height - 2,
-            fill='#1a1a1a',
-            outline='#00ff00',
-            width=2,
-            tags="progress_bg"
-        )
-
-        # Progress fill
-        if self._progress > 0:
-            fill_width = 2 + ((self._width - 4) * self._progress / 100)
-            color = get_progress_color(self._progress)
-
-            self.canvas.create_rectangle(
-                2, 2, fill_width, self._height - 2,
-                fill=color,
-                outline="",
-                width=0,
-                tags="progress_fill"
-            )
-
-        # Percentage text
-        self.canvas.create_text(
-            self._width / 2, self._height / 2,
-            text=f"{self._progress:.1f}%",
-            fill='#ffffff',
-            font=('Segoe UI', 10, 'bold'),
-            tags="progress_text"
-        )
+        """Update the fill and text items for the current value."""
+        text = f"{self._progress:.1f}%"
+        fill_width = round(2 + ((self._width - 4) * self._progress / 100)) if self._progress > 0 else None
+        color = get_progress_color(self._progress)
+        drawn_width, drawn_color, drawn_text = self._drawn
+
+        # Values that would not change a pixel cost nothing
+        if fill_width != drawn_width:
+            if fill_width is None:
+                self.canvas.itemconfigure(self._fill_item, state='hidden')
+            else:
+                self.canvas.coords(self._fill_item, 2, 2, fill_width, self._height - 2)
+                if drawn_width is None:
+                    self.canvas.itemconfigure(self._fill_item, state='normal')
+        if color != drawn_color:
+            self.canvas.itemconfigure(self._fill_item, fill=color)
+        if text != drawn_text:
+            self.canvas.itemconfigure(self._text_item, text=text)
+        self._drawn = (fill_width, color, text)
 
 
 # ============================================================================
@@ -610,34 +621,384 @@ class URLInputCard(GlassCard):
 class StatusLabel(ctk.CTkTextbox):
     """
     A read-only text area for displaying download status and logs.
+
+    Text is kept in a bounded LogBuffer and only the lines that fit in the
+    widget are put into the textbox, so an append costs the same after a
+    million lines as after ten. Appends made before the next idle moment
+    are drawn together. The mouse wheel scrolls through the kept lines;
+    scrolling back to the bottom follows new text again.
     """
 
-    def __init__(self, master, height: int = 120, **kwargs):
+    def __init__(self, master, height: int = 120, max_lines: int = STATUS_LOG_MAX_LINES,
+                 log_file: Optional[str] = None, **kwargs):
+        """
+        Args:
+            master: Parent widget
+            height: Widget height in pixels
+            max_lines: Number of lines kept for scrolling back
+            log_file: Rotating file that receives the full history
+            **kwargs: Additional textbox arguments
+        """
         kwargs.setdefault('fg_color', COLORS['secondary'])
         kwargs.setdefault('border_color', COLORS['quaternary'])
         kwargs.setdefault('border_width', 1)
         kwargs.setdefault('corner_radius', CORNER_RADIUS['medium'])
         kwargs.setdefault('font', FONTS['monospace'])
+        # The textbox only ever holds the visible lines, so its scrollbar would mislead
+        kwargs.setdefault('activate_scrollbars', False)
 
         super().__init__(master, height=height, **kwargs)
 
+        self._log = LogBuffer(max_lines, log_file)
+        self._first_line = None  # None follows the newest line
+        self._render_pending = False
+        self._rendered = None
+        self._line_height = None
+
+        self.bind('<Configure>', self._on_resize, add=True)
+        for sequence in ('<MouseWheel>', '<Button-4>', '<Button-5>'):
+            self.bind(sequence, self._on_scroll, add=True)
+
         # Make read-only
         self.configure(state='disabled')
 
     def set_text(self, text: str):
         """Update the text content."""
-        self.configure(state='normal')
-        self.delete('1.0', 'end')
-        self.insert('1.0', text)
-        self.configure(state='disabled')
+        self._log.clear()
+        self._log.write(text)
+        self._first_line = None
+        self._schedule_render()
 
     def append_text(self, text: str):
         """Append text to the end."""
-        self.configure(state='normal')
-        self.insert('end', text)
-        self.see('end')  # Auto-scroll to end
-        self.configure(state='disabled')
+        self._log.write(text)
+        self._schedule_render()
 
     def clear(self):
         """Clear all text."""
         self.set_text('')
+
+    def destroy(self):
+        self._log.close()
+        super().destroy()
+
+    def _schedule_render(self):
+        if not self._render_pending:
+            self._render_pending = True
+            self.after_idle(self._render)
+
+    def _visible_lines(self) -> int:
+        if self._line_height is None:
+            font = tkfont.Font(root=self, font=self._textbox.cget('font'))
+            self._line_height = max(1, font.metrics('linespace'))
+        return max(1, self._textbox.winfo_height() // self._line_height)
+
+    def _render(self):
+        """Put the lines of the current window into the textbox."""
+        self._render_pending = False
+        visible = self._visible_lines()
+        bottom = max(0, len(self._log) - visible)
+        start = bottom if self._first_line is None else min(self._first_line, bottom)
+        view = (start, visible, self._log.version)
+        if view == self._rendered:
+            return
+        self._rendered = view
+
+        self.configure(state='normal')
+        self.delete('1.0', 'end')
+        self.insert('1.0', '\n'.join(self._log.lines(start, visible)))
+        self.configure(state='disabled')
+
+    def _on_resize(self, event):
+        self._schedule_render()
+
+    def _on_scroll(self, event):
+        """Move the window three lines per wheel step."""
+        step = -3 if getattr(event, 'num', None) == 4 or getattr(event, 'delta', 0) > 0 else 3
+        bottom = max(0, len(self._log) - self._visible_lines())
+        start = bottom if self._first_line is None else self._first_line
+        start = max(0, min(start + step, bottom))
+        self._first_line = None if start >= bottom else start
+        self._schedule_render()
+        return 'break'
+
+
+# ============================================================================
+# Job Controls (Pause / Resume / Cancel per download)
+# ============================================================================
+
+class JobControlsPanel(ctk.CTkFrame):
+    """
+    One row per running download with Pause/Resume and Cancel buttons.
+    """
+
+    def __init__(self, master, **kwargs):
+        kwargs.setdefault('fg_color', COLORS['secondary'])
+        super().__init__(master, **kwargs)
+
+        self._rows = {}
+
+    def add_job(self, job_id, title: str,
+                on_pause: Callable[[], None],
+                on_resume: Callable[[], None],
+                on_cancel: Callable[[], None]):
+        """
+        Add a row for a download.
+
+        Args:
+            job_id: Key used by set_job_state() and remove_job()
+            title: Text shown on the row
+            on_pause: Called when Pause is clicked
+            on_resume: Called when Resume is clicked
+            on_cancel: Called when Cancel is clicked
+        """
+        row = ctk.CTkFrame(self, fg_color=COLORS['secondary'])
+        row.pack(fill='x', padx=SPACING['md'], pady=(SPACING['xs'], 0))
+
+        label = ctk.CTkLabel(
+            row,
+            text=title,
+            font=FONTS['footnote'],
+            text_color=COLORS['text_secondary'],
+            anchor='w'
+        )
+        label.pack(side='left', fill='x', expand=True)
+
+        cancel_btn = ctk.CTkButton(
+            row,
+            text='Cancel',
+            font=FONTS['footnote'],
+            corner_radius=CORNER_RADIUS['small'],
+            width=64,
+            height=24,
+            fg_color=COLORS['tertiary'],
+            hover_color=COLORS['quaternary'],
+            text_color=COLORS['error'],
+            command=lambda: self._cancel(job_id)
+        )
+        cancel_btn.pack(side='right', padx=(SPACING['xs'], 0))
+
+        toggle_btn = ctk.CTkButton(
+            row,
+            text='Pause',
+            font=FONTS['footnote'],
+            corner_radius=CORNER_RADIUS['small'],
+            width=64,
+            height=24,
+            fg_color=COLORS['tertiary'],
+            hover_color=COLORS['quaternary'],
+            text_color=COLORS['text_primary'],
+            command=lambda: self._toggle(job_id)
+        )
+        toggle_btn.pack(side='right')
+
+        self._rows[job_id] = {
+            'frame': row,
+            'label': label,
+            'title': title,
+            'toggle': toggle_btn,
+            'cancel': cancel_btn,
+            'paused': False,
+            'callbacks': (on_pause, on_resume, on_cancel),
+        }
+
+    def remove_job(self, job_id):
+        """Remove the row for a finished download."""
+        row = self._rows.pop(job_id, None)
+        if row:
+            row['frame'].destroy()
+
+    def set_job_state(self, job_id, state: str):
+        """Show 'running', 'paused' or 'cancelling' on a row."""
+        row = self._rows.get(job_id)
+        if not row:
+            return
+        row['paused'] = state == 'paused'
+        row['toggle'].configure(text='Resume' if row['paused'] else 'Pause',
+                                state='disabled' if state == 'cancelling' else 'normal')
+        row['cancel'].configure(state='disabled' if state == 'cancelling' else 'normal')
+        suffix = {'paused': ' (paused)', 'cancelling': ' (cancelling...)'}.get(state, '')
+        row['label'].configure(text=row['title'] + suffix)
+
+    def has_jobs(self) -> bool:
+        return bool(self._rows)
+
+    def _toggle(self, job_id):
+        """Pause a running job or resume a paused one."""
+        row = self._rows.get(job_id)
+        if not row:
+            return
+        on_pause, on_resume, _ = row['callbacks']
+        if row['paused']:
+            on_resume()
+            self.set_job_state(job_id, 'running')
+        else:
+            on_pause()
+            self.set_job_state(job_id, 'paused')
+
+    def _cancel(self, job_id):
+        row = self._rows.get(job_id)
+        if not row:
+            return
+        row['callbacks'][2]()
+        self.set_job_state(job_id, 'cancelling')
+
+
+# ============================================================================
+# Virtual Job List (Dashboard rows)
+# ============================================================================
+
+class VirtualJobList(ctk.CTkFrame):
+    """
+    Scrollable list of dashboard rows that draws only what is visible.
+
+    The canvas holds one fixed set of items per visible row slot; scrolling
+    and refreshing re-fill those slots from model.rows(), and slots whose
+    content did not change are left alone. A queue of thousands of
+    episodes therefore costs the same to draw as a single job.
+    """
+
+    ROW_HEIGHT = 34
+
+    STATE_COLORS = {
+        'running': COLORS['accent'],
+        'downloading': COLORS['accent'],
+        'retrying': COLORS['warning'],
+        'paused': COLORS['warning'],
+        'stopped': COLORS['warning'],
+        'done': COLORS['success'],
+        'skipped': COLORS['success'],
+        'failed': COLORS['error'],
+        'error': COLORS['error'],
+        'cancelled': COLORS['text_secondary'],
+        'queued': COLORS['text_secondary'],
+    }
+
+    def __init__(self, master, model, **kwargs):
+        """
+        Args:
+            master: Parent widget
+            model: Object with row_count(), rows(start, count) and version
+            **kwargs: Additional frame arguments
+        """
+        kwargs.setdefault('fg_color', COLORS['secondary'])
+        super().__init__(master, **kwargs)
+
+        self._model = model
+        self._top = 0
+        self._slots = []
+        self._drawn = []
+        self._rendered = None
+        self._slot_width = None
+
+        self.canvas = tk.Canvas(self, bg=COLORS['secondary'], highlightthickness=0, bd=0)
+        self.scrollbar = ctk.CTkScrollbar(self, command=self._on_scrollbar)
+        self.scrollbar.pack(side='right', fill='y')
+        self.canvas.pack(side='left', fill='both', expand=True)
+
+        self.canvas.bind('<Configure>', lambda event: self.refresh())
+        self.canvas.bind('<Map>', lambda event: self.refresh())
+        for sequence in ('<MouseWheel>', '<Button-4>', '<Button-5>'):
+            self.canvas.bind(sequence, self._on_wheel)
+
+    def refresh(self):
+        """Redraw the visible rows if the model or the scroll position changed."""
+        if not self.canvas.winfo_ismapped():
+            return  # Drawn on <Map> when the page is shown again
+        visible = self._visible_rows()
+        count = self._model.row_count()
+        self._top = max(0, min(self._top, count - visible + 1))
+        view = (self._top, visible, self._model.version, self.canvas.winfo_width())
+        if view == self._rendered:
+            return
+        self._rendered = view
+
+        if view[3] != self._slot_width:
+            # A width change moves every item, so redraw all slots
+            self._drawn = [None] * len(self._drawn)
+            self._slot_width = view[3]
+        self._ensure_slots(visible)
+        rows = self._model.rows(self._top, visible)
+        for index, slot in enumerate(self._slots):
+            row = rows[index] if index < len(rows) else None
+            if row != self._drawn[index]:
+                self._draw_slot(slot, index, row)
+                self._drawn[index] = row
+
+        if count:
+            self.scrollbar.set(self._top / count, min(1.0, (self._top + visible) / count))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def scroll_to(self, row: int):
+        self._top = max(0, row)
+        self.refresh()
+
+    def _visible_rows(self) -> int:
+        return max(1, self.canvas.winfo_height() // self.ROW_HEIGHT + 1)
+
+    def _ensure_slots(self, visible: int):
+        """Create canvas items for any slot that has not been used yet."""
+        while len(self._slots) < visible:
+            y = len(self._slots) * self.ROW_HEIGHT
+            self._slots.append({
+                'title': self.canvas.create_text(0, y + 10, anchor='w', fill=COLORS['text_primary'],
+                                                 font=FONTS['footnote']),
+                'state': self.canvas.create_text(0, y + 10, anchor='e', font=FONTS['caption1']),
+                'detail': self.canvas.create_text(0, y + 24, anchor='w', fill=COLORS['text_secondary'],
+                                                  font=FONTS['caption1']),
+                'bar_bg': self.canvas.create_rectangle(0, y + 30, 0, y + 32, fill=COLORS['tertiary'], width=0),
+                'bar': self.canvas.create_rectangle(0, y + 30, 0, y + 32, width=0),
+            })
+            self._drawn.append(None)
+
+    def _draw_slot(self, slot: dict, index: int, row):
+        canvas = self.canvas
+        if row is None:
+            for item in slot.values():
+                canvas.itemconfigure(item, state='hidden')
+            return
+        depth, title, state, downloaded, total, speed, eta = row
+        y = index * self.ROW_HEIGHT
+        left = SPACING['sm'] + depth * SPACING['md']
+        right = self.canvas.winfo_width() - SPACING['sm']
+        color = self.STATE_COLORS.get(state, COLORS['text_secondary'])
+
+        canvas.coords(slot['title'], left, y + 10)
+        canvas.itemconfigure(slot['title'], text=title, state='normal',
+                             font=FONTS['subheadline'] if depth == 0 else FONTS['footnote'])
+        canvas.coords(slot['state'], right, y + 10)
+        canvas.itemconfigure(slot['state'], text=state, fill=color, state='normal')
+        canvas.coords(slot['detail'], left, y + 24)
+        canvas.itemconfigure(slot['detail'], text=self._detail_text(downloaded, total, speed, eta), state='normal')
+
+        fraction = min(1.0, downloaded / total) if total else 0.0
+        canvas.coords(slot['bar_bg'], left, y + 30, right, y + 32)
+        canvas.coords(slot['bar'], left, y + 30, left + (right - left) * fraction, y + 32)
+        canvas.itemconfigure(slot['bar_bg'], state='normal')
+        canvas.itemconfigure(slot['bar'], fill=color, state='normal' if fraction > 0 else 'hidden')
+
+    @staticmethod
+    def _detail_text(downloaded: int, total: int, speed: float, eta) -> str:
+        text = f"{downloaded / (1024 * 1024):.1f}"
+        text += f" / {total / (1024 * 1024):.1f} MB" if total else " MB"
+        if speed > 0:
+            text += f"  |  {speed / (1024 * 1024):.1f} MB/s"
+        if eta is not None:
+            text += f"  |  ETA {int(eta // 60)}:{int(eta % 60):02d}"
+        return text
+
+    def _on_wheel(self, event):
+        step = -3 if getattr(event, 'num', None) == 4 or getattr(event, 'delta', 0) > 0 else 3
+        self.scroll_to(self._top + step)
+        return 'break'
+
+    def _on_scrollbar(self, action, *args):
+        """Handle CTkScrollbar 'moveto' and 'scroll' commands."""
+        count = self._model.row_count()
+        visible = self._visible_rows()
+        if action == 'moveto':
+            self.scroll_to(int(float(args[0]) * count))
+        elif action == 'scroll':
+            amount = int(args[0]) * (visible - 1 if args[1] == 'pages' else 1)
+            self.scroll_to(self._top + amount)
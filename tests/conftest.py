@@ -0,0 +1,7 @@
+import os
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+# The local store stand-in from the benchmarks serves the transfer tests
+sys.path.insert(0, os.path.join(ROOT_DIR, 'benchmarks'))
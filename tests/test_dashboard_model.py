@@ -0,0 +1,24 @@
+from src.gui.dashboard_model import DashboardModel
+
+
+def test_job_started_replaces_a_finished_row_with_the_same_id():
+    model = DashboardModel()
+    model.apply({'job': 1, 'event': 'job_started', 'title': 'Old'})
+    model.apply({'job': 1, 'event': 'progress', 'filename': 'a.bin', 'downloaded': 300, 'total': 1000})
+    model.apply({'job': 1, 'event': 'job_finished', 'state': 'done'})
+
+    model.apply({'job': 1, 'event': 'job_started', 'title': 'New'})
+
+    assert model.rows(0, 10) == [(0, 'New', 'running', 0, 0, 0.0, None)]
+
+
+def test_jobs_with_different_ids_keep_separate_rows():
+    model = DashboardModel()
+    for job_id in (1, 2):
+        model.apply({'job': job_id, 'event': 'job_started', 'title': f'Job {job_id}'})
+        model.apply({'job': job_id, 'event': 'part_completed', 'filename': 'a.bin', 'size': 100 * job_id})
+
+    assert [row[:5] for row in model.rows(0, 10)] == [
+        (0, 'Job 1', 'running', 100, 100), (1, 'a.bin', 'done', 100, 100),
+        (0, 'Job 2', 'running', 200, 200), (1, 'a.bin', 'done', 200, 200),
+    ]
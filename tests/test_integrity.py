@@ -0,0 +1,69 @@
+import hashlib
+import os
+
+import pytest
+
+import main
+from local_server import SyntheticFile, start_server
+
+SIZE = 8 * 1024 * 1024
+
+
+@pytest.fixture
+def changing_server():
+    # The content and ETag change 40% into the first response, then the connection drops
+    server = start_server([SyntheticFile('game.bin', SIZE)], fault='changed', fault_at=int(SIZE * 0.4))
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def file_md5(path):
+    with open(path, 'rb') as f:
+        return hashlib.md5(f.read()).hexdigest()
+
+
+def test_restart_after_content_change_drops_recorded_digest():
+    digest = main.StreamingDigest('md5:' + '0' * 32)
+    digest.restart()
+    assert digest.recorded == 'md5:' + '0' * 32
+    digest.restart(content_changed=True)
+    digest.start({}, partial=False)
+    digest.update(0, b'new content')
+    assert digest.recorded is None
+    assert digest.mismatch() is None
+    assert digest.result() == 'sha256:' + hashlib.sha256(b'new content').hexdigest()
+
+
+def test_server_checksum_wins_over_recorded_digest():
+    digest = main.StreamingDigest('md5:' + '0' * 32)
+    digest.start({'X-Checksum-Md5': hashlib.md5(b'data').hexdigest()}, partial=False)
+    digest.update(0, b'data')
+    assert digest.mismatch() is None
+
+
+def test_changed_file_is_kept_despite_stale_recorded_digest(tmp_path, changing_server):
+    old_md5 = SyntheticFile('game.bin', SIZE).md5()
+    save_path = str(tmp_path / 'game.bin')
+    part = main.DownloadPart(part_number=1, filename='game.bin', download_url=changing_server.base_url + 'game.bin',
+                             expected_size=SIZE, local_path=save_path, digest='md5:' + old_md5)
+    session = main.create_optimized_session()
+    try:
+        ok = any(main.download_part_with_resume(part.download_url, save_path, None, session, part)
+                 for _ in range(3))
+    finally:
+        session.close()
+    new_md5 = changing_server.files['game.bin'].md5()
+    assert ok
+    assert os.path.exists(save_path)
+    assert file_md5(save_path) == new_md5
+    assert part.digest != 'md5:' + old_md5
+
+
+def test_hash_like_etag_is_not_a_checksum_by_default(monkeypatch):
+    etag = '"' + 'a' * 32 + '"'
+    monkeypatch.setattr(main, 'ETAG_IS_MD5', False)
+    assert main.server_checksum({'ETag': etag}) is None
+    assert main.server_checksum({'ETag': etag, 'Server': 'AmazonS3'}) == 'md5:' + 'a' * 32
+    monkeypatch.setattr(main, 'ETAG_IS_MD5', True)
+    assert main.server_checksum({'ETag': etag}) == 'md5:' + 'a' * 32
@@ -0,0 +1,12 @@
+from src.gui.log_buffer import LogBuffer
+
+
+def test_lines_slices_a_wrapped_buffer():
+    buffer = LogBuffer(max_lines=100)
+    buffer.write(''.join(f'{i}\n' for i in range(250)) + 'open')
+    kept = [str(i) for i in range(150, 250)] + ['open']
+
+    assert len(buffer) == len(kept)
+    assert buffer.dropped_lines == 150
+    for start, count in ((0, 10), (40, 25), (95, 10), (100, 5), (0, 1000)):
+        assert buffer.lines(start, count) == kept[start:start + count]
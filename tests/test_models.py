@@ -0,0 +1,122 @@
+import random
+from datetime import datetime
+
+import pytest
+
+from src.core.models import PENDING_PART_STATUSES, DownloadPart, DownloadSession, PartStatus, SessionStatus
+from src.core.session_store import SessionStore, session_from_dict, session_to_dict
+
+
+def make_parts(count, size=1000):
+    return [DownloadPart(part_number=i, filename=f'game.part{i}.rar', download_url=f'http://host/{i}',
+                         expected_size=size) for i in range(1, count + 1)]
+
+
+def make_session(parts, **fields):
+    return DownloadSession(session_id='s1', vodu_store_url='https://share.vodu.store/#/details/1',
+                           download_location='/downloads', app_name='Game', parts=parts, total_parts=len(parts),
+                           total_expected_bytes=sum(part.expected_size for part in parts), **fields)
+
+
+def scan_next_pending(parts):
+    # What get_next_pending_part returned before the heap index
+    return next((part for part in parts if part.status in PENDING_PART_STATUSES), None)
+
+
+def test_next_pending_part_follows_list_order_through_status_changes():
+    parts = make_parts(5)
+    session = make_session(parts)
+
+    assert session.get_next_pending_part() is parts[0]
+    parts[0].status = PartStatus.DOWNLOADING
+    parts[1].status = PartStatus.SKIPPED
+    assert session.get_next_pending_part() is parts[2]
+    session.mark_part_completed(parts[2])
+    assert session.get_next_pending_part() is parts[3]
+    # A failed part is retried before the later pending ones
+    parts[0].status = PartStatus.FAILED
+    assert session.get_next_pending_part() is parts[0]
+    for part in parts:
+        part.status = PartStatus.COMPLETED
+    assert session.get_next_pending_part() is None
+    parts[4].status = PartStatus.PENDING
+    assert session.get_next_pending_part() is parts[4]
+
+
+def test_randomised_trace_matches_a_list_scan():
+    rng = random.Random(20_000)
+    parts = make_parts(200)
+    session = make_session(parts)
+    statuses = list(PartStatus)
+    for _ in range(20_000):
+        part = rng.choice(parts)
+        if rng.random() < 0.5:
+            part.status = rng.choice(statuses)
+        else:
+            part.downloaded_size = rng.randrange(part.expected_size + 1)
+        assert session.get_next_pending_part() is scan_next_pending(parts)
+        assert session.total_downloaded_bytes == sum(p.downloaded_size for p in parts)
+
+
+def test_progress_and_completed_parts_after_retries():
+    parts = make_parts(4)
+    session = make_session(parts)
+
+    parts[0].downloaded_size = 600
+    parts[0].status = PartStatus.FAILED
+    parts[0].retry_count += 1
+    # A retry that restarts the part takes its bytes back out of the total
+    parts[0].downloaded_size = 0
+    parts[0].downloaded_size = 1000
+    session.mark_part_completed(parts[0])
+    parts[1].downloaded_size = 500
+
+    assert session.total_downloaded_bytes == 1500
+    assert session.completed_parts == 1
+    assert session.calculate_progress() == pytest.approx(37.5)
+    assert session.overall_progress == pytest.approx(37.5)
+
+    parts[1].downloaded_size = 1000
+    session.mark_part_completed(parts[1])
+    assert (session.completed_parts, session.total_downloaded_bytes) == (2, 2000)
+    assert session.overall_progress == pytest.approx(50.0)
+
+
+def test_reattaching_parts_recounts_bytes():
+    parts = make_parts(3)
+    parts[0].downloaded_size = 1000
+    session = make_session(parts)
+    assert session.total_downloaded_bytes == 1000
+
+    replacement = make_parts(2)
+    replacement[1].downloaded_size = 250
+    session.parts = replacement
+    parts[0].downloaded_size = 0  # Detached parts no longer count
+    assert session.total_downloaded_bytes == 250
+    assert session.get_next_pending_part() is replacement[0]
+
+
+def test_timestamps_round_trip_through_dicts_and_the_store(tmp_path):
+    created = datetime(2026, 1, 2, 3, 0, 0, 123456)
+    started = datetime(2026, 1, 2, 3, 0, 1, 500000)
+    completed = datetime(2026, 1, 2, 4, 5, 6, 789)
+    parts = make_parts(2)
+    parts[0].last_attempt_at = started
+    parts[0].completed_at = completed
+    parts[0].last_speed_update = datetime(2026, 1, 2, 4, 5, 5, 999999)
+    session = make_session(parts, created_at=created, started_at=started, status=SessionStatus.COMPLETED)
+    session.completed_at = completed
+
+    restored = session_from_dict(session_to_dict(session))
+    assert (restored.created_at, restored.started_at, restored.completed_at) == (created, started, completed)
+    assert restored.parts[0].last_attempt_at == started
+    assert restored.parts[0].completed_at == completed
+    assert restored.parts[0].last_speed_update == parts[0].last_speed_update
+    assert restored.parts[1].completed_at is None
+
+    store = SessionStore(str(tmp_path / 'sessions.db'), str(tmp_path / 'resume_state.json'))
+    store.save_session(session)
+    loaded = store.load_session('s1')
+    store.close()
+    assert session_to_dict(loaded) == session_to_dict(session)
+    assert loaded.created_at == created and loaded.parts[0].completed_at == completed
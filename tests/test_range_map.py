@@ -0,0 +1,96 @@
+import json
+import os
+import zlib
+
+import main
+
+BLOCK = main.TAIL_CHECK_BYTES
+
+
+def write_data(path, size):
+    data = bytes(i % 251 for i in range(size))
+    with open(path, 'wb') as f:
+        f.write(data)
+    return data
+
+
+def checkpoint(path, range_map, start, end, data):
+    with open(path, 'r+b') as f:
+        main.checkpoint_range(f, range_map, start, end, data[start:end][-BLOCK:])
+
+
+def test_add_merges_and_reports_missing(tmp_path):
+    range_map = main.RangeMap(str(tmp_path / 'file.bin'), total_size=1000)
+    range_map.add(100, 200)
+    range_map.add(300, 400)
+    range_map.add(200, 300)
+    assert [r[:2] for r in range_map.ranges] == [[100, 400]]
+    assert range_map.completed_bytes() == 300
+    assert range_map.missing() == [(0, 100), (400, 1000)]
+    assert not range_map.is_complete()
+
+
+def test_missing_end_is_open_while_size_unknown(tmp_path):
+    range_map = main.RangeMap(str(tmp_path / 'file.bin'))
+    range_map.add(0, 50)
+    assert range_map.missing() == [(50, None)]
+
+
+def test_save_and_load_round_trip(tmp_path):
+    path = str(tmp_path / 'file.bin')
+    data = write_data(path, 4 * BLOCK)
+    range_map = main.RangeMap(path, total_size=8 * BLOCK, etag='"v1"')
+    checkpoint(path, range_map, 0, 4 * BLOCK, data)
+    assert not os.path.exists(range_map.map_path + '.tmp')
+
+    loaded = main.RangeMap.load(path)
+    assert loaded.total_size == 8 * BLOCK
+    assert loaded.etag == '"v1"'
+    assert loaded.ranges == range_map.ranges
+    assert loaded.missing() == [(4 * BLOCK, 8 * BLOCK)]
+
+
+def test_torn_tail_is_fetched_again(tmp_path):
+    path = str(tmp_path / 'file.bin')
+    data = write_data(path, 4 * BLOCK)
+    range_map = main.RangeMap(path, total_size=4 * BLOCK)
+    checkpoint(path, range_map, 0, 4 * BLOCK, data)
+    with open(path, 'r+b') as f:
+        f.seek(4 * BLOCK - 10)
+        f.write(b'\0' * 10)
+
+    loaded = main.RangeMap.load(path)
+    assert [r[:2] for r in loaded.ranges] == [[0, 3 * BLOCK]]
+    assert loaded.ranges[0][2] == zlib.crc32(data[2 * BLOCK:3 * BLOCK])
+
+
+def test_short_pass_continuing_an_interval_is_verified(tmp_path):
+    path = str(tmp_path / 'file.bin')
+    data = write_data(path, 2 * BLOCK)
+    range_map = main.RangeMap(path, total_size=2 * BLOCK)
+    checkpoint(path, range_map, 0, BLOCK + 100, data)
+    checkpoint(path, range_map, BLOCK + 100, BLOCK + 200, data)
+    assert range_map.ranges == [[0, BLOCK + 200, zlib.crc32(data[200:BLOCK + 200])]]
+
+    with open(path, 'r+b') as f:
+        f.seek(BLOCK + 150)
+        f.write(b'\0')
+    loaded = main.RangeMap.load(path)
+    assert [r[:2] for r in loaded.ranges] == [[0, 200]]
+
+
+def test_interval_without_crc_is_not_trusted(tmp_path):
+    path = str(tmp_path / 'file.bin')
+    write_data(path, 2 * BLOCK)
+    with open(path + main.RANGE_MAP_SUFFIX, 'w') as f:
+        json.dump({'v': 1, 'size': 2 * BLOCK, 'etag': None, 'ranges': [[0, 2 * BLOCK, None]]}, f)
+    assert main.RangeMap.load(path).ranges == []
+
+
+def test_legacy_partial_file_trusts_all_but_the_last_block(tmp_path):
+    path = str(tmp_path / 'file.bin')
+    data = write_data(path, 3 * BLOCK)
+    range_map = main.RangeMap.load(path)
+    assert range_map.ranges == [[0, 2 * BLOCK, zlib.crc32(data[BLOCK:2 * BLOCK])]]
+    range_map.save()
+    assert main.RangeMap.load(path).ranges == range_map.ranges
@@ -0,0 +1,90 @@
+import hashlib
+import os
+
+import pytest
+
+import main
+from src.core.segments import SegmentScheduler, split_ranges
+from local_server import SyntheticFile, start_server
+
+MIB = 1024 * 1024
+
+
+def test_split_ranges_respects_the_minimum():
+    assert split_ranges([(0, 16 * MIB)], 4, 2 * MIB) == [(0, 4 * MIB), (4 * MIB, 8 * MIB),
+                                                         (8 * MIB, 12 * MIB), (12 * MIB, 16 * MIB)]
+    assert split_ranges([(0, 3 * MIB)], 4, 2 * MIB) == [(0, 3 * MIB)]
+
+
+def test_idle_connection_steals_back_half_of_largest_segment():
+    scheduler = SegmentScheduler([(0, 16 * MIB)], 2, min_bytes=2 * MIB)
+    first, second = scheduler.next_segment(), scheduler.next_segment()
+    assert (first.start, first.end, second.start, second.end) == (0, 8 * MIB, 8 * MIB, 16 * MIB)
+    assert scheduler.first is first
+
+    first.position = 8 * MIB
+    second.position = 10 * MIB
+    stolen = scheduler.next_segment(first)
+    assert (stolen.start, stolen.end) == (13 * MIB, 16 * MIB)
+    assert second.end == 13 * MIB
+
+
+def test_no_steal_below_twice_the_minimum_or_when_disabled():
+    scheduler = SegmentScheduler([(0, 8 * MIB)], 2, min_bytes=2 * MIB)
+    first, second = scheduler.next_segment(), scheduler.next_segment()
+    first.position, second.position = 4 * MIB, 5 * MIB
+    assert scheduler.next_segment(first) is None
+    assert second.end == 8 * MIB
+
+    scheduler = SegmentScheduler([(0, 16 * MIB)], 2, steal=False, min_bytes=2 * MIB)
+    first, second = scheduler.next_segment(), scheduler.next_segment()
+    first.position = 8 * MIB
+    assert scheduler.next_segment(first) is None
+
+
+def test_hedge_duplicates_a_short_tail_and_the_winner_stops_the_other():
+    scheduler = SegmentScheduler([(0, 8 * MIB)], 2, hedge_bytes=1 * MIB, min_bytes=2 * MIB)
+    first, second = scheduler.next_segment(), scheduler.next_segment()
+    first.position = 4 * MIB
+    second.position = 7 * MIB + MIB // 2
+    hedge = scheduler.next_segment(first)
+    assert (hedge.start, hedge.end) == (second.position, 8 * MIB)
+    assert hedge.hedge is second and second.hedge is hedge
+    assert hedge.reported is second.reported
+    # Only one copy of a tail
+    assert scheduler.next_segment() is None
+
+    hedge.position = 8 * MIB
+    assert scheduler.next_segment(hedge) is None
+    assert second.end == second.position
+    assert second.hedge is None
+
+
+def test_abort_stops_every_segment():
+    scheduler = SegmentScheduler([(0, 16 * MIB)], 2, min_bytes=2 * MIB)
+    first, second = scheduler.next_segment(), scheduler.next_segment()
+    first.position = MIB
+    scheduler.abort()
+    assert scheduler.content_changed
+    assert first.remaining == 0 and second.remaining == 0
+    assert scheduler.next_segment(first) is None
+
+
+@pytest.mark.parametrize('hedge_bytes', [0, 4 * MIB])
+def test_segmented_download_with_a_slow_connection(tmp_path, hedge_bytes):
+    size = 24 * MIB
+    server = start_server([SyntheticFile('game.bin', size)], bandwidth_mb=40, slow_rate=0.3, slow_factor=8)
+    save_path = str(tmp_path / 'game.bin')
+    progress = []
+    try:
+        ok = main.download_part_segmented(server.base_url + 'game.bin', save_path,
+                                          lambda chunk, done, total: progress.append(chunk),
+                                          connections=4, hedge_bytes=hedge_bytes)
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert ok
+    with open(save_path, 'rb') as f:
+        assert hashlib.md5(f.read()).hexdigest() == server.files['game.bin'].md5()
+    assert sum(progress) == size
+    assert not os.path.exists(save_path + main.RANGE_MAP_SUFFIX)
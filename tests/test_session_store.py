@@ -0,0 +1,139 @@
+import json
+import os
+import sqlite3
+from datetime import datetime
+
+import pytest
+
+from src.core.models import DownloadPart, DownloadSession, PartStatus, PhaseTimings, SessionStatus
+from src.core.session_store import SESSION_STORE_MIGRATIONS, SessionStore, session_to_dict
+
+
+@pytest.fixture
+def paths(tmp_path):
+    return str(tmp_path / 'sessions.db'), str(tmp_path / 'resume_state.json')
+
+
+def make_session(session_id='s1'):
+    timings = PhaseTimings(requests=1, bytes=1024, connect=0.01, ttfb=0.05, transfer=0.3, write=0.02)
+    parts = [
+        DownloadPart(part_number=1, filename='game.part1.rar', download_url='http://host/game.part1.rar',
+                     expected_size=2048, downloaded_size=2048, status=PartStatus.COMPLETED,
+                     local_path='/downloads/game.part1.rar', completed_at=datetime(2026, 1, 2, 3, 4, 5),
+                     speed_samples=[1.5, 2.5], digest='sha256:' + 'ab' * 32, phase_timings=[timings]),
+        DownloadPart(part_number=2, filename='game.part2.rar', download_url='http://host/game.part2.rar',
+                     expected_size=4096, downloaded_size=100, retry_count=2,
+                     local_path='/downloads/game.part2.rar'),
+    ]
+    return DownloadSession(session_id=session_id, vodu_store_url='https://share.vodu.store/#/details/1',
+                           download_location='/downloads', app_name='Game', parts=parts, total_parts=2,
+                           total_expected_bytes=6144, status=SessionStatus.DOWNLOADING,
+                           created_at=datetime(2026, 1, 2, 3, 0, 0), started_at=datetime(2026, 1, 2, 3, 0, 1),
+                           job_options={'kind': 'store', 'verify': True})
+
+
+def test_fresh_store_is_at_the_latest_schema_in_wal_mode(paths):
+    store = SessionStore(*paths)
+    conn = sqlite3.connect(paths[0])
+    assert conn.execute("PRAGMA user_version").fetchone()[0] == len(SESSION_STORE_MIGRATIONS)
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+    conn.close()
+    store.close()
+
+
+def test_session_round_trip(paths):
+    store = SessionStore(*paths)
+    session = make_session()
+    store.save_session(session)
+    loaded = store.load_session('s1')
+    store.close()
+    assert session_to_dict(loaded) == session_to_dict(session)
+    assert loaded.parts[0].phase_timings[0].to_dict() == session.parts[0].phase_timings[0].to_dict()
+
+
+def test_checkpoint_updates_one_part(paths):
+    store = SessionStore(*paths)
+    session = make_session()
+    store.save_session(session)
+    session.parts[1].downloaded_size = 4000
+    session.parts[0].retry_count = 9  # not checkpointed
+    store.checkpoint(session, session.parts[1])
+    loaded = store.load_session('s1')
+    store.close()
+    assert loaded.parts[1].downloaded_size == 4000
+    assert loaded.parts[0].retry_count == 0
+    assert loaded.total_downloaded_bytes == session.total_downloaded_bytes
+
+
+def test_find_part_by_url_and_delete(paths):
+    store = SessionStore(*paths)
+    store.save_session(make_session())
+    session_id, part = store.find_part_by_url('http://host/game.part1.rar')
+    assert session_id == 's1' and part.digest == 'sha256:' + 'ab' * 32
+    store.delete_session('s1')
+    assert store.load_session('s1') is None
+    assert store.find_part_by_url('http://host/game.part1.rar') == (None, None)
+    store.close()
+
+
+def test_older_schema_is_upgraded_in_place(paths):
+    conn = sqlite3.connect(paths[0])
+    conn.executescript(SESSION_STORE_MIGRATIONS[0] + "PRAGMA user_version = 1;")
+    conn.execute("INSERT INTO sessions (session_id, vodu_store_url, download_location, status) "
+                 "VALUES ('old', 'http://store', '/downloads', 'paused')")
+    conn.execute("INSERT INTO parts (session_id, part_number, filename, download_url, status) "
+                 "VALUES ('old', 1, 'a.bin', 'http://host/a.bin', 'pending')")
+    conn.commit()
+    conn.close()
+
+    store = SessionStore(*paths)
+    loaded = store.load_session('old')
+    assert loaded.status == SessionStatus.PAUSED
+    assert loaded.parts[0].digest is None and loaded.parts[0].phase_timings is None
+    loaded.parts[0].digest = 'md5:' + '0' * 32
+    store.save_session(loaded)
+    assert store.load_session('old').parts[0].digest == 'md5:' + '0' * 32
+    store.close()
+    conn = sqlite3.connect(paths[0])
+    assert conn.execute("PRAGMA user_version").fetchone()[0] == len(SESSION_STORE_MIGRATIONS)
+    conn.close()
+
+
+def test_legacy_json_is_imported_once(paths):
+    db_path, json_path = paths
+    with open(json_path, 'w') as f:
+        json.dump({'version': '1.0', 'sessions': [session_to_dict(make_session('legacy'))]}, f)
+
+    store = SessionStore(db_path, json_path)
+    assert [s.session_id for s in store.load_sessions()] == ['legacy']
+    assert not os.path.exists(json_path) and os.path.exists(json_path + '.migrated')
+    store.delete_session('legacy')
+    store.close()
+
+    # A JSON file that shows up again is not imported a second time
+    os.replace(json_path + '.migrated', json_path)
+    store = SessionStore(db_path, json_path)
+    assert store.load_sessions() == []
+    store.close()
+
+
+def test_wal_checkpoint_keeps_data_and_readers_see_commits(paths):
+    db_path, json_path = paths
+    writer = SessionStore(db_path, json_path)
+    reader = SessionStore(db_path, json_path)
+    session = make_session()
+    writer.save_session(session)
+    assert os.path.getsize(db_path + '-wal') > 0
+    # Committed rows are visible to another connection before any checkpoint
+    assert reader.load_session('s1').parts[1].downloaded_size == 100
+    session.parts[1].downloaded_size = 3000
+    writer.checkpoint(session, session.parts[1])
+    assert reader.load_session('s1').parts[1].downloaded_size == 3000
+    reader.close()
+    writer.close()
+
+    # Closing the last connection checkpoints the WAL into the database
+    assert not os.path.exists(db_path + '-wal') or os.path.getsize(db_path + '-wal') == 0
+    conn = sqlite3.connect(db_path)
+    assert conn.execute("SELECT downloaded_size FROM parts WHERE part_number = 2").fetchone()[0] == 3000
+    conn.close()
@@ -0,0 +1,72 @@
+import random
+import statistics
+
+import pytest
+
+from src.core.models import (
+    SPEED_WINDOW_SIZE, DownloadPart, DownloadSession, SpeedStats, calculate_session_metrics, update_speed_tracking,
+)
+
+MIB = 1024 * 1024
+
+
+def reference_metrics(windows):
+    # The list-based code SpeedStats replaced: last SPEED_WINDOW_SIZE samples
+    # per part, flattened, then statistics.mean / statistics.stdev
+    all_speeds = [speed for window in windows for speed in window]
+    mean = statistics.mean(all_speeds)
+    stdev = statistics.stdev(all_speeds) if len(all_speeds) > 1 else 0.0
+    stability = max(0.0, 1.0 - stdev / mean) if len(all_speeds) > 1 else 1.0
+    return max(all_speeds), mean, stdev, stability
+
+
+@pytest.mark.parametrize('count', [1, 2, SPEED_WINDOW_SIZE - 1, SPEED_WINDOW_SIZE, SPEED_WINDOW_SIZE + 1, 5000])
+def test_window_matches_statistics(count):
+    rng = random.Random(count)
+    samples = [rng.lognormvariate(1.5, 0.8) for _ in range(count)]
+    stats = SpeedStats()
+    for sample in samples:
+        stats.add(sample)
+
+    window = samples[-SPEED_WINDOW_SIZE:]
+    assert stats.samples == window
+    assert stats.count == len(window)
+    assert stats.peak == max(window)
+    assert stats.mean == pytest.approx(statistics.mean(window), rel=1e-9)
+    if len(window) > 1:
+        assert stats.m2 / (stats.count - 1) == pytest.approx(statistics.variance(window), rel=1e-9)
+
+
+def test_session_metrics_match_the_list_based_code():
+    rng = random.Random(5000)
+    parts = [DownloadPart(part_number=i, filename=f'game.part{i}.rar', download_url=f'http://host/{i}',
+                          expected_size=MIB) for i in range(1, 6)]
+    fed = [[] for _ in parts]
+    for _ in range(5000):
+        index = rng.randrange(len(parts))
+        elapsed = rng.uniform(0.05, 2.0)
+        chunk = rng.randrange(64 * 1024, 8 * MIB)
+        update_speed_tracking(parts[index], chunk, elapsed)
+        fed[index].append(chunk / MIB / elapsed)
+    session = DownloadSession(session_id='s', vodu_store_url='u', download_location='/tmp', app_name='a',
+                              parts=parts, total_parts=len(parts))
+
+    calculate_session_metrics(session)
+
+    peak, mean, stdev, stability = reference_metrics([speeds[-SPEED_WINDOW_SIZE:] for speeds in fed])
+    assert session.peak_speed_mb == peak
+    assert session.average_speed_mb == pytest.approx(mean, rel=1e-9)
+    assert session.speed_variance == pytest.approx(stdev, rel=1e-9)
+    assert session.speed_stability_score == pytest.approx(stability, rel=1e-9, abs=1e-12)
+
+
+def test_single_sample_session_is_stable():
+    part = DownloadPart(part_number=1, filename='a', download_url='http://host/a', expected_size=MIB)
+    update_speed_tracking(part, 2 * MIB, 1.0)
+    session = DownloadSession(session_id='s', vodu_store_url='u', download_location='/tmp', app_name='a',
+                              parts=[part], total_parts=1)
+
+    calculate_session_metrics(session)
+
+    assert (session.peak_speed_mb, session.average_speed_mb) == (2.0, 2.0)
+    assert (session.speed_variance, session.speed_stability_score) == (0.0, 1.0)
@@ -0,0 +1,47 @@
+from src.gui.ui_bus import UIUpdateBus
+
+
+class ManualRoot:
+    """Enough of a Tk root for the bus: frames are driven by flush()."""
+
+    def after(self, delay_ms, callback):
+        return None
+
+    def after_cancel(self, after_id):
+        pass
+
+
+class Label:
+    def __init__(self):
+        self.calls = []
+
+    def set_text(self, text):
+        self.calls.append(('set_text', text))
+
+    def append_text(self, text):
+        self.calls.append(('append_text', text))
+
+    def set_progress(self, value):
+        self.calls.append(('set_progress', value))
+
+
+def test_append_merges_into_a_pending_set_text():
+    bus = UIUpdateBus(ManualRoot())
+    label = Label()
+    proxy = bus.proxy(label)
+    proxy.set_text('a\n')
+    proxy.append_text('b\n')
+    proxy.append_text('c\n')
+    bus.flush(force=True)
+    assert label.calls == [('set_text', 'a\nb\nc\n')]
+
+
+def test_append_after_another_setter_is_queued_separately():
+    bus = UIUpdateBus(ManualRoot())
+    label = Label()
+    proxy = bus.proxy(label)
+    proxy.set_progress(0.5)
+    proxy.append_text('b\n')
+    proxy.append_text('c\n')
+    bus.flush(force=True)
+    assert label.calls == [('set_progress', 0.5), ('append_text', 'b\nc\n')]